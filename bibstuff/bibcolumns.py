@@ -0,0 +1,260 @@
+"""
+:mod:`bibstuff.bibcolumns`: columnar (NumPy) export of BibTeX entries
+----------------------------------------------------------------------
+
+Converts chosen fields of a list of `bibfile.BibEntry` (or of a `BibFile`)
+into NumPy arrays, one column per field, so that counts, group-bys and
+filters can be vectorised instead of looping over entries:
+
+- categorical fields (e.g., journal, entry_type) are dictionary encoded,
+- integer fields (e.g., year, volume) become integer arrays with a validity mask,
+- name-list fields (author, editor) become per-name codes with entry offsets,
+- other fields are stored as UTF-8 data with offsets.
+
+Example::
+
+    columns = to_columns(bfile)
+    recent = columns['year'].values >= 2000
+    columns.take(recent)['journal'].counts()  #-> dict, journal: count
+
+NumPy is needed only by this module.
+
+:copyright: Dylan Schwilk and Alan G Isaac, see AUTHORS
+:license: MIT (see LICENSE)
+"""
+__docformat__ = "restructuredtext en"
+
+###################  IMPORTS  ##################################################
+#import from standard library
+import re
+################################################################################
+
+#default column kinds, by field
+CATEGORICAL_FIELDS = ('entry_type', 'journal', 'publisher', 'booktitle', 'school')
+INTEGER_FIELDS = ('year', 'volume', 'number')
+NAMELIST_FIELDS = ('author', 'editor')
+DEFAULT_FIELDS = ('citekey', 'entry_type', 'year', 'journal', 'volume', 'author', 'title')
+
+_integer_re = re.compile(r'\d+')
+_names_re = re.compile(r'\s+and\s+', re.IGNORECASE)
+
+def _numpy():
+    try:
+        import numpy
+    except ImportError:
+        raise RuntimeError('Need numpy for columnar export')
+    return numpy
+
+
+class CategoricalColumn(object):
+    """Dictionary encoded column: `codes` (int32 array, -1 for missing values)
+    index into `categories` (list of str, in order of first occurrence).
+    """
+    def __init__(self, codes, categories):
+        self.codes = codes
+        self.categories = categories
+
+    def __len__(self):
+        return len(self.codes)
+
+    def __getitem__(self, index):
+        code = self.codes[index]
+        return self.categories[code] if code >= 0 else ''
+
+    def take(self, selector):
+        """Return CategoricalColumn, the rows picked by boolean mask or index array `selector`."""
+        return CategoricalColumn(self.codes[selector], self.categories)
+
+    def code(self, value):
+        """Return int, the code of `value` (-1 if absent)."""
+        try:
+            return self.categories.index(value)
+        except ValueError:
+            return -1
+
+    def isin(self, values):
+        """Return boolean array, True where the value is in `values`."""
+        np = _numpy()
+        return np.isin(self.codes, [self.code(value) for value in values if value in self.categories])
+
+    def counts(self):
+        """Return dict, category: number of rows (missing values are not counted)."""
+        np = _numpy()
+        codes = self.codes
+        counts = np.bincount(codes[codes >= 0], minlength=len(self.categories))
+        return dict(zip(self.categories, counts.tolist()))
+
+
+class IntegerColumn(object):
+    """Integer column: `values` (int64 array, 0 where missing)
+    and `valid` (boolean array, False where missing or not a number).
+    """
+    def __init__(self, values, valid):
+        self.values = values
+        self.valid = valid
+
+    def __len__(self):
+        return len(self.values)
+
+    def __getitem__(self, index):
+        return int(self.values[index]) if self.valid[index] else None
+
+    def take(self, selector):
+        """Return IntegerColumn, the rows picked by boolean mask or index array `selector`."""
+        return IntegerColumn(self.values[selector], self.valid[selector])
+
+
+class StringColumn(object):
+    """String column: the UTF-8 bytes of row `i` are ``data[offsets[i]:offsets[i+1]]``
+    (`data` is a uint8 array, `offsets` an int64 array of length rows + 1).
+    """
+    def __init__(self, offsets, data):
+        self.offsets = offsets
+        self.data = data
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, index):
+        start, stop = self.offsets[index], self.offsets[index + 1]
+        return self.data[start:stop].tobytes().decode('utf-8')
+
+    def lengths(self):
+        """Return int64 array, the byte length of each value."""
+        return self.offsets[1:] - self.offsets[:-1]
+
+    def take(self, selector):
+        """Return StringColumn, the rows picked by boolean mask or index array `selector`."""
+        offsets, flat = _gather(self.offsets, selector)
+        return StringColumn(offsets, self.data[flat])
+
+
+class NameListColumn(object):
+    """Name-list column (e.g., author): the names of row `i` have codes
+    ``codes[offsets[i]:offsets[i+1]]``, which index into `categories`.
+    Names are split on "and" but are not otherwise parsed.
+    """
+    def __init__(self, offsets, codes, categories):
+        self.offsets = offsets
+        self.codes = codes
+        self.categories = categories
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, index):
+        start, stop = self.offsets[index], self.offsets[index + 1]
+        return [self.categories[code] for code in self.codes[start:stop].tolist()]
+
+    def rows(self):
+        """Return int64 array, the row of each name in `codes` (for group-bys by name)."""
+        np = _numpy()
+        return np.repeat(np.arange(len(self)), self.offsets[1:] - self.offsets[:-1])
+
+    def lengths(self):
+        """Return int64 array, the number of names in each row."""
+        return self.offsets[1:] - self.offsets[:-1]
+
+    def take(self, selector):
+        """Return NameListColumn, the rows picked by boolean mask or index array `selector`."""
+        offsets, flat = _gather(self.offsets, selector)
+        return NameListColumn(offsets, self.codes[flat], self.categories)
+
+    def counts(self):
+        """Return dict, name: number of rows that list it."""
+        np = _numpy()
+        counts = np.bincount(self.codes, minlength=len(self.categories))
+        return dict(zip(self.categories, counts.tolist()))
+
+
+class BibColumns(dict):
+    """Stores columns by field name, all with `nrows` rows."""
+    def __init__(self, columns, nrows):
+        dict.__init__(self, columns)
+        self.nrows = nrows
+
+    def take(self, selector):
+        """Return BibColumns, the rows picked by boolean mask or index array `selector`."""
+        np = _numpy()
+        nrows = len(np.arange(self.nrows)[selector])
+        return BibColumns(((name, column.take(selector)) for name, column in self.items()), nrows)
+
+
+def _gather(offsets, selector):
+    """Return the offsets and the flat index array of the rows
+    of an offsets-encoded column that are picked by `selector`.
+    """
+    np = _numpy()
+    rows = np.arange(len(offsets) - 1)[selector]
+    starts = offsets[rows]
+    lengths = offsets[rows + 1] - starts
+    new_offsets = np.zeros(len(rows) + 1, dtype=np.int64)
+    np.cumsum(lengths, out=new_offsets[1:])
+    flat = np.arange(new_offsets[-1]) + np.repeat(starts - new_offsets[:-1], lengths)
+    return new_offsets, flat
+
+def _categorical_column(values):
+    np = _numpy()
+    index = {'': -1}
+    codes = np.fromiter((index.setdefault(value, len(index) - 1) for value in values),
+        dtype=np.int32, count=len(values))
+    del index['']
+    return CategoricalColumn(codes, list(index))
+
+def _integer_column(values):
+    np = _numpy()
+    numbers = []
+    for value in values:
+        match = _integer_re.search(value)
+        numbers.append(int(match.group()) if match else -1)
+    numbers = np.array(numbers, dtype=np.int64)
+    valid = numbers >= 0
+    numbers[~valid] = 0
+    return IntegerColumn(numbers, valid)
+
+def _string_column(encoded):
+    np = _numpy()
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum(np.fromiter(map(len, encoded), dtype=np.int64, count=len(encoded)), out=offsets[1:])
+    return StringColumn(offsets, np.frombuffer(b''.join(encoded), dtype=np.uint8))
+
+def _namelist_column(values):
+    np = _numpy()
+    index = {}
+    codes = []
+    lengths = []
+    for value in values:
+        names = [name for name in _names_re.split(value.strip()) if name] if value else []
+        codes.extend(index.setdefault(name, len(index)) for name in names)
+        lengths.append(len(names))
+    offsets = np.zeros(len(values) + 1, dtype=np.int64)
+    np.cumsum(lengths, out=offsets[1:])
+    return NameListColumn(offsets, np.array(codes, dtype=np.int32), list(index))
+
+
+def to_columns(entries, fields=DEFAULT_FIELDS, categorical=CATEGORICAL_FIELDS,
+               integer=INTEGER_FIELDS, namelists=NAMELIST_FIELDS):
+    """Return BibColumns, a column for each field in `fields`.
+    Values are looked up as ``entry[field]`` (so crossrefs and month macros apply).
+
+    :Parameters:
+      `entries` : list of BibEntry, or a BibFile
+      `fields` : sequence of str
+        the fields to export (including, e.g., 'citekey' or 'entry_type')
+      `categorical`, `integer`, `namelists` : sequence of str
+        fields exported as `CategoricalColumn`, `IntegerColumn` and `NameListColumn`;
+        other fields are exported as `StringColumn`
+    """
+    entries = getattr(entries, 'entries', entries)
+    columns = dict()
+    for field in fields:
+        values = [entry[field] for entry in entries]
+        if field in categorical:
+            columns[field] = _categorical_column(values)
+        elif field in integer:
+            columns[field] = _integer_column(values)
+        elif field in namelists:
+            columns[field] = _namelist_column(values)
+        else:
+            columns[field] = _string_column([value.encode('utf-8') for value in values])
+    return BibColumns(columns, len(entries))
@@ -0,0 +1,357 @@
+"""
+:mod:`bibstuff.bibdb`: BibTeX databases stored in SQLite
+---------------------------------------------------------
+
+Provides `SQLiteBibFile`, a `bibfile.BibFile` whose entries live in a local
+SQLite file instead of in memory.  Entries, fields and macros are kept in
+normalised tables (a crossref is a field, with an index for lookups),
+and an FTS5 table indexes the field values for full-text search.
+`BibEntry` objects are built only when entries are requested.
+
+An SQLiteBibFile is also a parse processor: parsing a .bib file into it
+(with `bibgrammar.Parse`) imports the entries.  See scripts/bibdb.py for
+the import and export commands; bibsearch.py also accepts a database file.
+
+:copyright: Dylan Schwilk and Alan G Isaac, see AUTHORS
+:license: MIT (see LICENSE)
+"""
+__docformat__ = "restructuredtext en"
+
+###################  IMPORTS  ##################################################
+#import from standard library
+import itertools, re, sqlite3
+import logging
+bibdb_logger = logging.getLogger('bibstuff_logger')
+
+#bibstuff imports
+from .bibfile import MONTH_DICT, BibEntry, BibFile
+from simpleparse.dispatchprocessor import dispatch
+################################################################################
+
+_schema = """
+CREATE TABLE IF NOT EXISTS entries (
+    id INTEGER PRIMARY KEY,
+    citekey TEXT NOT NULL UNIQUE,
+    entry_type TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS fields (
+    id INTEGER PRIMARY KEY,
+    entry_id INTEGER NOT NULL REFERENCES entries (id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    value TEXT NOT NULL,
+    UNIQUE (entry_id, name));
+CREATE INDEX IF NOT EXISTS fields_crossref ON fields (value) WHERE name = 'crossref';
+CREATE TABLE IF NOT EXISTS macros (
+    name TEXT PRIMARY KEY,
+    value TEXT NOT NULL);
+CREATE VIRTUAL TABLE IF NOT EXISTS fields_fts USING fts5 (
+    value, content = 'fields', content_rowid = 'id');
+CREATE TRIGGER IF NOT EXISTS fields_fts_insert AFTER INSERT ON fields BEGIN
+    INSERT INTO fields_fts (rowid, value) VALUES (new.id, new.value);
+END;
+CREATE TRIGGER IF NOT EXISTS fields_fts_delete AFTER DELETE ON fields BEGIN
+    INSERT INTO fields_fts (fields_fts, rowid, value) VALUES ('delete', old.id, old.value);
+END;
+"""
+
+#SQLite limits the number of parameters in a statement
+_max_params = 500
+
+
+class _EntrySequence(object):
+    """Provides a read-only sequence view of the entries of an `SQLiteBibFile`
+    (in insertion order), building each BibEntry on access.
+    Indexing uses the database's cached list of entry ids.
+    """
+    def __init__(self, bibfile):
+        self._bibfile = bibfile
+
+    def __len__(self):
+        return len(self._bibfile)
+
+    def __iter__(self):
+        return iter(self._bibfile)
+
+    def __getitem__(self, index):
+        ids = self._bibfile._entry_ids()
+        if isinstance(index, slice):
+            return self._bibfile._load_entries([ids[i] for i in range(*index.indices(len(ids)))])
+        try:
+            entry_id = ids[index]
+        except IndexError:
+            raise IndexError("entry index out of range")
+        return self._bibfile._load_entries([entry_id])[0]
+
+
+class SQLiteBibFile(BibFile):
+    """Provides the `BibFile` interface for entries stored in an SQLite file.
+
+    Changes are committed by `commit` (and `close`).
+    The `entries` attribute is a read-only sequence; use `add_entry`
+    and `remove_entry` to change the database.
+
+    :Parameters:
+      `path` : str
+        the database file (created if missing)
+    """
+    #whether parsed entries replace stored entries with the same citekey
+    replace = False
+
+    def __init__(self, path):
+        self.path = path
+        self._db = sqlite3.connect(path)
+        self._db.execute("PRAGMA foreign_keys = ON")
+        self._db.executescript(_schema)
+        self._macroMap = dict(self._db.execute("SELECT name, value FROM macros"))
+        self._ids = None  #database ids of the entries, in order (see `_entry_ids`)
+
+    entries = property(_EntrySequence, None, None, "read-only sequence of the entries")
+
+    def __len__(self):
+        return self._db.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+    def __iter__(self):
+        """Yield BibEntry, each entry in insertion order."""
+        entries = self._db.execute("SELECT id, citekey, entry_type FROM entries ORDER BY id")
+        fields = self._db.execute(
+            "SELECT entry_id, name, value FROM fields ORDER BY entry_id, position")
+        grouped = itertools.groupby(fields, key=lambda row: row[0])
+        group_id, group = next(grouped, (None, ()))
+        for entry_id, citekey, entry_type in entries:
+            entry = _make_entry(citekey, entry_type)
+            if group_id == entry_id:
+                for _, name, value in group:
+                    entry[name] = value
+                group_id, group = next(grouped, (None, ()))
+            yield entry
+
+    def _entry_ids(self):
+        """Return list, the database ids of the entries in insertion order.
+        The list is cached until an entry is added or removed.
+        """
+        if self._ids is None:
+            self._ids = [row[0] for row in self._db.execute("SELECT id FROM entries ORDER BY id")]
+        return self._ids
+
+    def _load_entries(self, ids):
+        """Return list of BibEntry, the entries with database ids `ids`."""
+        result = dict()
+        for start in range(0, len(ids), _max_params):
+            chunk = ids[start:start + _max_params]
+            marks = ','.join('?' * len(chunk))
+            for entry_id, citekey, entry_type in self._db.execute(
+                "SELECT id, citekey, entry_type FROM entries WHERE id IN (%s)" % marks, chunk):
+                result[entry_id] = _make_entry(citekey, entry_type)
+            for entry_id, name, value in self._db.execute(
+                "SELECT entry_id, name, value FROM fields WHERE entry_id IN (%s) "
+                "ORDER BY entry_id, position" % marks, chunk):
+                result[entry_id][name] = value
+        return [result[entry_id] for entry_id in ids]
+
+    def _ids_for_citekeys(self, citekeys):
+        """Return dict, mapping the found citekeys to database ids."""
+        result = dict()
+        citekeys = list(citekeys)
+        for start in range(0, len(citekeys), _max_params):
+            chunk = citekeys[start:start + _max_params]
+            result.update(self._db.execute(
+                "SELECT citekey, id FROM entries WHERE citekey IN (%s)" % ','.join('?' * len(chunk)),
+                chunk))
+        return result
+
+    def get_entry(self, citekey):
+        """Return BibEntry for `citekey` (or None)."""
+        ids = self._ids_for_citekeys([citekey])
+        return self._load_entries([ids[citekey]])[0] if ids else None
+
+    def get_entrylist(self, citekeys, discard=True):
+        """Return list, the BibEntry instances that were found
+        (and None for entries not found, unless discarded),
+        with cross-referenced entries attached.
+        """
+        if not citekeys:
+            bibdb_logger.warning("get_entrylist: No keys provided; returning empty cited-entry list.")
+            return []
+        ids = self._ids_for_citekeys(citekeys)
+        found = dict(zip(ids, self._load_entries(list(ids.values()))))
+        bad_keys = [key for key in citekeys if key not in found]
+        if bad_keys and discard:
+            bibdb_logger.warning("Database entries not found for the following keys:\n"+"\n".join(bad_keys))
+        result = [found.get(key) for key in citekeys]
+        if discard:
+            result = [entry for entry in result if entry]
+        self._attach_crossrefs(result)
+        return result
+
+    def _attach_crossrefs(self, entries):
+        crossrefs = set(entry['crossref'] for entry in entries
+            if entry and isinstance(entry['crossref'], str) and entry['crossref'])
+        if crossrefs:
+            ids = self._ids_for_citekeys(crossrefs)
+            targets = dict(zip(ids, self._load_entries(list(ids.values()))))
+            for entry in entries:
+                if entry:
+                    target = targets.get(entry['crossref'])
+                    if target:
+                        entry['crossref'] = target
+
+    def search_entries(self, string_or_compiled, field='', ignore_case=True):
+        """Return list of matching entries.
+        Search for regular expression in the fields of each entry
+        (see `bibfile.BibFile.search_entries`).
+        Entries are selected in SQL, with the test of `BibEntry.search_fields`
+        (month macros are expanded), so only matching entries are loaded
+        and the result matches an in-memory BibFile.
+        """
+        if isinstance(string_or_compiled, str):
+            flags = re.MULTILINE | re.IGNORECASE if ignore_case else re.MULTILINE
+            reo = re.compile(string_or_compiled, flags)
+        else: #->must have a compiled regular expression
+            reo = string_or_compiled
+        def search(name, value):
+            if name == 'month':
+                value = MONTH_DICT.get(value, value)
+            return reo.search(value) is not None
+        self._db.create_function('bibstuff_search', 2, search, deterministic=True)
+        field = field.lower()
+        if field in ('citekey', 'entry_type'):
+            sql = """SELECT id FROM entries
+                WHERE {0} != '' AND bibstuff_search('{0}', {0}) ORDER BY id""".format(field)
+            params = ()
+        elif field:
+            sql = """SELECT entry_id FROM fields
+                WHERE name = ? AND value != '' AND bibstuff_search(name, value)
+                ORDER BY entry_id"""
+            params = (field,)
+        else:
+            sql = """SELECT DISTINCT entry_id FROM fields
+                WHERE bibstuff_search(name, value) ORDER BY entry_id"""
+            params = ()
+        result = []
+        cursor = self._db.execute(sql, params)
+        while True:
+            ids = [row[0] for row in cursor.fetchmany(_max_params)]
+            if not ids:
+                break
+            result.extend(self._load_entries(ids))
+        return result
+
+    def search_text(self, query, field=''):
+        """Return list of entries with a field value matching
+        FTS5 full-text `query` (e.g., ``'evolution AND fire'``),
+        optionally restricted to one `field`.
+        """
+        sql = """SELECT DISTINCT fields.entry_id FROM fields_fts
+            JOIN fields ON fields.id = fields_fts.rowid
+            WHERE fields_fts MATCH ?"""
+        params = [query]
+        if field:
+            sql += " AND fields.name = ?"
+            params.append(field.lower())
+        ids = [row[0] for row in self._db.execute(sql + " ORDER BY fields.entry_id", params)]
+        return self._load_entries(ids)
+
+    def add_entry(self, entry, replace=False):
+        """Store BibEntry `entry`.
+        An entry with the same citekey is replaced if `replace`,
+        else the new entry is skipped (with a warning).
+        Return bool, True if stored.
+        """
+        db = self._db
+        row = db.execute("SELECT id FROM entries WHERE citekey = ?", (entry.citekey,)).fetchone()
+        if row is not None:
+            if not replace:
+                bibdb_logger.warning("Duplicate citekey %s: entry not added.", entry.citekey)
+                return False
+            db.execute("DELETE FROM fields WHERE entry_id = ?", row)
+            db.execute("UPDATE entries SET entry_type = ? WHERE id = ?", (entry.entry_type, row[0]))
+            entry_id = row[0]
+        else:
+            entry_id = db.execute("INSERT INTO entries (citekey, entry_type) VALUES (?, ?)",
+                (entry.citekey, entry.entry_type)).lastrowid
+            self._ids = None
+        values = []
+        for position, name in enumerate(entry.fields):
+            value = dict.get(entry, name, '')
+            if not isinstance(value, str):  #an attached crossref entry
+                value = value.citekey
+            values.append((entry_id, position, name, value))
+        db.executemany("INSERT INTO fields (entry_id, position, name, value) VALUES (?, ?, ?, ?)", values)
+        return True
+
+    def remove_entry(self, citekey):
+        """Remove the entry for `citekey`; return bool, True if found."""
+        db = self._db
+        row = db.execute("SELECT id FROM entries WHERE citekey = ?", (citekey,)).fetchone()
+        if row is None:
+            return False
+        db.execute("DELETE FROM fields WHERE entry_id = ?", row)
+        db.execute("DELETE FROM entries WHERE id = ?", row)
+        self._ids = None
+        return True
+
+    def set_macro(self, name, value):
+        """Store macro (@string) `name` with `value`."""
+        self._macroMap[name] = value
+        self._db.execute("INSERT OR REPLACE INTO macros (name, value) VALUES (?, ?)", (name, value))
+
+    def get_macros(self):
+        """Return dict, the stored macros."""
+        return dict(self._macroMap)
+
+    def write_macros(self, fileobj):
+        """Write the stored macros, as @string entries, to text file `fileobj`."""
+        for name, value in sorted(self._macroMap.items()):
+            fileobj.write('@string{%s = {%s}}\n' % (name, value))
+
+    def commit(self):
+        self._db.commit()
+
+    def close(self):
+        """Commit changes and close the database file."""
+        if self._db is not None:
+            self._db.commit()
+            self._db.close()
+            self._db = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    """PRODUCTION FUNCTIONS:
+    parsing into an SQLiteBibFile imports the parsed entries and macros
+    """
+
+    def entry(self, tuple4, buffer):
+        """Process the bibentry and its children, storing the entry."""
+        (tag,start,stop,subtags) = tuple4
+        entry = BibEntry()
+        entry.entry_type = dispatch(self, subtags[0], buffer)
+        entry.citekey  = dispatch(self, subtags[1], buffer)
+        for field in subtags[2][3] :
+            k,v = dispatch(self, field, buffer)
+            entry[k] = v
+        self.add_entry(entry, replace=self.replace)
+
+    def macro(self, tuple4, buffer):
+        """Process a macro entry, storing the macro."""
+        (tag,start,stop,subtags) = tuple4
+        name, str = dispatch(self, subtags[0], buffer)
+        self.set_macro(name, str)
+
+
+def is_database(path):
+    """Return bool, True if `path` is an SQLite database file."""
+    try:
+        with open(path, 'rb') as fh:
+            return fh.read(16) == b'SQLite format 3\x00'
+    except OSError:
+        return False
+
+def _make_entry(citekey, entry_type):
+    entry = BibEntry()
+    entry.citekey = citekey
+    entry.entry_type = entry_type
+    return entry
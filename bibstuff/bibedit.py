@@ -0,0 +1,220 @@
+"""
+:mod:`bibstuff.bibedit`: in-place editing of .bib files
+--------------------------------------------------------
+
+Provides `BibEditSession`, a `bibfile.BibFile` that remembers where each
+entry came from in its .bib file.  Saving copies the unchanged parts of
+the file verbatim (with ``copy_file_range`` or ``sendfile`` where the
+platform has them) and re-serialises only the entries that were edited,
+added or removed, so comments, macros and formatting survive and saving
+one edit to a very large file costs a sequential copy.
+The new file replaces the old one by an atomic rename.
+
+Example::
+
+    with BibEditSession('refs.bib') as session:
+        session.set_field('Isaac:2010', 'pages', '12--34')
+    #-> refs.bib is rewritten with only Isaac:2010 re-serialised
+
+:copyright: Dylan Schwilk and Alan G Isaac, see AUTHORS
+:license: MIT (see LICENSE)
+"""
+__docformat__ = "restructuredtext en"
+
+###################  IMPORTS  ##################################################
+#import from standard library
+import os, tempfile
+import logging
+bibedit_logger = logging.getLogger('bibstuff_logger')
+
+#bibstuff imports
+from . import bibgrammar
+from .bibfile import BibFile, get_entry_by_citekey
+################################################################################
+
+
+def _copy_range(src, dst, offset, count, bufsize=1 << 20):
+    """Copy `count` bytes, starting at `offset`, from raw file `src`
+    to the current position of raw file `dst`.
+    Uses ``os.copy_file_range`` or ``os.sendfile`` (no copy through
+    user space) when possible, else reads and writes in blocks.
+    """
+    for name in ('copy_file_range', 'sendfile'):
+        copy = getattr(os, name, None)
+        if copy is None:
+            continue
+        try:
+            while count > 0:
+                if name == 'sendfile':
+                    n = copy(dst.fileno(), src.fileno(), offset, count)
+                else:
+                    n = copy(src.fileno(), dst.fileno(), count, offset)
+                if n == 0:  #source is shorter than expected
+                    return
+                offset += n
+                count -= n
+            return
+        except OSError:  #unsupported for these files; try the next way
+            continue
+    src.seek(offset)
+    while count > 0:
+        data = src.read(min(bufsize, count))
+        if not data:
+            return
+        _write_all(dst, data)
+        count -= len(data)
+
+def _write_all(dst, data):
+    """Write bytes `data` to raw file `dst` (raw writes may be partial)."""
+    view = memoryview(data)
+    while view:
+        view = view[dst.write(view):]
+
+
+class BibEditSession(BibFile):
+    """Stores a parsed .bib file for editing, with the byte span of each entry.
+
+    Entries may be changed in place (then call `mark_dirty`), with `set_field`,
+    `add_entry` or `remove_entry`, or by removing them from `entries`.
+    `save` writes the file: entries that are unchanged are copied from the
+    original bytes, changed entries are rewritten where they were,
+    and new entries are appended.
+    """
+    def __init__(self, path, encoding='utf-8'):
+        BibFile.__init__(self)
+        self.path = path
+        self.encoding = encoding
+        self._spans = []  #(entry, start byte, stop byte), in file order
+        self._dirty = set()  #ids of changed entries
+        with open(path, 'rb') as fh:
+            data = fh.read()
+        self._stat = os.stat(path)
+        src = data.decode(encoding)
+        #character offsets equal byte offsets unless there are multibyte characters
+        self._char_pos = self._byte_pos = 0
+        self._ascii = len(src) == len(data)
+        bibgrammar.Parse(src, self)
+        del self._char_pos, self._byte_pos
+
+    def _byte_offset(self, buffer, char_offset):
+        #entries are parsed in order, so encode only the text since the last entry
+        if self._ascii:
+            return char_offset
+        self._byte_pos += len(buffer[self._char_pos:char_offset].encode(self.encoding))
+        self._char_pos = char_offset
+        return self._byte_pos
+
+    def entry(self, tuple4, buffer):
+        """Process the bibentry and its children, recording its byte span."""
+        (tag,start,stop,subtags) = tuple4
+        BibFile.entry(self, tuple4, buffer)
+        self._spans.append((self.entries[-1],
+            self._byte_offset(buffer, start), self._byte_offset(buffer, stop)))
+
+    def get_entry(self, citekey):
+        """Return BibEntry for `citekey` (or None)."""
+        return get_entry_by_citekey(self.entries, citekey)
+
+    def mark_dirty(self, entry):
+        """Record that `entry` was changed, so that it is rewritten on save."""
+        self._dirty.add(id(entry))
+
+    def set_field(self, citekey, name, value):
+        """Set field `name` of the entry for `citekey` to `value`."""
+        entry = self.get_entry(citekey)
+        if entry is None:
+            raise KeyError(citekey)
+        entry[name] = value
+        self.mark_dirty(entry)
+
+    def add_entry(self, entry):
+        """Add BibEntry `entry` (written at the end of the file)."""
+        self.entries.append(entry)
+
+    def remove_entry(self, citekey):
+        """Remove the entry for `citekey`; return bool, True if found."""
+        entry = self.get_entry(citekey)
+        if entry is None:
+            return False
+        self.entries.remove(entry)
+        return True
+
+    def is_dirty(self):
+        """Return bool, True if saving would change the file."""
+        return bool(self._dirty) or (set(id(entry) for entry in self.entries)
+            != set(id(span[0]) for span in self._spans))
+
+    def _render(self, entry, align):
+        #a span ends with the closing brace, without the newline that follows
+        return entry.to_bibtex(align).rstrip('\n').encode(self.encoding)
+
+    def save(self, path=None, align=None):
+        """Write the edited file to `path` (default: replace the original file).
+        The file is written to a temporary file in the same directory
+        and then renamed, so readers see either the old or the new file.
+
+        :Parameters:
+          `align` : int
+            field-name column width for rewritten entries (see `BibEntry.to_bibtex`)
+        """
+        stat = os.stat(self.path)
+        if (stat.st_size, stat.st_mtime_ns) != (self._stat.st_size, self._stat.st_mtime_ns):
+            raise RuntimeError("%s was changed since it was read." % self.path)
+        target = self.path if path is None else path
+        present = set(id(entry) for entry in self.entries)
+        spanned = set(id(span[0]) for span in self._spans)
+        added = [entry for entry in self.entries if id(entry) not in spanned]
+        spans = []  #(entry, start byte, stop byte) in the new file
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(target)),
+            prefix='.' + os.path.basename(target), suffix='.tmp')
+        try:
+            with open(self.path, 'rb', buffering=0) as src, open(fd, 'wb', buffering=0) as dst:
+                #the bytes of `src` before `pos` are done; `written` bytes are in `dst`
+                pos = written = 0
+                for entry, start, stop in self._spans:
+                    if id(entry) in present and id(entry) not in self._dirty:
+                        #copied later, with the surrounding range
+                        spans.append((entry, written + start - pos, written + stop - pos))
+                        continue
+                    _copy_range(src, dst, pos, start - pos)
+                    written += start - pos
+                    pos = stop
+                    if id(entry) not in present and os.pread(src.fileno(), 1, stop) == b'\n':
+                        pos += 1  #a removed entry takes its line with it
+                    if id(entry) in present:
+                        data = self._render(entry, align)
+                        _write_all(dst, data)
+                        spans.append((entry, written, written + len(data)))
+                        written += len(data)
+                _copy_range(src, dst, pos, stat.st_size - pos)
+                written += stat.st_size - pos
+                for entry in added:
+                    data = self._render(entry, align)
+                    _write_all(dst, b'\n' + data + b'\n')
+                    spans.append((entry, written + 1, written + 1 + len(data)))
+                    written += len(data) + 2
+                os.fsync(dst.fileno())
+            if os.path.exists(target):
+                os.chmod(tmp, os.stat(target).st_mode & 0o7777)
+            os.replace(tmp, target)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+        bibedit_logger.info("Saved %s: %d entries rewritten, %d added.",
+            target, len(self._dirty & present), len(added))
+        if path is None:  #the session now describes the new file
+            self._spans = spans
+            self._dirty = set()
+            self._stat = os.stat(target)
+
+    def close(self):
+        """Save if the file was edited."""
+        if self.is_dirty():
+            self.save()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.close()
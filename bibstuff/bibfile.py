@@ -23,6 +23,7 @@ __strict__ = False # should we be strict with bibtex format?
 ####################### IMPORTS #####################################
 # import from standard library
 import re, logging
+from string import ascii_lowercase
 bibfile_logger = logging.getLogger('bibstuff_logger')
 
 # import dependencies
@@ -39,6 +40,9 @@ months_en = ('January','February','March','April','May','June',
 monthslower_en = [m.lower() for m in months_en]
 monthmacros_en = [m[:3] for m in monthslower_en]
 MONTH_DICT = dict( zip(monthmacros_en, months_en) )
+#lookup sets for writing entries (see `BibEntry.to_bibtex`)
+_month_names = frozenset(monthslower_en + monthmacros_en)
+_numeric_fields = frozenset(("year","number","volume","chapter"))
 #####################################################################
 
 
@@ -58,18 +62,27 @@ class BibEntry(dict):
     def __repr__(self):
         """return string representation of entry
         """
-        stringrep = '@%s{%s,\n' % (self.entry_type.upper() , self.citekey)
-        try:
-            mlen = max( len(key_str) for key_str in self._fields )  # for pretty format
-        except ValueError: #no fields (not a true entry)
-            mlen = 0
-            bibfile_logger.warn("Entry apparently has no fields.")
+        return self.to_bibtex()
+
+    def to_bibtex(self, align=None) -> str:
+        """Return str, the BibTeX representation of the entry.
+
+        :Parameters:
+          `align` : int
+            width of the field-name column
+            (default: the longest field name; 0 for no padding)
+        """
+        fields = self._fields
+        if not fields:
+            bibfile_logger.warning("Entry apparently has no fields.")
+        if align is None:
+            align = max(map(len, fields), default=0)  # for pretty format
         field_list = []
-        for key in self._fields:
+        for key in fields:
             addbraces = True
-            addquotes = False
-            #spacer = ' '*(mlen - len(key) )
-            val = self[key]
+            val = dict.get(self, key)
+            if val is None:
+                val = self[key]
             #handle crossref
             if key == 'crossref':
                 try: val = val['citekey'] #might be an entry
@@ -79,24 +92,30 @@ class BibEntry(dict):
                     addbraces = False  #i.e., assume it is a macro
             elif key == 'month':
                 # always use month macros if possible
-                if val.lower() in monthslower_en + monthmacros_en:
+                val = self[key]
+                if val.lower() in _month_names:
                     val = val[:3].lower()
                     addbraces = False
-            elif key in ("year","number","volume","chapter"):
-                try:
+            elif key in _numeric_fields:
+                if val.isascii() and val.isdigit():
                     addbraces = not int(val)
-                except:
-                    pass
+                else:
+                    try:
+                        addbraces = not int(val)
+                    except ValueError:
+                        pass
             if '@' in val:  # need to protect '@'
-                addquotes = True
-            if addquotes:
-                    val = '"' + val + '"'
+                val = '"' + val + '"'
             elif addbraces:
                 val = "{" + val + "}"
-            field_list.append("  %-*s = %s" % (mlen, key, val))
-        stringrep += ",\n".join(field_list)
-        stringrep += '\n}\n'
-        return stringrep
+            field_list.append("  %-*s = %s" % (align, key, val))
+        return '@%s{%s,\n%s\n}\n' % (self.entry_type.upper(), self.citekey, ",\n".join(field_list))
+
+    def write_to(self, fileobj, align=None):
+        """Write the BibTeX representation of the entry to `fileobj`
+        (a text file); see `to_bibtex` for `align`.
+        """
+        fileobj.write(self.to_bibtex(align))
 
     def __setitem__(self, key, val):
         key = key.lower()
@@ -127,6 +146,12 @@ class BibEntry(dict):
             result = MONTH_DICT[result]
         return result
     
+    def __reduce__(self):
+        """Support pickling (e.g., to send entries to worker processes).
+        :note: default dict-subclass pickling sets items before `_fields` exists
+        """
+        return (_rebuild_entry, (self.__class__, dict.copy(self), self.__dict__.copy()))
+
     def __delitem__(self,key) :
         key = key.lower()
         try:
@@ -189,7 +214,7 @@ class BibEntry(dict):
             found = reo.search( self[field] )
         else:
             if field in self:
-                bibfile_logger.info("Empty field %s in entry\n%s.\n."%(self,field))
+                bibfile_logger.info("Empty field %s in entry\n%s.\n.", field, self)
             found = None
         return found
 
@@ -201,7 +226,7 @@ class BibEntry(dict):
         :note: 2006-08-08 no longer sets a `_names` attribute
         :TODO: add default name_template useful for .bib files?
         """
-        bibfile_logger.debug(f"BibEntry.format_names: arg is: {names_formatter}.")
+        bibfile_logger.debug("BibEntry.format_names: arg is: %s.", names_formatter)
         names = self.get_names()  #get a BibName instance (or possibly, a string)
         #keep string if stuck with it
         if isinstance(names,str):
@@ -209,7 +234,7 @@ class BibEntry(dict):
         else: #assume a BibName instance
             #ask BibName instance to format itself (and it asks a NamesFormatter to do it)
             result = names.format(names_formatter)
-        bibfile_logger.debug(f"BibEntry.format_names result = {result}.")
+        bibfile_logger.debug("BibEntry.format_names result = %s.", result)
         return result
 
     def get_names(self, entry_formatter=None, try_fields=None):
@@ -246,7 +271,7 @@ class BibEntry(dict):
         return  bibname.BibName(raw_names,from_field=field)  #names are in a BibName object
 
     def format_with(self, entry_formatter):
-        bibfile_logger.debug("BibEntry.format_with: arg is:"+str(entry_formatter))
+        bibfile_logger.debug("BibEntry.format_with: arg is:%s", entry_formatter)
         #ask the EntryFormatter to do it
         return entry_formatter.format_entry(self)
 
@@ -294,9 +319,10 @@ class BibEntry(dict):
         citation keys. 
 
         :Parameters:
-            - used_citekeys : list
-                a list of the already taken citation keys
-                so that the function can avoid duplicates (by adding a,b,c,d... etc)
+            - used_citekeys : list or CitekeyAllocator
+                the already taken citation keys
+                so that the function can avoid duplicates (by adding b,c,d... etc);
+                a `CitekeyAllocator` also records the new key
             - style : str
                 The format of the citetekey is determined by a `label_style` (see below)
 
@@ -317,14 +343,29 @@ class BibEntry(dict):
                book = "%(names)s-%(year)s",
                misc = "%(names)s-%(year)s",
                default_type = "%(names)s-%(year)s")
-        
 
-        :TODO: Strip LaTeX accent characters from names when making label
+            An optional ``ascii_names = True`` decodes LaTeX in the names
+            and drops accents (see `bibnorm.label_normalizer`),
+            e.g., ``M\\"{u}ller`` -> ``Muller``.
 
         """
+        label_template, format_dict = self.citekey_label_parts(style)
+        year = format_dict['year']
 
+        # make unique result: if needed, append suffix b or c or d... to year
+        def make_label(sfx):
+            format_dict['year'] = year + sfx
+            return label_template % format_dict
+        if isinstance(used_citekeys, CitekeyAllocator):
+            return used_citekeys.allocate(make_label)
+        return CitekeyAllocator(used_citekeys).find(make_label)
+
+    def citekey_label_parts(self, style=citekey_label_style1):
+        """Return tuple, the label template and format dict (names, year, ...)
+        of the citekey for this entry (see `make_citekey`), before a suffix
+        is added to make it unique.
+        """
         from .bibstyles.shared import NameFormatter
-        from string import ascii_lowercase
 
         format_dict = {}
         entry_type = self.entry_type.lower()
@@ -349,6 +390,9 @@ class BibEntry(dict):
             ls = ls[:max_names] + [etal]
 
         names =  name_name_sep.join(ls)
+        if style.get('ascii_names', False):
+            from .bibnorm import label_normalizer
+            names = label_normalizer(names)
         if lower_name:
             names = names.lower()
         format_dict['names'] = names
@@ -359,21 +403,105 @@ class BibEntry(dict):
             jrnl = ''.join(jrnl.split()).lower()  # keep macro
             jrnl = jrnl.replace("journal","j",1)
             format_dict['jrnl'] = jrnl  # short form, no spaces
+        return label_template, format_dict
 
-        # make unique result: if needed, append suffix b or c or d... to year
-        sfx = ''; c = 1
-        # while result+sfx in used_citekeys:
-        while label_template%format_dict in used_citekeys:
-            sfx = ascii_lowercase[c%26]*(1+c//26)  # :note: lowercase since
-                                                   # BibTeX does not
-                                                   # distinguish case
-            format_dict['year'] = year+sfx
-            c += 1
-
-        result = label_template%format_dict
-        return result
 
+def citekey_suffix(n):
+    """Return str, the `n`-th citekey suffix: '' for 0, then b, c, ..., z, aa, bb, ...
+    (lowercase, since BibTeX does not distinguish case).
+    """
+    if n == 0:
+        return ''
+    return ascii_lowercase[n % 26] * (1 + n // 26)
+
+class CitekeyAllocator(object):
+    """Allocates unique citekeys (see `BibEntry.make_citekey`).
+    Stores the used citekeys in a set and, for each base label,
+    the next suffix to try, so a run of entries with the same base label
+    (e.g., Smith-2010, Smith-2010b, ...) does not retry the taken suffixes.
+    """
+    def __init__(self, used_citekeys=()):
+        self.used = set(used_citekeys)
+        self._next_suffix = dict()  #base label -> index of next suffix to try
+
+    def __contains__(self, citekey):
+        return citekey in self.used
+
+    def __len__(self):
+        return len(self.used)
+
+    def add(self, citekey):
+        """Record `citekey` as used."""
+        self.used.add(citekey)
 
+    def find(self, make_label):
+        """Return str, the first unused label ``make_label(citekey_suffix(n))``,
+        for n = 0, 1, 2, ... (without recording it).
+        """
+        base = make_label('')
+        if base not in self.used:
+            return base
+        n = self._next_suffix.get(base, 1)
+        label = make_label(citekey_suffix(n))
+        while label in self.used:
+            n += 1
+            label = make_label(citekey_suffix(n))
+        #labels for smaller n are taken, and stay taken
+        self._next_suffix[base] = n
+        return label
+
+    def allocate(self, make_label):
+        """Return str, the first unused label (see `find`), recording it as used."""
+        label = self.find(make_label)
+        self.used.add(label)
+        return label
+
+
+
+#used by BibEntry.__reduce__
+def _rebuild_entry(cls, items, state):
+    """Return BibEntry, rebuilt from its dict items and attributes."""
+    entry = cls()
+    entry.__dict__.update(state)
+    dict.update(entry, items)
+    return entry
+
+def entry_to_compact(entry) -> tuple:
+    """Return tuple, a compact and picklable form of `entry`:
+    (entry_type, citekey, fields, crossref), where `fields` is a tuple of
+    (field, raw value) pairs in field order and `crossref` is the
+    compact form of an attached crossref entry (or None).
+    Works for any entry class with the BibEntry interface.
+
+    :see: `entry_from_compact`
+    """
+    fields = []
+    crossref = None
+    for field in entry.fields:
+        val = dict.get(entry, field, '')
+        if field == 'crossref' and not isinstance(val, str):
+            crossref = entry_to_compact(val)
+            val = val.citekey
+        fields.append((field, val))
+    return (entry.entry_type, entry.citekey, tuple(fields), crossref)
+
+def entry_from_compact(data, entry_class=None):
+    """Return BibEntry (or `entry_class` instance), rebuilt from `entry_to_compact` data."""
+    entry_type, citekey, fields, crossref = data
+    entry = (entry_class or BibEntry)()
+    entry.entry_type = entry_type
+    entry.citekey = citekey
+    for field, val in fields:
+        entry[field] = val
+    if crossref is not None:
+        entry['crossref'] = entry_from_compact(crossref, entry_class)
+    return entry
+
+#used by BibFile.relabel (in worker processes)
+def _citekey_label_shard(task):
+    """Return list, the citekey label parts for a shard of compact entries."""
+    shard, style = task
+    return [entry_from_compact(compact).citekey_label_parts(style) for compact in shard]
 
 #used by BibFile
 def get_entry_by_citekey(entries, citekey):
@@ -398,6 +526,77 @@ class BibFile( DispatchProcessor ):
         self.entries = []
         self._macroMap = {}
 
+    def write(self, fileobj, align=None, entry_sep='\n', buffer_size=1 << 16):
+        """Write the entries, in BibTeX format, to text file `fileobj`.
+        Output is collected into writes of about `buffer_size` characters.
+
+        :Parameters:
+          `align` : int
+            width of the field-name column (default: per entry; see `BibEntry.to_bibtex`)
+          `entry_sep` : str
+            written between entries
+        """
+        chunk = []
+        size = 0
+        pending_sep = ''  #separator owed before the next chunk
+        for entry in self.entries:
+            text = entry.to_bibtex(align)
+            chunk.append(text)
+            size += len(text)
+            if size >= buffer_size:
+                fileobj.write(pending_sep)
+                fileobj.write(entry_sep.join(chunk))
+                pending_sep = entry_sep
+                chunk = []
+                size = 0
+        if chunk:
+            fileobj.write(pending_sep)
+            fileobj.write(entry_sep.join(chunk))
+
+    def relabel(self, style=BibEntry.citekey_label_style1, used_citekeys=None, jobs=1, shard_size=None):
+        """Give each entry a new citekey made by `BibEntry.make_citekey`
+        (crossref fields are not changed).  Return list, the new citekeys.
+
+        With `jobs` > 1, the label parts (which need name parsing and
+        formatting) are computed by a process pool; suffixes are then assigned
+        in entry order, so the result is the same as for a single job.
+
+        :Parameters:
+          `used_citekeys` : CitekeyAllocator
+            records the new citekeys (default: a new allocator)
+          `jobs` : int
+            number of worker processes (None: cpu count)
+          `shard_size` : int
+            entries per task (default: about four tasks per worker)
+        """
+        import os
+        if used_citekeys is None:
+            used_citekeys = CitekeyAllocator()
+        entries = self.entries
+        if jobs is None:
+            jobs = os.cpu_count() or 1
+        if jobs <= 1 or len(entries) < 2 * jobs:
+            parts = [entry.citekey_label_parts(style) for entry in entries]
+        else:
+            if shard_size is None:
+                shard_size = max(1, -(-len(entries) // (4 * jobs)))
+            compact = [entry_to_compact(entry) for entry in entries]
+            tasks = [(compact[i:i + shard_size], style) for i in range(0, len(compact), shard_size)]
+            import multiprocessing
+            with multiprocessing.Pool(jobs) as pool:
+                parts = []
+                for shard_result in pool.imap(_citekey_label_shard, tasks):
+                    parts.extend(shard_result)
+        result = []
+        for entry, (label_template, format_dict) in zip(entries, parts):
+            year = format_dict['year']
+            def make_label(sfx):
+                format_dict['year'] = year + sfx
+                return label_template % format_dict
+            entry.citekey = used_citekeys.allocate(make_label)
+            result.append(entry.citekey)
+        return result
+
     def get_entrylist(self, citekeys, discard=True):
         """Return list, the BibEntry instances that were found
         (and None for entries not found, unless discarded).
@@ -418,7 +617,7 @@ class BibFile( DispatchProcessor ):
             if entry:
                 crossref = entry.get('crossref', None)
                 if isinstance(crossref, str):
-                    crossref = self.get_entry_by_citekey(self.entries, crossref)
+                    crossref = get_entry_by_citekey(self.entries, crossref)
                     if crossref:
                         entry['crossref'] = crossref
         return result
@@ -199,7 +199,7 @@ class BibEntry(dict):
             found = reo.search( self[field] )
         else:
             if field in self:
-                bibfile_logger.info("Empty field %s in entry\n%s.\n."%(self,field))
+                bibfile_logger.info("Empty field %s in entry\n%s.\n.", field, self)
             found = None
         return found
 
@@ -211,7 +211,7 @@ class BibEntry(dict):
         :note: 2006-08-08 no longer sets a `_names` attribute
         :TODO: add default name_template useful for .bib files?
         """
-        bibfile_logger.debug(f"BibEntry.format_names: arg is: {names_formatter}")
+        bibfile_logger.debug("BibEntry.format_names: arg is: %s", names_formatter)
         names = self.get_names()  #get a BibName instance (or possibly, a string)
         #keep string if stuck with it
         if isinstance(names,str):
@@ -219,7 +219,7 @@ class BibEntry(dict):
         else: #assume a BibName instance
             #ask BibName instance to format itself (and it asks a NamesFormatter to do it)
             result = names.format(names_formatter)
-        bibfile_logger.debug(f"BibEntry.format_names result = {result}")
+        bibfile_logger.debug("BibEntry.format_names result = %s", result)
         return result
 
     def get_names(self, entry_formatter=None, try_fields=None):
@@ -260,7 +260,7 @@ class BibEntry(dict):
         return  bibname.BibName(raw_names, from_field=field)  #names are in a BibName object
 
     def format_with(self, entry_formatter):
-        bibfile_logger.debug("BibEntry.format_with: arg is:"+str(entry_formatter))
+        bibfile_logger.debug("BibEntry.format_with: arg is:%s", entry_formatter)
         #ask the EntryFormatter to do it
         return entry_formatter.format_entry(self)
 
@@ -22,11 +22,11 @@ __author__  =    ["Dylan W. Schwilk", "Alan G. Isaac"]
 
 ###################  IMPORTS  ##################################################
 #import from standard library:
-# None for module, but more imports if  run as main (see below).
+import re
+# (more imports if run as main; see below)
 
 #import dependencies
-from simpleparse.parser import Parser
-from simpleparse.common import numbers, strings, chartypes
+# simpleparse is imported when a parser is first needed (see `get_parser`)
 
 ################################################################################
 
@@ -82,14 +82,148 @@ string               :=  ('\"' , quotes_string?, '\"') / ('{' , braces_string?,
 """
 
 
-## instantiate SimpleParse parsers
-parser = Parser(dec, 'bibfile')
-entry_parser = Parser(dec, 'entry')
+## SimpleParse parsers are built on first use:
+## `parser` (root 'bibfile') and `entry_parser` (root 'entry')
+_parsers = dict()
+_parser_roots = dict(parser='bibfile', entry_parser='entry')
+
+def get_parser(root='bibfile'):
+    """Return parser (a `cache.CachedParser`) for production `root` of `dec`.
+    The tag table is generated (or loaded from the grammar cache) on first use.
+    """
+    try:
+        return _parsers[root]
+    except KeyError:
+        from .cache import CachedParser
+        result = _parsers[root] = CachedParser(dec, root)
+        return result
+
+def __getattr__(name):
+    """Provide the module attributes `parser` and `entry_parser` (built lazily)."""
+    try:
+        return get_parser(_parser_roots[name])
+    except KeyError:
+        raise AttributeError("module %r has no attribute %r" % (__name__, name))
 
 ## offer a default parse function
 def Parse(src, processor=None) :
     '''Parse the bibtex string *src*, process with *processor*.'''
-    return parser.parse(src,  processor=processor)
+    return get_parser('bibfile').parse(src,  processor=processor)
+
+## objects of a .bib file, for parsing one at a time:
+## '@', the entry type and the opening delimiter
+_object_head = re.compile(r'@[a-zA-Z]*\s*')
+## an object start, or a comment line (where the grammar allows `tb`)
+_object_start = re.compile(r'(?<!\S)%[^\n]*|@')
+_delimiters = re.compile(r'[{}()"%]')
+_closers = {'{': '}', '(': ')'}
+
+def _object_end(src, start):
+    """Return the index after the object starting at `start` in `src`,
+    or -1 if the object is incomplete, or None if `start` starts no object.
+    Like the grammar, delimiters in quoted strings and comments
+    (outside braces) do not end the object.
+    """
+    head = _object_head.match(src, start)
+    if head.end() == len(src):
+        return -1
+    opener = src[head.end()]
+    if opener not in _closers:
+        return None
+    closer = _closers[opener]
+    depth = 0  #of braces within the object
+    quoted = False  #in a quoted string (outside braces)
+    pos = head.end() + 1
+    while True:
+        match = _delimiters.search(src, pos)
+        if match is None:
+            return -1
+        char = match.group()
+        pos = match.end()
+        if char == '{':
+            depth += 1
+        elif char == '}' and depth:
+            depth -= 1
+        elif depth:
+            pass
+        elif char == '"':
+            quoted = not quoted
+        elif quoted:
+            pass
+        elif char == '%':  #a comment, to the end of the line
+            pos = src.find('\n', pos) + 1
+            if not pos:
+                return -1
+        elif char == closer:
+            return pos
+
+def iter_objects(fileobj, chunk_size=1 << 16, gaps=False):
+    """Yield the source text of each object (entry, macro, preamble or
+    comment entry) of the .bib file `fileobj`, reading `chunk_size`
+    characters at a time.  Text between objects is skipped,
+    unless `gaps` is true: then yield (text before the object, object)
+    pairs, and last (text after the last object, None), so that
+    the yielded strings add up to the whole file.
+    """
+    src = ''
+    pos = 0
+    gap_start = 0  #where the text since the last object starts in `src`
+    gap = []  #text since the last object, from earlier chunks
+    eof = False
+    while True:
+        match = _object_start.search(src, pos)
+        if match is None:
+            pos = len(src)
+        elif match.group() != '@':  #a comment, which may continue in the next chunk
+            if match.end() < len(src) or eof:
+                pos = match.end()
+                continue
+            pos = match.start()
+        else:
+            end = _object_end(src, match.start())
+            if end is None:  #junk
+                pos = match.end()
+                continue
+            if end > 0 or eof:
+                pos = end if end > 0 else len(src)
+                if gaps:
+                    gap.append(src[gap_start:match.start()])
+                    yield ''.join(gap), src[match.start():pos]
+                    gap = []
+                else:
+                    yield src[match.start():pos]
+                gap_start = pos
+                continue
+            pos = match.start()
+        if eof:
+            if gaps:
+                gap.append(src[gap_start:])
+                yield ''.join(gap), None
+            return
+        data = fileobj.read(chunk_size)
+        eof = not data
+        if gaps:
+            gap.append(src[gap_start:pos])
+        src = src[pos:] + data
+        pos = gap_start = 0
+
+def iter_entries(fileobj, processor=None, chunk_size=1 << 16):
+    """Parse the .bib file `fileobj` object by object, yielding each entry
+    (a `bibfile.BibEntry`) as it is parsed, so that memory use does not
+    grow with the file.  Macros are stored in `processor` (default: a new
+    `bibfile.BibFile`), whose `entries` are emptied as entries are yielded.
+    """
+    if processor is None:
+        from .bibfile import BibFile
+        processor = BibFile()
+    parser = get_parser('bibfile')
+    for src in iter_objects(fileobj, chunk_size):
+        parser.parse(src, processor=processor)
+        if processor.entries:
+            entries = processor.entries[:]
+            del processor.entries[:]
+            for entry in entries:
+                yield entry
 
 ## self-test
 if __name__ =="__main__":
@@ -0,0 +1,173 @@
+"""
+:mod:`bibstuff.bibjson`: streaming JSON conversion of BibTeX entries
+---------------------------------------------------------------------
+
+Converts `bibfile.BibEntry` instances to and from NDJSON (one JSON object
+per line), and to CSL-JSON items.  The writers take any iterable of
+entries (e.g., `bibgrammar.iter_entries`) and the reader is a generator,
+so conversions run in constant memory.
+
+An NDJSON object holds ``entry_type`` and ``citekey`` followed by the
+fields in entry order; a crossref is kept as the citekey it refers to::
+
+    {"entry_type": "article", "citekey": "Isaac:2010", "author": "Isaac, Alan G.", ...}
+
+See scripts/bibjson.py for the command-line filter.
+
+:copyright: Dylan Schwilk and Alan G Isaac, see AUTHORS
+:license: MIT (see LICENSE)
+"""
+__docformat__ = "restructuredtext en"
+
+###################  IMPORTS  ##################################################
+#import from standard library
+import json, re
+
+#bibstuff imports
+from .bibfile import BibEntry, monthslower_en
+################################################################################
+
+#BibTeX entry type -> CSL item type
+CSL_TYPES = dict(
+    article = 'article-journal',
+    book = 'book',
+    booklet = 'pamphlet',
+    inbook = 'chapter',
+    incollection = 'chapter',
+    inproceedings = 'paper-conference',
+    conference = 'paper-conference',
+    manual = 'report',
+    mastersthesis = 'thesis',
+    phdthesis = 'thesis',
+    misc = 'document',
+    proceedings = 'book',
+    techreport = 'report',
+    unpublished = 'manuscript',
+    )
+#BibTeX field -> CSL variable
+CSL_FIELDS = dict(
+    title = 'title',
+    journal = 'container-title',
+    booktitle = 'container-title',
+    series = 'collection-title',
+    publisher = 'publisher',
+    school = 'publisher',
+    institution = 'publisher',
+    organization = 'publisher',
+    address = 'publisher-place',
+    volume = 'volume',
+    number = 'issue',
+    edition = 'edition',
+    chapter = 'chapter-number',
+    pages = 'page',
+    doi = 'DOI',
+    isbn = 'ISBN',
+    issn = 'ISSN',
+    url = 'URL',
+    note = 'note',
+    abstract = 'abstract',
+    keywords = 'keyword',
+    )
+CSL_NAMES = ('author', 'editor')
+_thesis_genres = dict(mastersthesis="Master's thesis", phdthesis='PhD thesis')
+_year_re = re.compile(r'-?\d+')
+
+
+def entry_to_json(entry):
+    """Return dict, the JSON object for BibEntry `entry`."""
+    result = dict(entry_type=entry.entry_type, citekey=entry.citekey)
+    for name in entry.fields:
+        value = dict.get(entry, name, '')
+        if not isinstance(value, str):  #an attached crossref entry
+            value = value.citekey
+        result[name] = value
+    return result
+
+def entry_from_json(data, entry_class=None):
+    """Return BibEntry (or `entry_class` instance) from JSON object `data`,
+    with the fields in the order given.
+    """
+    entry = (entry_class or BibEntry)()
+    for name, value in data.items():
+        if name == 'entry_type':
+            entry.entry_type = value
+        else:
+            entry[name] = value
+    return entry
+
+def _csl_names(raw_names):
+    from .bibname import BibName
+    result = []
+    for name in BibName(raw_names).get_names_dicts():
+        person = dict()
+        if name['first']:
+            person['given'] = ' '.join(name['first'])
+        if name['von']:
+            person['non-dropping-particle'] = ' '.join(name['von'])
+        person['family'] = ' '.join(name['last'])
+        if name['jr']:
+            person['suffix'] = ' '.join(name['jr'])
+        result.append(person)
+    return result
+
+def entry_to_csl(entry):
+    """Return dict, the CSL-JSON item for BibEntry `entry`.
+    Fields without a CSL variable are left out; names are parsed with
+    `bibname.BibName`, and year and month become the ``issued`` date.
+    """
+    entry_type = entry.entry_type
+    result = dict(id=entry.citekey, type=CSL_TYPES.get(entry_type, 'document'))
+    if entry_type in _thesis_genres:
+        result['genre'] = _thesis_genres[entry_type]
+    for name in entry.fields:
+        value = entry[name]
+        if not isinstance(value, str) or not value:
+            continue
+        if name in CSL_NAMES:
+            result[name] = _csl_names(value)
+        elif name in CSL_FIELDS:
+            if name == 'pages':
+                value = value.replace('--', '-')
+            elif name == 'number' and entry_type not in ('article', 'periodical'):
+                result['number'] = value
+                continue
+            result.setdefault(CSL_FIELDS[name], value)
+    year = _year_re.search(entry['year'])
+    if year:
+        date = [int(year.group())]
+        month = entry['month'].lower()
+        if month in monthslower_en:
+            date.append(monthslower_en.index(month) + 1)
+        result['issued'] = {'date-parts': [date]}
+    return result
+
+def write_ndjson(entries, fileobj, csl=False):
+    """Write each entry in iterable `entries` as a line of JSON to text file `fileobj`
+    (as CSL-JSON items if `csl`).  Return int, the number of entries written.
+    """
+    convert = entry_to_csl if csl else entry_to_json
+    count = 0
+    for entry in entries:
+        fileobj.write(json.dumps(convert(entry), ensure_ascii=False))
+        fileobj.write('\n')
+        count += 1
+    return count
+
+def write_csl_array(entries, fileobj):
+    """Write the entries in iterable `entries` to text file `fileobj`
+    as a CSL-JSON array, one item per line.  Return int, the number of entries written.
+    """
+    count = 0
+    fileobj.write('[')
+    for entry in entries:
+        fileobj.write(',\n' if count else '\n')
+        fileobj.write(json.dumps(entry_to_csl(entry), ensure_ascii=False))
+        count += 1
+    fileobj.write('\n]\n')
+    return count
+
+def iter_ndjson(fileobj, entry_class=None):
+    """Yield a BibEntry for each line of JSON in text file `fileobj` (blank lines are skipped)."""
+    for line in fileobj:
+        if line.strip():
+            yield entry_from_json(json.loads(line), entry_class)
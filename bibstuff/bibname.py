@@ -43,9 +43,9 @@ logging.basicConfig(format='\n%(levelname)s:\n%(message)s\n')
 bibname_logger = logging.getLogger('bibstuff_logger')
 
 # import dependencies
+# (pybtex and the namelist parser are loaded on first use; see `__getattr__`)
 import simpleparse
 from simpleparse.dispatchprocessor import dispatch
-import pybtex.database
 #from string import maketrans
 
 # BibStuff imports
@@ -99,26 +99,55 @@ jr       := "jr" / "Jr" / "JR" /  "Junior" / "junior" /
 <sp>                  := [ \t\n\r.]
 """
 
-bibnamelist_parser = simpleparse.parser.Parser(ebnf_bibname, 'namelist')
-
 ######################################################
 
-# ----------- Public Classes and Functions -----------------#
+# ----------- Lazily built module attributes -----------------#
 
-class Person(pybtex.database.Person):
-    def __init__(self, string="", **kwargs):
-        super().__init__(string=string, **kwargs)
-        self._raw = string
-        
-    def fvlj(self):
-        firsts = self.first_names + self.middle_names
-        result = dict(
-            first=firsts,
-            von=self.prelast_names,
-            last=self.last_names,
-            jr=self.lineage_names
-            )
-        return result
+def _make_bibnamelist_parser():
+    from .cache import CachedParser
+    return CachedParser(ebnf_bibname, 'namelist')
+
+def _make_person_class():
+    import pybtex.database
+
+    class Person(pybtex.database.Person):
+        def __init__(self, string="", **kwargs):
+            super().__init__(string=string, **kwargs)
+            self._raw = string
+
+        def fvlj(self):
+            firsts = self.first_names + self.middle_names
+            result = dict(
+                first=firsts,
+                von=self.prelast_names,
+                last=self.last_names,
+                jr=self.lineage_names
+                )
+            return result
+
+    Person.__qualname__ = 'Person'
+    return Person
+
+_lazy_attributes = dict(
+    bibnamelist_parser = _make_bibnamelist_parser,
+    Person = _make_person_class)
+
+def __getattr__(name):
+    """Provide `bibnamelist_parser` and `Person` (a pybtex Person),
+    which are built on first use to keep imports fast.
+    """
+    try:
+        make = _lazy_attributes[name]
+    except KeyError:
+        raise AttributeError("module %r has no attribute %r" % (__name__, name))
+    result = globals()[name] = make()
+    return result
+
+def _get(name):
+    """Return module attribute `name`, building it if needed."""
+    return globals().get(name) or __getattr__(name)
+
+# ----------- Public Classes and Functions -----------------#
 
 
 
@@ -168,7 +197,7 @@ class BibName( simpleparse.dispatchprocessor.DispatchProcessor ):
             if p not in newdict:
                 newdict[p] = []
         '''
-        self.persons.append(Person(abuffer[start:stop]))
+        self.persons.append(_get('Person')(abuffer[start:stop]))
 
     '''transition to pybtex
     def last(self, tuple4, buffer ):
@@ -211,7 +240,7 @@ class BibName( simpleparse.dispatchprocessor.DispatchProcessor ):
         all the name values currently contained in an instance.
         Parses the names field with the bibname grammar."""
         self._names_dicts = []  # Replace extant list of  names
-        bibnamelist_parser.parse(raw_name,  processor =  self)
+        _get('bibnamelist_parser').parse(raw_name,  processor =  self)
 
     def get_names_dicts(self):  #:note: renamed
         """
@@ -0,0 +1,138 @@
+"""
+:mod:`bibstuff.bibnorm`: plain-text normalisation of BibTeX field values
+-------------------------------------------------------------------------
+
+Sorting, duplicate detection, searching and citekey making all want a
+plain-text form of field values: LaTeX decoded to unicode, braces and
+font commands removed, whitespace collapsed and case folded.
+A `FieldNormalizer` computes that form once per distinct raw string
+and keeps it in a bounded least-recently-used cache; the results are
+interned, so equal normalised values share one string object.
+`NormalizedEntry` is a read-only view of a `bibfile.BibEntry` through
+a normaliser; the entry itself is not changed.
+
+Example::
+
+    view = NormalizedEntry(entry)
+    view['author']  #-> 'müller, jörg' for 'M\\"{u}ller, J\\"{o}rg'
+    sorted(bfile.entries, key=lambda e: NormalizedEntry(e).key(('author', 'year')))
+
+:copyright: Dylan Schwilk and Alan G Isaac, see AUTHORS
+:license: MIT (see LICENSE)
+"""
+__docformat__ = "restructuredtext en"
+
+###################  IMPORTS  ##################################################
+#import from standard library
+import re, sys, unicodedata
+from collections import OrderedDict
+from collections.abc import Mapping
+
+#bibstuff imports
+from .data.latex_codec import latex_to_unicode
+################################################################################
+
+#default number of distinct raw strings kept by a FieldNormalizer
+DEFAULT_NORMALIZER_SIZE = 2**16
+
+#font and other commands left after decoding (e.g., \emph, \textit)
+_commands = re.compile(r'\\[a-zA-Z]+\s*|\\(?=[^a-zA-Z])')
+_delete_table = str.maketrans('', '', '{}')
+
+
+def plain_text(text, casefold=True, ascii=False):
+    """Return str, the plain-text form of latex source `text` (uncached).
+
+    :Parameters:
+      `casefold` : bool
+        fold case (for comparisons)
+      `ascii` : bool
+        drop accents (e.g., for citekeys); other non-ASCII letters are kept
+    """
+    result = latex_to_unicode(text)
+    if '\\' in result:
+        result = _commands.sub('', result)
+    result = ' '.join(result.translate(_delete_table).split())
+    if ascii and not result.isascii():
+        result = ''.join(c for c in unicodedata.normalize('NFKD', result)
+            if not unicodedata.combining(c))
+    if casefold:
+        result = result.casefold()
+    return result
+
+
+class FieldNormalizer(object):
+    """Maps raw field strings to their plain-text form (see `plain_text`),
+    caching up to `max_size` distinct strings with least-recently-used eviction.
+    Call the instance on a string to normalise it.
+    """
+    def __init__(self, max_size=DEFAULT_NORMALIZER_SIZE, casefold=True, ascii=False):
+        self.max_size = max_size
+        self.casefold = casefold
+        self.ascii = ascii
+        self._cache = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __call__(self, text):
+        cache = self._cache
+        try:
+            result = cache[text]
+        except KeyError:
+            self.misses += 1
+            result = sys.intern(plain_text(text, self.casefold, self.ascii))
+            cache[text] = result
+            if len(cache) > self.max_size:
+                cache.popitem(last=False)
+        else:
+            self.hits += 1
+            cache.move_to_end(text)
+        return result
+
+    def __len__(self):
+        return len(self._cache)
+
+    def clear(self):
+        """Remove all cached values."""
+        self._cache.clear()
+
+#shared normalisers: for comparisons, and for citekeys (accents dropped, case kept)
+default_normalizer = FieldNormalizer()
+label_normalizer = FieldNormalizer(casefold=False, ascii=True)
+
+
+class NormalizedEntry(Mapping):
+    """Read-only view of BibEntry `entry` with normalised field values.
+    Values are looked up as ``entry[field]`` (so crossrefs and month macros apply);
+    the view iterates over the entry's own fields.
+    """
+    def __init__(self, entry, normalizer=None):
+        self.entry = entry
+        self.normalizer = normalizer or default_normalizer
+
+    def __getitem__(self, field):
+        value = self.entry[field]
+        if not isinstance(value, str):  #an attached crossref entry
+            value = value.citekey
+        return self.normalizer(value)
+
+    def __iter__(self):
+        return iter(self.entry.fields)
+
+    def __len__(self):
+        return len(self.entry.fields)
+
+    def __contains__(self, field):
+        return field.lower() in self.entry.fields
+
+    @property
+    def citekey(self):
+        return self.entry.citekey
+
+    @property
+    def entry_type(self):
+        return self.entry.entry_type
+
+    def key(self, fields):
+        """Return tuple, the normalised values of `fields` (e.g., a sort or dedup key)."""
+        return tuple(self[field] for field in fields)
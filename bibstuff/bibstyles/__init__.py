@@ -1,17 +1,30 @@
 """The bibstyles package provides classes and styles for formatted text output.
 
 This is the __init__.py for bibstyles package
+
+Style modules are imported on first use:
+use `from_name`, or access them as attributes (e.g., ``bibstyles.default``).
 """
 
-from . import default
-from . import example_numbered
-from . import jasss_style
+import importlib
 
+#style modules, and their aliases
 _named = dict(
-    default = default,
-    example_numbered = example_numbered,
-    jasss_style = jasss_style,
-    jasss = jasss_style)
+    default = 'default',
+    example_numbered = 'example_numbered',
+    jasss_style = 'jasss_style',
+    jasss = 'jasss_style')
+
+#other modules in the package
+_modules = ('shared', 'default_templates')
 
 def from_name(name):
-    return _named[name]
+    """Return module, the style named `name`
+    (a module in this package, or one of its aliases), imported on first use.
+    """
+    return importlib.import_module('.' + _named.get(name, name), __name__)
+
+def __getattr__(name):
+    if name in _named or name in _modules:
+        return from_name(name)
+    raise AttributeError("module %r has no attribute %r" % (__name__, name))
@@ -79,8 +79,9 @@ class CitationManager(shared.CitationManager):
         that the CiteRefProcessor will use to substitute inline for citation references.
         """
         style_logger.debug('default: enter CitationManager.format_inline_cite')
-        #:note: need entry to be None if cite_key not found, so discard=False
-        entry_list = self.find_entries(cite_key_list,discard=False)
+        #:note: need entry to be None if cite_key not found
+        #:note: the CiteRefProcessor already resolved these keys, so this is a cache hit
+        entry_list = self.resolve_entries(cite_key_list)
         """
         for entry in entry_list:
             print entry
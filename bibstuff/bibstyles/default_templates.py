@@ -53,13 +53,21 @@ _specialchars = re.compile(r'{\\([a-zA-Z])}')
 _deletechars = re.compile(r'[\\{}]')
 _ldquote = re.compile(r'``')
 
+#:note: _specialchars is subsumed by _deletechars (both leave just the letter)
+_delete_table = str.maketrans('', '', '\\{}')
+
 def default_post_processor(citations_as_string):
-    result = citations_as_string
-    result = _crs.sub(' ', result)
-    result = _aigu.sub('', result)
-    result = _specialchars.sub(r'\1', result)
-    result = _deletechars.sub('', result)
-    result = _ldquote.sub('"', result)
+    """Return str, the citation(s) with newlines, accents and braces removed.
+    Same result as applying _crs, _aigu, _specialchars, _deletechars
+    and _ldquote in turn, but only the newline handling needs a regex;
+    the rest is a single translation pass plus plain replacements.
+    """
+    result = _crs.sub(' ', citations_as_string)
+    if '\\' in result:
+        result = result.replace("\\'", '')
+    result = result.translate(_delete_table)
+    if '``' in result:
+        result = result.replace('``', '"')
     return result
 
 DEFAULT_CITEREF_TEMPLATE = dict(
@@ -53,9 +53,8 @@ class CitationManager(shared.CitationManager):
 	default_citation_template = CITATION_TEMPLATE
 	################### CITEREF FORMATTING #########################
 	def format_inline_cite(self, cite_key_list):
-		entry_list = self.find_entries(cite_key_list,discard=False)
-		all_keys = self.citeref_processor.all_citekeys
-		return format_inline_cite(entry_list,cite_key_list,all_keys)
+		entry_list = self.resolve_entries(cite_key_list)
+		return format_inline_cite(entry_list,cite_key_list,self.citation_ranks)
 
 	################### CITATION FORMATTING ########################
 	def get_citation_label(self, entry, template=None):
@@ -66,13 +65,16 @@ class CitationManager(shared.CitationManager):
 
 
 
-def format_inline_cite(entries, keys, all_keys) :
+def format_inline_cite(entries, keys, citation_ranks) :
+	"""Return string, the numbered inline citation for `keys`.
+	`citation_ranks` maps each citekey to its (unit-based) citation rank.
+	"""
 	formatted_list = []
 	assert(len(entries)==len(keys))
 	for i in range(len(entries)):
 		if not entries[i]:
 			formatted_list.append(keys[i]) #keys appear for missing entries
 		else:
-			formatted_list.append('%d'%(all_keys.index(keys[i])+1))
+			formatted_list.append('%d'%citation_ranks[keys[i]])
 	return '(' + ", ".join(formatted_list)+')'
 
@@ -14,7 +14,7 @@ __version__ = "1.32"
 
 ###################  IMPORTS  ##################################################
 #import from standard library
-import logging
+import functools, logging, re
 from typing import List, Optional, Sequence
 #import dependencies
 import simpleparse
@@ -45,6 +45,48 @@ def append_sep(s,sep):
         sep = sep[1:]
     return s+sep
 
+def wrap_text(text, width) -> List[str]:
+    """Return list of str, the lines of a greedy fill of `text` into `width`.
+    `text` must be normalized: words separated by single spaces
+    (e.g., ``' '.join(para.split())``).
+    A word that does not fit starts a new line,
+    and a very long word gets its own line (unsplit).
+    Each line is found with a single search for its last space,
+    so time is linear in the text length.
+    """
+    if width < 1:
+        return text.split()
+    lines = []
+    pos = 0
+    textlen = len(text)
+    while textlen - pos > width:
+        end = text.rfind(' ', pos, pos + width + 1)
+        if end <= pos:  #long word
+            end = text.find(' ', pos)
+            if end < 0:
+                break
+        lines.append(text[pos:end])
+        pos = end + 1
+    if pos < textlen:
+        lines.append(text[pos:])
+    return lines
+
+def _justifier(left, right, just):
+    """Return function, which justifies a list of lines into a paragraph."""
+    lwidth = right - left
+    margin = ' ' * left
+    just = just.upper()
+    if just == "CENTER":
+        return lambda lines: '\n'.join([margin + line.center(lwidth) for line in lines])
+    elif just == "RIGHT":
+        return lambda lines: '\n'.join([line.rjust(right) for line in lines])
+    elif just != "LEFT":
+        shared_logger.error("Unrecognized justification style: %s", just)
+        #default left justifcation
+    if left:
+        return lambda lines: margin + ('\n' + margin).join(lines) if lines else ''
+    return '\n'.join
+
 def reformat_para(para='', left=0, right=72, just='LEFT'):
     """Return str, a formated paragraph.
     left (int) : left margin offset
@@ -54,30 +96,128 @@ def reformat_para(para='', left=0, right=72, just='LEFT'):
     :note: adapted by Schwilk and Isaac from David Mertz's example in TPiP
     :see:  Mertz, David,  *Text Processing in Python* (TPiP)
     """
-    lines = []
-    newline  = ""
-    lwidth = right - left
-    for word in para.split():
-        if newline == "":
-            newline = word
-        elif lwidth - len(newline) > len(word):
-            newline += " " + word
+    lines = wrap_text(' '.join(para.split()), right - left)
+    return _justifier(left, right, just)(lines)
+
+def reformat_paras(paras, left=0, right=72, just='LEFT') -> List[str]:
+    """Return list of str, each paragraph in `paras` formatted by `reformat_para`.
+    The justification is set up once for the whole batch.
+    """
+    justify = _justifier(left, right, just)
+    width = right - left
+    return [justify(wrap_text(' '.join(para.split()), width)) for para in paras]
+
+
+# fields in an entry-type template, e.g. '%(year)s'
+_template_field = re.compile(r"%\((?P<field>[^)]*)\)s|%%")
+
+@functools.lru_cache(maxsize=None)
+def compile_type_template(type_template):
+    """Return function, which formats an entry as ``type_template % entry``
+    (or None, if the template uses more than ``%(field)s`` and ``%%``).
+
+    The template is parsed once; each field becomes an accessor, and
+    formatting is a single join of literal text and field values.
+    A field stored in the entry (a dict) is read directly;
+    any other field (and 'month' or 'key') goes through ``entry[field]``
+    (i.e., BibEntry's crossref and month-macro handling).
+    """
+    pieces = []   #literal strings, and (field,) tuples
+    pos = 0
+    for match in _template_field.finditer(type_template):
+        literal = type_template[pos:match.start()]
+        if '%' in literal:
+            return None
+        pieces.append(literal)
+        field = match.group('field')
+        pieces.append('%' if field is None else (field,))
+        pos = match.end()
+    literal = type_template[pos:]
+    if '%' in literal:
+        return None
+    pieces.append(literal)
+    #merge adjacent literals
+    parts = []
+    for piece in pieces:
+        if isinstance(piece, str) and parts and isinstance(parts[-1], str):
+            parts[-1] += piece
+        elif piece != '':
+            parts.append(piece)
+    accessors = []
+    for part in parts:
+        if isinstance(part, str):
+            accessors.append((part, None, None))
         else:
-            lines.append(newline)
-            newline = word  #this wi
-    if len(newline) > 0:
-        lines.append(newline)
-    if just.upper() == "CENTER":
-        result = '\n'.join([' '*left+line.center(lwidth) for line in lines])
-    elif just.upper() == "RIGHT":
-        result = '\n'.join([line.rjust(right) for line in lines])
-    elif just.upper() == "LEFT":
-        result = '\n'.join([' '*left + line for line in lines])
-    else:
-        shared_logger.error("Unrecognized justification style: %s", just)
-        #default left justifcation
-        result = '\n'.join([' '*left+line for line in lines])
-    return result
+            field = part[0]
+            fast = field.lower() not in ('month', 'key')
+            accessors.append((None, field, field.lower() if fast else None))
+    _get = dict.get
+    def format_entry_details(entry):
+        is_dict = isinstance(entry, dict)
+        values = []
+        for literal, field, stored in accessors:
+            if literal is not None:
+                values.append(literal)
+                continue
+            val = _get(entry, stored) if (stored and is_dict) else None
+            if val is None:
+                val = entry[field]
+            values.append(val if isinstance(val, str) else '%s' % (val,))
+        return ''.join(values)
+    return format_entry_details
+
+
+class CitekeySet(object):
+    """Provides an insertion-ordered set of citekeys.
+    Membership tests and rank lookups are O(1),
+    so a `CiteRefProcessor` can record each new citekey
+    as it is encountered without rescanning the keys seen so far.
+    Supports ``in``, ``len``, iteration, and list-like `index`.
+
+    :note: `index` is zero-based (like ``list.index``); `rank` is unit-based.
+    """
+    def __init__(self, citekeys=()):
+        self._keys = []
+        self._index = {}
+        for citekey in citekeys:
+            self.add(citekey)
+
+    def add(self, citekey) -> bool:
+        """Return bool, True if `citekey` was new (and so was appended)."""
+        if citekey in self._index:
+            return False
+        self._index[citekey] = len(self._keys)
+        self._keys.append(citekey)
+        return True
+
+    def index(self, citekey) -> int:
+        """Return int, zero-based position of `citekey`.
+        Raise ValueError if `citekey` has not been added.
+        """
+        try:
+            return self._index[citekey]
+        except KeyError:
+            raise ValueError("%s is not in CitekeySet" % citekey)
+
+    def rank(self, citekey) -> Optional[int]:
+        """Return int, unit-based citation rank (or None if not found)."""
+        idx = self._index.get(citekey)
+        return None if idx is None else idx + 1
+
+    def __contains__(self, citekey):
+        return citekey in self._index
+
+    def __iter__(self):
+        return iter(self._keys)
+
+    def __len__(self):
+        return len(self._keys)
+
+    def __getitem__(self, idx):
+        return self._keys[idx]
+
+    def __repr__(self):
+        return "CitekeySet(%r)" % self._keys
 
 
 class NamesFormatter(object):
@@ -100,7 +240,7 @@ class NamesFormatter(object):
     """
     def __init__(self, citation_template=None, template_list=None, initials=''):
         """Create name formatters for each template."""
-        shared_logger.debug(f"NamesFormatter.__init__ args: {((citation_template,template_list,initials))}")
+        shared_logger.debug("NamesFormatter.__init__ args: %s", (citation_template,template_list,initials))
         assert (template_list or citation_template), "Must provide formatting templates."
         if citation_template:
             self.citation_template = citation_template
@@ -136,7 +276,7 @@ class NamesFormatter(object):
 
         .. _`NAME FORMATTING TEMPLATES`: bibstyles/shared.py
         """
-        shared_logger.debug("NamesFormatter.format: Type of names data is "+str(type(names)))
+        shared_logger.debug("NamesFormatter.format: Type of names data is %s", type(names))
         #get the list of name_dicts from the BibName instance
         #   each name_dict in the list has the keys: first , von, last, jr
         names_dicts = names.get_names_dicts()
@@ -149,7 +289,7 @@ class NamesFormatter(object):
         if num_names > 1 and num_names <= self.max_citation_names:
             for name_dict in names_dicts[1:]:  #for each name ...
                 formatted_name_list.append( self.formatters[1].format_name(name_dict) )
-        shared_logger.debug("NamesFormatter.format_names: formatted_name_list: "+str(formatted_name_list))
+        shared_logger.debug("NamesFormatter.format_names: formatted_name_list: %s", formatted_name_list)
 
         #formatted_name_list = [' '.join(names_dicts[0]['last'])]
 
@@ -203,7 +343,7 @@ class NameFormatter(object):
     :note: 20080331 allow capital part-designators (FVLJ) to force capitalization
     """
     def __init__(self, template, initials=''):
-        shared_logger.debug("NameFormatter.__init__ args: "+str((template,initials)))
+        shared_logger.debug("NameFormatter.__init__ args: %s", (template,initials))
         #set a default partsep
         #:note: not planning to parameterize this default (e.g., in the citation template)
         self.default_partsep = ' '
@@ -220,18 +360,23 @@ class NameFormatter(object):
         :param `name_data`: list of name_parts or name as string
         :type `name_data`: list or string
         """
-        shared_logger.debug("NameFormatter.format_name:\nType of name_data is: "+str(type(name_data)))
+        debug = shared_logger.isEnabledFor(logging.DEBUG)
+        if debug:
+            shared_logger.debug("NameFormatter.format_name:\nType of name_data is: %s", type(name_data))
         if isinstance( name_data, (list,tuple) ):
-            shared_logger.debug("Assume list is a name_parts list.")
+            if debug:
+                shared_logger.debug("Assume list is a name_parts list.")
             result = self.name_parts2formatted(name_data)  #TODO: currently commented out for testing dicts
         elif isinstance(name_data, dict):
-            shared_logger.debug("Assume dict is a name_dict.")
+            if debug:
+                shared_logger.debug("Assume dict is a name_dict.")
             result = self.name_dict2formatted(name_data)
         elif isinstance(name_data, str):
             result = name_data
         else:
             raise ValueError("Unrecognized name_data type.")
-        shared_logger.debug("NameFormatter.format_name result: '"+result+"'")
+        if debug:
+            shared_logger.debug("NameFormatter.format_name result: '%s'", result)
         return result
 
     '''
@@ -263,12 +408,16 @@ class NameFormatter(object):
         assert ( len(name_dict['last'][0]) > 0 )
         if name_dict['last'][0] == "others":
             return "others"
-        shared_logger.debug("name_dict2formatted: name_dict is "+str(name_dict))
+        #check the log level once, not for each name part
+        debug = shared_logger.isEnabledFor(logging.DEBUG)
+        if debug:
+            shared_logger.debug("name_dict2formatted: name_dict is %s", name_dict)
         #get the partdict (that was produced from the name template)
         #  recall that the partdict has keys: pre, post, partsep, parts_order
         #  the parts_order value is a string with characters from "FVLJfvlj"
         partdict = self.partdict
-        shared_logger.debug("name_dict2formatted: partdict is "+str(partdict))
+        if debug:
+            shared_logger.debug("name_dict2formatted: partdict is %s", partdict)
         result = ''
         #name_dict has keys, and each value is a list (e.g., of one person's last names)
         map_names_parts = dict(f='first', v='von', l='last', j='jr')
@@ -286,7 +435,8 @@ class NameFormatter(object):
                 if partcode.isupper():
                     part = part.upper()
                 result += partdict[partcode]['pre'] + part + partdict[partcode]['post']
-            shared_logger.debug("%s: %s"%(partcode,result))
+            if debug:
+                shared_logger.debug("%s: %s", partcode, result)
         return result
 
     def get_template(self):
@@ -297,7 +447,7 @@ class NameFormatter(object):
 
         sets the name formatting template *and* sets the associated partdict used for actual formatting 
         """
-        shared_logger.debug("NameFormatter.set_template args: "+str(template))
+        shared_logger.debug("NameFormatter.set_template args: %s", template)
         assert isinstance(template, str), "Provide a name-template string to make a NameFormatter object."
         self._template = template
         self.partdict = self.template2dict(template)
@@ -327,7 +477,7 @@ class NameFormatter(object):
                         partsep = self.default_partsep
                     partdict[partid] = dict(pre=pre,post=post,partsep=partsep)
                     break
-        shared_logger.debug("template2dict: name formatting template parsed to:\n"+str(partdict))
+        shared_logger.debug("template2dict: name formatting template parsed to:\n%s", partdict)
         partdict['parts_order'] = parts_order
         return partdict
 
@@ -337,6 +487,8 @@ class CitationManager(object):
     :TODO: possibly useful for bibsearch.py as well
     """
     default_citation_template = DEFAULT_CITATION_TEMPLATE.copy()
+    #optional bibstuff.cache.CitationCache (see `set_citation_cache`)
+    citation_cache = None
 
     def __init__(self,
         bibs, #sequence of parsed bib files
@@ -345,6 +497,12 @@ class CitationManager(object):
         sortkey=None
         ):
         self._bibs = bibs
+        #maps citekey -> entry (or None); see `resolve_entries`
+        self._resolved_entries = {}
+        #maps citekey -> hash of entry content; see `entry_hash`
+        self._entry_hashes = {}
+        #maps citekey -> unit-based citation rank; see `add_citekey`
+        self.citation_ranks = {}
         #:alert: set_citekeys -> self._entries created!
         self.set_citekeys(citekeys)
         if citation_template is None:
@@ -381,8 +539,11 @@ class CitationManager(object):
     def set_citekeys(self, citekeys):
         """set self._citekeys to keys **and** make associated entries
         """
-        shared_logger.debug("shared.CitationManager.set_citekeys %s."%citekeys)
+        shared_logger.debug("shared.CitationManager.set_citekeys %s.", citekeys)
         self._citekeys = citekeys
+        self.citation_ranks = {}
+        for citekey in (citekeys or ()):
+            self.add_citekey(citekey)
         if citekeys:
             #discard keys that do not have an entry
             self._entries = self.find_entries(citekeys, discard=True)
@@ -390,6 +551,17 @@ class CitationManager(object):
             self._entries = []
     citekeys = property(get_citekeys, set_citekeys, None, "citekeys property")
 
+    def add_citekey(self, citekey):
+        """Return int, the citation rank of `citekey`,
+        giving it the next rank if it has not been seen before.
+        Called by the CiteRefProcessor as it discovers new citekeys.
+        """
+        ranks = self.citation_ranks
+        rank = ranks.get(citekey)
+        if rank is None:
+            rank = ranks[citekey] = len(ranks) + 1
+        return rank
+
     def find_entries(self,
         citekeys: Optional[Sequence] = None,
         discard: bool = True
@@ -399,12 +571,70 @@ class CitationManager(object):
         """
         if citekeys is None:
             citekeys = self.citekeys
-        result = []
-        #TODO: check for reuse of citekeys in different BibFile objects
+        result = self.resolve_entries(citekeys)
+        if discard:
+            bad_keys = [key for (key, entry) in zip(citekeys, result) if entry is None]
+            if bad_keys:
+                shared_logger.warning("Database entries not found for the following keys:\n"+"\n".join(bad_keys))
+            result = [entry for entry in result if entry is not None]
+        return result
+
+    def resolve_entries(self, citekeys):
+        """Return list, one entry per citekey (None if no entry was found).
+        Each distinct citekey is looked up in the bibs at most once
+        over the life of the citation manager (i.e., once per document);
+        later requests are answered from a cache.
+        If a citekey is in more than one bib, the first bib wins.
+        """
+        resolved = self._resolved_entries
+        #unique unresolved keys, in citation order
+        unresolved = [key for key in dict.fromkeys(citekeys) if key not in resolved]
         for bib in self._bibs:
-            result.extend( bib.get_entrylist(citekeys, discard=discard) )
+            if not unresolved:
+                break
+            entries = bib.get_entrylist(unresolved, discard=False)
+            for key, entry in zip(unresolved, entries):
+                if entry:
+                    resolved[key] = entry
+            unresolved = [key for key in unresolved if key not in resolved]
+        for key in unresolved:  #not in any bib
+            resolved[key] = None
+        return [resolved[key] for key in citekeys]
+
+    def clear_entry_cache(self):
+        """Forget all resolved citekeys (e.g., after the bibs change)."""
+        self._resolved_entries.clear()
+        self._entry_hashes.clear()
+
+    def set_citation_cache(self, cache):
+        """Use `cache` (a bibstuff.cache.CitationCache, or None)
+        to reuse formatted citations and inline citation references across runs.
+        """
+        from bibstuff.cache import template_hash
+        self.citation_cache = cache
+        self._template_hash = template_hash(self.citation_template)
+
+    def entry_hash(self, entry) -> str:
+        """Return str, a hash of the content of `entry` (including any crossref)."""
+        result = self._entry_hashes.get(entry.citekey)
+        if result is None:
+            from bibstuff.cache import content_hash
+            crossref = entry.get('crossref')
+            if crossref and not isinstance(crossref, str):
+                result = content_hash(repr(entry), repr(crossref))
+            else:
+                result = content_hash(repr(entry))
+            self._entry_hashes[entry.citekey] = result
         return result
 
+    def cache_key(self, kind, *parts) -> str:
+        """Return str, a citation cache key for formatted output of `kind`.
+        The key identifies the style (module and citation template) and `parts`.
+        """
+        from bibstuff.cache import content_hash
+        return content_hash(kind, self.__class__.__module__, self.__class__.__qualname__,
+                            self._template_hash, *parts)
+
     def get_entries(self, citekeys=None):
         if not citekeys:
             return self._entries[:]
@@ -413,18 +643,20 @@ class CitationManager(object):
 
     #note: citation_rank uses unit-based indexing!! (so styles don't have to offset it)
     def get_citation_rank(self, entry, citekeys=None):
+        """Return int, the unit-based citation rank of `entry` (or None).
+        Ranks are looked up in `citation_ranks`, which is filled
+        by `set_citekeys` or by the CiteRefProcessor as it finds citekeys.
+        If `citekeys` is provided, rank is position in `citekeys` instead.
+        """
         if citekeys is None:
-            citekeys = self._citekeys
-        if citekeys is None:  #chk
-            citekeys = self.citeref_processor.all_citekeys
-            self._citekeys = citekeys
-        shared_logger.debug("shared.CitationManager.get_citation_rank citekeys %s."%citekeys)
-        if entry.citekey not in citekeys:
+            rank = self.citation_ranks.get(entry.citekey)
+        elif entry.citekey in citekeys:
+            rank = 1 + citekeys.index(entry.citekey)
+        else:
             rank = None
+        if rank is None:
             msg = 'Entry citekey not in citekeys; citation_rank set to None.'
             shared_logger.error(msg)
-        else: # found the citekey in the cite-key list
-            rank = 1 + self._citekeys.index(entry.citekey)
         return rank
 
     def make_sort_key(self, bibentry, field_list):
@@ -475,13 +707,12 @@ class CitationManager(object):
         :note: citation order based on order of entries (so must sort ahead of time)
         :note: related functionality was in the old CitationFormatter's FormatReferences() method
         """
-        shared_logger.debug("shared.CitationManager.make_citations: args are:"+str((entries,citation_template)))
+        shared_logger.debug("shared.CitationManager.make_citations: args are:%s", (entries,citation_template))
         if entries is None:
             if not self._entries: #get entries matching cite keys found by citeref_processor
                 self._entries = self.find_entries(self.citeref_processor.all_citekeys)
             entries = self._entries
-            msg = "make_citations: entries are: %s"%(self._entries)
-            shared_logger.debug(msg)
+            shared_logger.debug("make_citations: entries are: %s", self._entries)
         entries.sort(key=self.sortkey)  #TODO!!! use more sensible approach (also: 2.4 dependency)
         if citation_template is None:
             citation_template = self.citation_template
@@ -491,26 +722,116 @@ class CitationManager(object):
         shared_logger.debug("Exiting make_citations.")
         return result
 
+    def make_citations_parallel(self, entries=None, citation_template=None, jobs=None, shard_size=None):
+        """Return formatted citations (same result as `make_citations`),
+        formatting shards of the sorted entry list in a process pool.
+
+        Entries are sent to the workers in the compact form of
+        `bibfile.entry_to_compact` (with their citation ranks);
+        each worker rebuilds them and formats them with an instance of
+        this CitationManager class (so style overrides are respected).
+
+        :Parameters:
+          `jobs` : int
+            number of worker processes (default: cpu count)
+          `shard_size` : int
+            entries per task (default: about four tasks per worker)
+        """
+        import os
+        if entries is None:
+            if not self._entries:
+                self._entries = self.find_entries(self.citeref_processor.all_citekeys)
+            entries = self._entries
+        if citation_template is None:
+            citation_template = self.citation_template
+        if jobs is None:
+            jobs = os.cpu_count() or 1
+        if jobs <= 1 or len(entries) < 2 * jobs or self.citation_cache is not None:
+            return self.make_citations(entries, citation_template)
+        entries.sort(key=self.sortkey)
+        from bibstuff.bibfile import entry_to_compact
+        if shard_size is None:
+            shard_size = max(1, -(-len(entries) // (4 * jobs)))
+        ranks = self.citation_ranks
+        compact = [(entry_to_compact(entry), ranks.get(entry.citekey)) for entry in entries]
+        shards = [compact[i:i + shard_size] for i in range(0, len(compact), shard_size)]
+        import multiprocessing
+        with multiprocessing.Pool(jobs, initializer=_init_citation_worker,
+                                  initargs=(self.__class__, citation_template)) as pool:
+            formatted = []
+            for shard_result in pool.imap(_format_citation_shard, shards):
+                formatted.extend(shard_result)
+        return citation_template['citation_sep'].join(formatted)
+
     def format_citation(self, entry):
         citation_template = self.citation_template
-        formatter = self.entry_formatter
-        result = formatter.format_entry(entry)
+        cache = self.citation_cache
+        if cache is not None:
+            key = self.cache_key('citation', self.entry_hash(entry))
+            result = cache.get(key)
+        if cache is None or result is None:
+            formatter = self.entry_formatter
+            result = formatter.format_entry(entry)
+            result = reformat_para( result, left=citation_template['indent_left'] )
+            if cache is not None:
+                cache.put(key, result)
         citation_label = self.get_citation_label(entry, citation_template)
         #result = citation_label + reformat_para( append_sep(names,sep)+details, left=citation_template['indent_left'] )
-        result = citation_label + reformat_para( result, left=citation_template['indent_left'] )
+        result = citation_label + result
         return result
 
+    def cached_format_inline_cite(self, cite_key_list):
+        """Return str, the result of `format_inline_cite`,
+        reusing the `citation_cache` when possible.
+        The cache key includes the entry and citation rank of each citekey.
+        """
+        cache = self.citation_cache
+        if cache is None:
+            return self.format_inline_cite(cite_key_list)
+        parts = []
+        for citekey, entry in zip(cite_key_list, self.resolve_entries(cite_key_list)):
+            parts.extend((citekey, entry and self.entry_hash(entry), self.citation_ranks.get(citekey)))
+        key = self.cache_key('inline', *parts)
+        result = cache.get(key)
+        if result is None:
+            result = self.format_inline_cite(cite_key_list)
+            cache.put(key, result)
+        return result
+
+
 
 
+#worker-process state for CitationManager.make_citations_parallel
+_citation_worker = dict()
+
+def _init_citation_worker(manager_class, citation_template):
+    _citation_worker['manager'] = manager_class([], citekeys=None, citation_template=citation_template)
+
+def _format_citation_shard(shard):
+    """Return list of str, the formatted citations for a shard of
+    (compact entry, citation rank) pairs."""
+    from bibstuff.bibfile import entry_from_compact
+    manager = _citation_worker['manager']
+    result = []
+    for compact, rank in shard:
+        entry = entry_from_compact(compact)
+        manager.citation_ranks = {entry.citekey: rank} if rank is not None else {}
+        result.append(manager.format_citation(entry))
+    return result
+
 
 class CiteRefProcessor( simpleparse.dispatchprocessor.DispatchProcessor ):
     """Formats inline citations and substitutes them into text.
-    Stores all cite keys in `all_citekeys` (a list, to record citation order).
+    Stores all cite keys in `all_citekeys` (a `CitekeySet`, to record citation order).
     Can store `result` as original text with substituted citation references.
+    Alternatively, a `write` function can be provided (e.g., the ``write``
+    method of an output file), in which case the processed text is passed
+    to `write` as it is produced (and `result` stays empty).
     """
-    def __init__(self, citation_manager):
+    def __init__(self, citation_manager, write=None):
         """
         param `parsed_bibfile`: a dispatch processor holding parsed .bib file
+        param `write`: callable that receives processed text (default: append to `result`)
         """
         #associate with citation manager
         citation_manager.set_citeref_processor(self)
@@ -518,14 +839,18 @@ class CiteRefProcessor( simpleparse.dispatchprocessor.DispatchProcessor ):
         #self.bib = parsed_bibfile
         # result holds the entire processed file, reformatted for inline citation
         self.result = []
-        self.all_citekeys = []  #order matters! unique citekeys added as encountered: see `cite`
+        self.write = self.result.append if write is None else write
+        self.all_citekeys = CitekeySet()  #order matters! unique citekeys added as encountered: see `cite`
+        #check the log level once per document, not for each production
+        self.debug = shared_logger.isEnabledFor(logging.DEBUG)
 
     def __repr__(self):
         return ''.join(self.result)
 
     #set up debug message logging
-    def log_msg(self,msg):
-        shared_logger.debug(msg)
+    #:note: callers check `self.debug` first, so that disabled logging costs nothing
+    def log_msg(self, msg, *args):
+        shared_logger.debug(msg, *args)
 
     #PRODUCTION FUNCTIONS
     # define method for EACH production (see the help for DispatchProcessor)
@@ -534,42 +859,54 @@ class CiteRefProcessor( simpleparse.dispatchprocessor.DispatchProcessor ):
         """Return formatted result.
 
         Alternative default def would finish with
-        self.result.append( buffer[start:stop])
+        self.write( buffer[start:stop])
         and then wd return everything in the range.
         """
         tag,start,stop,subtags = tuple4
-        self.log_msg("The following is parsed as cite:\n" + buffer[start:stop])
+        if self.debug:
+            self.log_msg("The following is parsed as cite:\n%s", buffer[start:stop])
         "Process cites and format in text citation according to current style"
         # list because allow for a single citation reference to have keys for multiple citations
         cite_key_list = [s.strip() for s in buffer[start+1:stop-2].split(CITE_SEP)]
         #include current cite keys in set of all cite keys
         #  keep track of order of citation (used by some styles)
         for cite_key in cite_key_list:
-            if cite_key not in self.all_citekeys:
-                self.all_citekeys.append(cite_key)
+            if self.all_citekeys.add(cite_key):
+                self.citation_manager.add_citekey(cite_key)
         #make (ordered) list of entries for the current cite key(s)
-        #:note: need entry to be None if cite_key not found, so discard=False
-        self.entry_list = self.citation_manager.find_entries(cite_key_list,discard=False)
+        #:note: need entry to be None if cite_key not found
+        #:note: resolution is cached by the citation manager
+        self.entry_list = self.citation_manager.resolve_entries(cite_key_list)
         #substitute formatted citation reference into document text
-        self.result.append( self.citation_manager.format_inline_cite(cite_key_list) )
+        self.write( self.format_inline_cite(cite_key_list) )
+
+    def format_inline_cite(self, cite_key_list):
+        """Return str, the formatted inline citation reference for `cite_key_list`.
+        Delegates to the citation manager (i.e., the style);
+        subclasses may override (e.g., to reuse earlier results).
+        """
+        return self.citation_manager.cached_format_inline_cite(cite_key_list)
 
     def inline_literal(self, tuple4, buffer):
         "Return everything in the range."
         tag,start,stop,subtags = tuple4
-        self.result.append( buffer[start:stop] )
-        self.log_msg("The following is parsed as inline_literal:\n" + buffer[start:stop])
+        self.write( buffer[start:stop] )
+        if self.debug:
+            self.log_msg("The following is parsed as inline_literal:\n%s", buffer[start:stop])
 
     def fn(self, tuple4, buffer):
         "Return everything in the range."
         tag,start,stop,subtags = tuple4
-        self.result.append( buffer[start:stop])
-        self.log_msg("The following is parsed as fn:\n" + buffer[start:stop])
+        self.write( buffer[start:stop])
+        if self.debug:
+            self.log_msg("The following is parsed as fn:\n%s", buffer[start:stop])
 
     def plain(self, tuple4, buffer):
         "Return everything in the range."
         tag,start,stop,subtags = tuple4
-        self.result.append( buffer[start:stop])
-        self.log_msg("The following is parsed as plain:\n" + buffer[start:stop])
+        self.write( buffer[start:stop])
+        if self.debug:
+            self.log_msg("The following is parsed as plain:\n%s", buffer[start:stop])
     
 
 class EntryFormatter(object):
@@ -600,7 +937,7 @@ class EntryFormatter(object):
         post_processor = citation_template.get('post_processor', None)
         if post_processor:
             result = post_processor(result)
-        shared_logger.debug("EntryFormatter.format_citation: result = "+result)
+        shared_logger.debug("EntryFormatter.format_citation: result = %s", result)
         return result
 
     def format_citation_names(self,
@@ -628,7 +965,11 @@ class EntryFormatter(object):
             type_template = citation_template['default_type']
             shared_logger.warning("Unknown entry type: "+entry.entry_type+". Using default format.")
         #:note: entry will return None instead of KeyError
-        result = type_template % entry
+        formatter = compile_type_template(type_template)
+        if formatter is None:
+            result = type_template % entry
+        else:
+            result = formatter(entry)
         return result
 
     def pick_raw_names(self,
@@ -0,0 +1,303 @@
+"""
+:mod:`bibstuff.cache`: persistent caches for BibStuff
+-----------------------------------------------------
+
+Provides a disk-backed cache of formatted citations (`CitationCache`),
+which lets bib4txt.py and bibsearch.py reuse formatted references and
+inline citation references from earlier runs,
+and a simpleparse parser whose generated tag tables are cached on disk
+(`CachedParser`), so that processes need not regenerate them.
+Cache files live in a per-user cache directory (see `user_cache_dir`).
+
+Cached tag tables (and jabbrev's journal indexes) are pickles, and loading
+a pickle can run arbitrary code.  So the cache directories are created
+readable and writable only by the user, and `load_pickle` refuses files
+that the user does not own or that others can write.  This trusts the
+user's own account (and root), not other users who share the machine.
+
+:copyright: Dylan Schwilk and Alan G Isaac, see AUTHORS
+:license: MIT (see LICENSE)
+"""
+__docformat__ = "restructuredtext en"
+
+###################  IMPORTS  ##################################################
+#import from standard library
+import hashlib, os, pickle, sqlite3, tempfile, time
+import logging
+cache_logger = logging.getLogger('bibstuff_logger')
+################################################################################
+
+#default size budget of a citation cache, in bytes of cached text
+DEFAULT_CITATION_CACHE_SIZE = 64 * 2**20
+
+
+def user_cache_dir() -> str:
+    """Return str, the directory for BibStuff's cache files.
+    Uses $BIBSTUFF_CACHE_DIR if set, else $XDG_CACHE_HOME/bibstuff
+    (by default, ~/.cache/bibstuff).  The directory is not created.
+    """
+    result = os.environ.get('BIBSTUFF_CACHE_DIR')
+    if not result:
+        base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+        result = os.path.join(base, 'bibstuff')
+    return result
+
+
+def make_private_dir(path):
+    """Return None; create directory `path` (and any missing parents)
+    readable and writable only by the user.  Existing directories are not changed.
+    """
+    if os.path.isdir(path):
+        return
+    parent = os.path.dirname(os.path.abspath(path))
+    if parent != os.path.abspath(path):
+        make_private_dir(parent)
+    try:
+        os.mkdir(path, 0o700)
+    except FileExistsError:
+        pass
+
+
+def load_pickle(path):
+    """Return the object pickled in file `path`.
+    Raise pickle.UnpicklingError (without unpickling) if the file is not owned
+    by the user or is writable by group or others, since it could then hold
+    code put there by someone else.
+    """
+    with open(path, 'rb') as fh:
+        stat = os.fstat(fh.fileno())
+        if hasattr(os, 'getuid') and stat.st_uid != os.getuid():
+            reason = "not owned by the user"
+        elif stat.st_mode & 0o022:
+            reason = "writable by group or others"
+        else:
+            return pickle.load(fh)
+    cache_logger.warning("Cache: ignoring %s (%s)." % (path, reason))
+    raise pickle.UnpicklingError("%s is %s" % (path, reason))
+
+
+def content_hash(*parts) -> str:
+    """Return str, a hex digest identifying the sequence of strings `parts`."""
+    h = hashlib.sha1()
+    for part in parts:
+        data = str(part).encode('utf-8', 'surrogatepass')
+        h.update(b'%d:' % len(data))
+        h.update(data)
+    return h.hexdigest()
+
+
+def template_hash(citation_template) -> str:
+    """Return str, a hash of a citation template (dict).
+    Callables (e.g., the post processor) are identified by qualified name.
+    """
+    parts = []
+    for key in sorted(citation_template):
+        val = citation_template[key]
+        if callable(val):
+            val = '%s.%s' % (getattr(val, '__module__', ''), getattr(val, '__qualname__', repr(val)))
+        parts.extend((key, repr(val)))
+    return content_hash(*parts)
+
+
+class CitationCache(object):
+    """Provides a disk-backed store of formatted citation strings,
+    with least-recently-used eviction to stay within a size budget.
+
+    Keys should identify everything the formatted string depends on;
+    see `bibstyles.shared.CitationManager.cache_key`.
+    The cache is an SQLite database, so several processes may share it.
+    Recency updates and eviction happen in `flush` (and `close`).
+
+    :Parameters:
+      `path` : str
+        the cache file (default: citations.sqlite in `user_cache_dir()`)
+      `max_size` : int
+        size budget, in bytes of cached text
+    """
+    def __init__(self, path=None, max_size=DEFAULT_CITATION_CACHE_SIZE):
+        if path is None:
+            path = os.path.join(user_cache_dir(), 'citations.sqlite')
+        dirname = os.path.dirname(path)
+        if dirname:
+            make_private_dir(dirname)
+        self.path = path
+        self.max_size = max_size
+        self._db = sqlite3.connect(path, timeout=30)
+        self._db.execute("""CREATE TABLE IF NOT EXISTS citations (
+            key TEXT PRIMARY KEY, value TEXT NOT NULL,
+            size INTEGER NOT NULL, last_used INTEGER NOT NULL)""")
+        self._db.execute("CREATE INDEX IF NOT EXISTS citations_lru ON citations (last_used)")
+        self._db.commit()
+        self._used = set()    #keys read since the last flush
+        self._added = dict()  #keys (and values) written since the last flush
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        """Return str, the cached value for `key` (or None)."""
+        value = self._added.get(key)
+        if value is None:
+            row = self._db.execute("SELECT value FROM citations WHERE key = ?", (key,)).fetchone()
+            value = row and row[0]
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+            self._used.add(key)
+        return value
+
+    def put(self, key, value):
+        """Store str `value` for `key` (written on the next `flush`)."""
+        self._added[key] = value
+
+    def flush(self):
+        """Write new values, record recency of use, and evict if over budget."""
+        now = time.time_ns()
+        db = self._db
+        with db:
+            db.executemany("INSERT OR REPLACE INTO citations VALUES (?, ?, ?, ?)",
+                ((key, value, len(value), now) for (key, value) in self._added.items()))
+            db.executemany("UPDATE citations SET last_used = ? WHERE key = ?",
+                ((now, key) for key in self._used if key not in self._added))
+            self._evict()
+        self._added.clear()
+        self._used.clear()
+
+    def _evict(self):
+        db = self._db
+        total = db.execute("SELECT COALESCE(SUM(size), 0) FROM citations").fetchone()[0]
+        if total <= self.max_size:
+            return
+        excess = total - self.max_size
+        doomed = []
+        for key, size in db.execute("SELECT key, size FROM citations ORDER BY last_used"):
+            doomed.append((key,))
+            excess -= size
+            if excess <= 0:
+                break
+        db.executemany("DELETE FROM citations WHERE key = ?", doomed)
+        cache_logger.info("Citation cache: evicted %d entries." % len(doomed))
+
+    def clear(self):
+        """Remove all cached values."""
+        with self._db:
+            self._db.execute("DELETE FROM citations")
+        self._added.clear()
+        self._used.clear()
+
+    def close(self):
+        """Flush and close the cache file."""
+        if self._db is not None:
+            self.flush()
+            self._db.close()
+            self._db = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class CachedParser(object):
+    """Provides the `parse` interface of a simpleparse `Parser`
+    for an EBNF `declaration`, without regenerating its tag tables.
+
+    simpleparse regenerates the tag table for a production on every call
+    to `Parser.parse`.  A CachedParser generates each table once per
+    process, and stores it on disk (in `cache_dir`, by default
+    the grammars directory of `user_cache_dir()`), keyed by a hash of
+    the declaration, the production and the simpleparse version.
+    Later processes load the table (see `load_pickle`)
+    and skip grammar generation.
+
+    Processors that act as a simpleparse "method source"
+    (i.e., have ``_m_`` or ``_o_`` attributes) change the generated table,
+    so they are handled by an ordinary simpleparse `Parser`.
+
+    :Parameters:
+      `declaration` : str
+        simpleparse EBNF declaration
+      `root` : str
+        default production
+      `cache_dir` : str
+        directory for the table files
+    """
+    def __init__(self, declaration, root='root', cache_dir=None):
+        self._declaration = declaration
+        self._rootProduction = root
+        if cache_dir is None:
+            cache_dir = os.path.join(user_cache_dir(), 'grammars')
+        self.cache_dir = cache_dir
+        self._tables = dict()  #production -> tag table
+        self._parser = None
+
+    @property
+    def parser(self):
+        """simpleparse Parser for the declaration (generated on first use)."""
+        if self._parser is None:
+            from simpleparse.parser import Parser
+            from simpleparse.common import numbers, strings, chartypes
+            self._parser = Parser(self._declaration, self._rootProduction)
+        return self._parser
+
+    def table_path(self, production) -> str:
+        """Return str, the cache file for the table of `production`."""
+        import simpleparse
+        key = content_hash(self._declaration, production,
+            getattr(simpleparse, '__version__', ''), pickle.HIGHEST_PROTOCOL)
+        return os.path.join(self.cache_dir, key + '.pickle')
+
+    def buildTagger(self, production=None, processor=None):
+        """Return tuple, the tag table for `production` (default: root)."""
+        if production is None:
+            production = self._rootProduction
+        if _is_method_source(processor):
+            return self.parser.buildTagger(production, processor)
+        try:
+            return self._tables[production]
+        except KeyError:
+            pass
+        path = self.table_path(production)
+        try:
+            table = load_pickle(path)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+            table = self.parser.buildTagger(production, None)
+            self._store_table(path, table)
+        self._tables[production] = table
+        return table
+
+    def _store_table(self, path, table):
+        try:
+            make_private_dir(self.cache_dir)
+            fd, tmpname = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+            with os.fdopen(fd, 'wb') as fh:
+                pickle.dump(table, fh, pickle.HIGHEST_PROTOCOL)
+            os.replace(tmpname, path)
+        except OSError as err:
+            cache_logger.info("Grammar cache: cannot write %s (%s)." % (path, err))
+
+    def parse(self, data, production=None, processor=None, start=0, stop=None):
+        """Return the result of parsing `data` (see simpleparse's `Parser.parse`)."""
+        from simpleparse.stt.TextTools import tag
+        if stop is None:
+            stop = len(data)
+        value = tag(data, self.buildTagger(production, processor), start, stop)
+        if processor is not None and callable(processor):  #:note: processor may define __len__
+            return processor(value, data)
+        return value
+
+
+#maps processor class -> whether it has simpleparse method-source attributes
+_method_source_classes = dict()
+
+def _is_method_source(processor) -> bool:
+    if processor is None:
+        return False
+    cls = processor.__class__
+    result = _method_source_classes.get(cls)
+    if result is None:
+        result = _method_source_classes[cls] = any(
+            name.startswith(('_m_', '_o_')) for name in dir(cls))
+    return result or any(
+        name.startswith(('_m_', '_o_')) for name in getattr(processor, '__dict__', ()))
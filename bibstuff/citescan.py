@@ -0,0 +1,107 @@
+"""
+:mod:`bibstuff.citescan`: fast scanners for reST citation references
+--------------------------------------------------------------------
+
+Provides regular-expression scanners that recognize the same top-level
+productions (``cite``, ``fn``, ``inline_literal`` and ``plain``) as the
+simpleparse grammars in `bibstuff.ebnf_sp`, without building a simpleparse
+`Parser`.  A `CiteScanner` produces the same taglist as the corresponding
+grammar and can be used wherever bib4txt uses a simpleparse `Parser`
+(e.g., with a `bibstuff.bibstyles.shared.CiteRefProcessor`).
+
+The scanners are checked against the simpleparse grammars in the test suite.
+Each grammar is a prioritized choice between its productions; Python's
+regular expression alternation is also ordered, and every production
+is written so that backtracking cannot change what it matches.
+
+:copyright: Dylan Schwilk and Alan G Isaac, see AUTHORS
+:license: MIT (see LICENSE)
+"""
+__docformat__ = "restructuredtext en"
+
+import re
+
+from . import ebnf_sp
+
+# cite := '[', -([]#`] / [0-9]+), -[]]+, ']_'
+_CITE = r"\[[^\]#`0-9][^\]]+\]_"
+# fn := '[', ('#' / '*' / [0-9]+), ']_'
+_FN = r"\[(?:\#|\*|[0-9]+)\]_"
+# inline_literal := '``', -'``'+, '``'
+_INLINE_LITERAL = r"``(?:(?!``)[\s\S])+``"
+# noref_brackets := '[', -[]]+, ']', ?-'_'
+_NOREF_BRACKETS = r"\[[^\]]+\](?!_)"
+# punct := '[' / ']'
+_PUNCT = r"[\[\]]"
+# nopunct := -punct
+_NOPUNCT_RUN = r"[^\[\]]+"
+# nopunct := ?-inline_literal, -punct   (only a backquote can start a literal)
+_NOPUNCT_RUN_XP = r"(?:[^\[\]`]|(?!%s)`)+" % _INLINE_LITERAL
+
+_PLAIN = "(?P<plain>%s|%s|%s)" % (_NOREF_BRACKETS, _NOPUNCT_RUN, _PUNCT)
+_PLAIN_XP = "(?P<plain>%s|%s|%s)" % (_NOREF_BRACKETS, _NOPUNCT_RUN_XP, _PUNCT)
+
+# pattern and reported productions, for each grammar in ebnf_sp
+_GRAMMARS = dict(
+    cites_rest = (
+        "(?P<cite>%s)|(?P<fn>%s)|%s" % (_CITE, _FN, _PLAIN),
+        ('cite', 'fn', 'plain')),
+    cites_only_rest = (  #fn and plain are unreported (<fn>, <plain>)
+        "(?P<cite>%s)|(?P<fn>%s)|%s" % (_CITE, _FN, _PLAIN),
+        ('cite',)),
+    cites_xp = (
+        "(?P<inline_literal>%s)|(?P<cite>%s)|(?P<fn>%s)|%s"
+            % (_INLINE_LITERAL, _CITE, _FN, _PLAIN_XP),
+        ('inline_literal', 'cite', 'fn', 'plain')),
+    )
+
+
+class CiteScanner(object):
+    """Scans reST text for citation references.
+    Provides the `parse` interface of a simpleparse `Parser`
+    for one of the grammars in `ebnf_sp`.
+
+    :Parameters:
+      `grammar` : str
+        name of the grammar in `ebnf_sp`
+        ('cites_rest', 'cites_only_rest' or 'cites_xp')
+    """
+    def __init__(self, grammar='cites_rest'):
+        try:
+            pattern, reported = _GRAMMARS[grammar]
+        except KeyError:
+            raise ValueError("No scanner for grammar %s." % grammar)
+        self.grammar = grammar
+        self.regex = re.compile(pattern)
+        self.reported = frozenset(reported)
+
+    def iter_tags(self, text, start=0, stop=None):
+        """Yield (tag, start, stop, []) for each reported production."""
+        if stop is None:
+            stop = len(text)
+        reported = self.reported
+        for match in self.regex.finditer(text, start, stop):
+            tag = match.lastgroup
+            if tag in reported:
+                yield (tag, match.start(), match.end(), [])
+
+    def parse(self, text, processor=None, start=0, stop=None):
+        """Return (success, taglist, next), like simpleparse's `Parser.parse`;
+        or, if `processor` is provided, the result of calling `processor` on it.
+        """
+        if stop is None:
+            stop = len(text)
+        value = (1, list(self.iter_tags(text, start, stop)), stop)
+        if processor is not None:
+            return processor(value, text)
+        return value
+
+
+def scanner_for(ebnf_dec):
+    """Return CiteScanner for `ebnf_dec` (one of the declarations in `ebnf_sp`),
+    or None if there is no scanner for this declaration.
+    """
+    for grammar in _GRAMMARS:
+        if getattr(ebnf_sp, grammar) == ebnf_dec:
+            return CiteScanner(grammar)
+    return None
@@ -3,17 +3,22 @@
 Character translation utilities for LaTeX-formatted text.
 
 Usage:
- - unicode(string,'latex')
- - ustring.decode('latex')
-are both available just by letting "import latex" find this file.
- - unicode(string,'latex+latin1')
- - ustring.decode('latex+latin1')
-where latin1 can be replaced by any other known encoding, also
-become available by calling latex.register().
+ - latex_to_unicode(string) and unicode_to_latex(ustring)
+ - codecs.decode(bytestring, 'latex') and codecs.encode(ustring, 'latex')
+   after calling latex.register().
+ - codecs.decode(bytestring, 'latex+latin1') and codecs.encode(ustring, 'latex+latin1'),
+   where latin1 can be replaced by any other known encoding.
+ - decode_entries(bibfile.entries) decodes the fields of BibTeX entries in place.
 
 We also make public a dictionary latex_equivalents,
 mapping ord(unicode char) to LaTeX code.
 
+Ported to Python 3 for bibstuff.  Decoding uses a regular expression
+tokenizer that keeps runs of plain text as single tokens, so that only
+the tokens that can start a translation (see `_starters`) are matched
+against the translation table.  `_unlatex` is the original token-by-token
+decoder, kept as the reference for the fast decoder; run this file
+for a benchmark.
 
 Copyright (c) 2003,2008 David Eppstein
 
@@ -56,7 +61,7 @@ def getregentry():
 def _registry(encoding):
     if encoding == 'latex':
         encoding = None
-    elif encoding.startswith('latex+'):
+    elif encoding.startswith(('latex+', 'latex_')):  # Python 3 normalizes '+' to '_'
         encoding = encoding[6:]
     else:
         return None
@@ -64,32 +69,12 @@ def _registry(encoding):
     class Codec(codecs.Codec):
         def encode(self,input,errors='strict'):
             """Convert unicode string to latex."""
-            output = []
-            for c in input:
-                if encoding:
-                    try:
-                        output.append(c.encode(encoding))
-                        continue
-                    except:
-                        pass
-                if ord(c) in latex_equivalents:
-                    output.append(latex_equivalents[ord(c)])
-                else:
-                    output += ['{\\char', str(ord(c)), '}']
-            return ''.join(output), len(input)
+            return unicode_to_latex(input, encoding).encode(encoding or 'ascii', errors), len(input)
             
         def decode(self,input,errors='strict'):
             """Convert latex source string to unicode."""
-            if encoding:
-                input = unicode(input,encoding,errors)
-
-            # Note: we may get buffer objects here.
-            # It is not permussable to call join on buffer objects
-            # but we can make them joinable by calling unicode.
-            # This should always be safe since we are supposed
-            # to be producing unicode output anyway.
-            x = map(unicode,_unlatex(input))
-            return u''.join(x), len(input)
+            input = bytes(input)  # we may get buffer objects here
+            return latex_to_unicode(input.decode(encoding or 'ascii', errors)), len(input)
     
     class StreamWriter(Codec,codecs.StreamWriter):
         pass
@@ -97,14 +82,161 @@ def _registry(encoding):
     class StreamReader(Codec,codecs.StreamReader):
         pass
 
-    return (Codec().encode,Codec().decode,StreamReader,StreamWriter)
+    return codecs.CodecInfo(Codec().encode, Codec().decode, StreamReader, StreamWriter,
+        name='latex+' + encoding if encoding else 'latex')
+
+def unicode_to_latex(text, encoding=None):
+    """Return str, `text` with characters translated to latex,
+    except those that can be encoded in `encoding`.
+    """
+    try:
+        table = _encoding_tables[encoding]
+    except KeyError:
+        table = _encoding_tables[encoding] = _EncodingTable(encoding)
+    return text.translate(table)
+
+class _EncodingTable(dict):
+    """Translation table (for str.translate) from unicode to latex,
+    filled as characters are met."""
+
+    def __init__(self, encoding):
+        self.encoding = encoding
+
+    def __missing__(self, code):
+        c = chr(code)
+        result = None
+        if self.encoding:
+            try:
+                c.encode(self.encoding)
+                result = c
+            except UnicodeEncodeError:
+                pass
+        if result is None:
+            result = latex_equivalents.get(code, '{\\char%d}' % code)
+        self[code] = result
+        return result
+
+_encoding_tables = {}
+
+def latex_to_unicode(tex):
+    """Return str, latex source `tex` converted to unicode."""
+    if _special.search(tex) is None:
+        return tex
+    toks = _fast_tokenize(tex)
+    output = []
+    lastoutput = 'x'
+    pos = 0
+    ntoks = len(toks)
+    while pos < ntoks:
+        t = toks[pos]
+        if t in _starters or t.startswith('\\char'):
+            delta, nextoutput = _chunk(toks, pos)
+        else:
+            delta, nextoutput = 1, t
+        if lastoutput[0] == '\\' and lastoutput[-1].isalpha() and nextoutput[0].isalpha():
+            nextoutput = ' ' + nextoutput   # add extra space to terminate csname
+        output.append(nextoutput)
+        lastoutput = nextoutput
+        pos += delta
+    return ''.join(output)
+
+def decode_entries(entries, fields=None):
+    """Convert the latex in the fields of BibTeX entries (e.g., the
+    `entries` of a `bibstuff.bibfile.BibFile`) to unicode, in place.
+    Repeated values (journals, names) are converted once.
+    Return int, the number of changed values.
+
+    :Parameters:
+      `fields` : container of str
+        the fields to convert (default: all)
+    """
+    memo = {}
+    changed = 0
+    for entry in entries:
+        for name in entry.fields:
+            if fields is not None and name not in fields:
+                continue
+            value = dict.get(entry, name)
+            if not isinstance(value, str):  # e.g., an attached crossref entry
+                continue
+            try:
+                result = memo[value]
+            except KeyError:
+                result = memo[value] = latex_to_unicode(value)
+            if result != value:
+                dict.__setitem__(entry, name, result)
+                changed += 1
+    return changed
+
+def _chunk(toks, pos):
+    """Return delta, output for the tokens at `pos` (see `_unlatex.chunk`)."""
+    for delta,c in _candidates(toks, pos):
+        if c in _l2u:
+            return delta, chr(_l2u[c])
+        elif len(c) == 2 and c[1] == 'i' and (c[0],'\\i') in _l2u:
+            return delta, chr(_l2u[(c[0],'\\i')])     # correct failure to undot i
+        elif isinstance(c, str) and c.startswith('\\char') and c[5:].isdigit() and int(c[5:]) < 0x110000:
+            return delta, chr(int(c[5:]))
+    return 1, toks[pos]
+
+def _candidates(toks, pos):
+    """Generate pairs delta,c (see `_unlatex.candidates`) for the tokens at `pos`."""
+    t = toks[pos] if pos < len(toks) else None
+    if t in _blacklist:
+        return
+    elif t == '{':
+        for delta,c in _candidates(toks, pos+1):
+            if pos+delta+1 < len(toks) and toks[pos+delta+1] == '}':
+                yield delta+2,c
+    elif t == '\\mbox':
+        for delta,c in _candidates(toks, pos+1):
+            yield delta+1,c
+    elif t == '$' and pos+2 < len(toks) and toks[pos+2] == '$':
+        yield 3, (t,toks[pos+1],t)
+    else:
+        q = toks[pos+1] if pos+1 < len(toks) else None
+        if q == '{' and pos+3 < len(toks) and toks[pos+3] == '}':
+            yield 4, (t,toks[pos+2])
+        elif q:
+            yield 2, (t,q)
+        yield 1, t
+
+def _fast_tokenize(tex):
+    """Return list of the tokens of `_tokenize`, except that a run of plain
+    characters (which translate to themselves) after a token is one token.
+    """
+    match = _stoppers.search(tex)
+    if match is None:
+        return [tex]
+    pos = match.start()
+    toks = [tex[:pos]] if pos else []
+    end = len(tex)
+    while pos < end:
+        match = _token.match(tex, pos)
+        pos = match.end()
+        tok, char, run, other = match.groups()
+        if tok:
+            toks.append(tok)
+            if tok[0] == '\\' and not (tok[-1].isdigit() and tok[1:2].isalpha()):
+                pos = _spaces.match(tex, pos).end()  # skip blanks after csname
+        elif char:
+            toks.append(char)
+            if run:
+                toks.append(run)
+        elif other:
+            toks.append(other)
+        else:  # only ignored characters are left
+            break
+    return toks
 
 def _tokenize(tex):
     """Convert latex source into sequence of single-token substrings."""
+    if not tex:
+        return
     start = 0
     try:
         # skip quickly across boring stuff
-        pos = _stoppers.finditer(tex).next().span()[0]
+        pos = next(_stoppers.finditer(tex)).span()[0]
     except StopIteration:
         yield tex
         return
@@ -160,7 +292,7 @@ class _unlatex:
         t = self.tex
         return p < len(t) and t[p] or None
 
-    def next(self):
+    def __next__(self):
         """Find and return another piece of converted output."""
         if self.pos >= len(self.tex):
             raise StopIteration
@@ -175,13 +307,13 @@ class _unlatex:
         for delta,c in self.candidates(0):
             if c in _l2u:
                 self.pos += delta
-                return unichr(_l2u[c])
+                return chr(_l2u[c])
             elif len(c) == 2 and c[1] == 'i' and (c[0],'\\i') in _l2u:
                 self.pos += delta       # correct failure to undot i
-                return unichr(_l2u[(c[0],'\\i')])
-            elif len(c) == 1 and c[0].startswith('\\char') and c[0][5:].isdigit():
+                return chr(_l2u[(c[0],'\\i')])
+            elif isinstance(c, str) and c.startswith('\\char') and c[5:].isdigit() and int(c[5:]) < 0x110000:
                 self.pos += delta
-                return unichr(int(c[0][5:]))
+                return chr(int(c[5:]))
     
         # nothing matches, just pass through token as-is
         self.pos += 1
@@ -214,324 +346,324 @@ class _unlatex:
 
 latex_equivalents = {
     9: ' ',
-    ord(u'\N{EN DASH}'): '{--}',
-    ord(u'\N{EM DASH}'): '{---}',
-    ord(u'\N{LEFT SINGLE QUOTATION MARK}'): '{`}',
-    ord(u'\N{RIGHT SINGLE QUOTATION MARK}'): "{'}",
-    ord(u'\N{LEFT DOUBLE QUOTATION MARK}'): '{``}',
-    ord(u'\N{RIGHT DOUBLE QUOTATION MARK}'): "{''}",
-    ord(u'\N{DAGGER}'): '{\\dag}',
-    ord(u'\N{DOUBLE DAGGER}'): '{\\ddag}',
-    ord(u'\N{BULLET}'): '{\\mbox{$\\bullet$}}',
-    ord(u'\N{NUMBER SIGN}'): '{\\#}',
-    ord(u'\N{AMPERSAND}'): '{\\&}',
-    ord(u'\N{NO-BREAK SPACE}'): '{~}',
-    ord(u'\N{INVERTED EXCLAMATION MARK}'): '{!`}',
-    ord(u'\N{CENT SIGN}'): '{\\not{c}}',
-    ord(u'\N{POUND SIGN}'): '{\\pounds}',
-    ord(u'\N{SECTION SIGN}'): '{\\S}',
-    ord(u'\N{DIAERESIS}'): '{\\"{}}',
-    ord(u'\N{NOT SIGN}'): '{\\neg}',
-    ord(u'\N{SOFT HYPHEN}'): '{\\-}',
-    ord(u'\N{MACRON}'): '{\\={}}',
-    ord(u'\N{DEGREE SIGN}'): '{\\mbox{$^\\circ$}}',
-    ord(u'\N{PLUS-MINUS SIGN}'): '{\\mbox{$\\pm$}}',
-    ord(u'\N{SUPERSCRIPT TWO}'): '{\\mbox{$^2$}}',
-    ord(u'\N{SUPERSCRIPT THREE}'): '{\\mbox{$^3$}}',
-    ord(u'\N{ACUTE ACCENT}'): "{\\'{}}",
-    ord(u'\N{MICRO SIGN}'): '{\\mbox{$\\mu$}}',
-    ord(u'\N{PILCROW SIGN}'): '{\\P}',
-    ord(u'\N{MIDDLE DOT}'): '{\\mbox{$\\cdot$}}',
-    ord(u'\N{CEDILLA}'): '{\\c{}}',
-    ord(u'\N{SUPERSCRIPT ONE}'): '{\\mbox{$^1$}}',
-    ord(u'\N{INVERTED QUESTION MARK}'): '{?`}',
-    ord(u'\N{LATIN CAPITAL LETTER A WITH GRAVE}'): '{\\`A}',
-    ord(u'\N{LATIN CAPITAL LETTER A WITH CIRCUMFLEX}'): '{\\^A}',
-    ord(u'\N{LATIN CAPITAL LETTER A WITH TILDE}'): '{\\~A}',
-    ord(u'\N{LATIN CAPITAL LETTER A WITH DIAERESIS}'): '{\\"A}',
-    ord(u'\N{LATIN CAPITAL LETTER A WITH RING ABOVE}'): '{\\AA}',
-    ord(u'\N{LATIN CAPITAL LETTER AE}'): '{\\AE}',
-    ord(u'\N{LATIN CAPITAL LETTER C WITH CEDILLA}'): '{\\c{C}}',
-    ord(u'\N{LATIN CAPITAL LETTER E WITH GRAVE}'): '{\\`E}',
-    ord(u'\N{LATIN CAPITAL LETTER E WITH ACUTE}'): "{\\'E}",
-    ord(u'\N{LATIN CAPITAL LETTER E WITH CIRCUMFLEX}'): '{\\^E}',
-    ord(u'\N{LATIN CAPITAL LETTER E WITH DIAERESIS}'): '{\\"E}',
-    ord(u'\N{LATIN CAPITAL LETTER I WITH GRAVE}'): '{\\`I}',
-    ord(u'\N{LATIN CAPITAL LETTER I WITH CIRCUMFLEX}'): '{\\^I}',
-    ord(u'\N{LATIN CAPITAL LETTER I WITH DIAERESIS}'): '{\\"I}',
-    ord(u'\N{LATIN CAPITAL LETTER N WITH TILDE}'): '{\\~N}',
-    ord(u'\N{LATIN CAPITAL LETTER O WITH GRAVE}'): '{\\`O}',
-    ord(u'\N{LATIN CAPITAL LETTER O WITH ACUTE}'): "{\\'O}",
-    ord(u'\N{LATIN CAPITAL LETTER O WITH CIRCUMFLEX}'): '{\\^O}',
-    ord(u'\N{LATIN CAPITAL LETTER O WITH TILDE}'): '{\\~O}',
-    ord(u'\N{LATIN CAPITAL LETTER O WITH DIAERESIS}'): '{\\"O}',
-    ord(u'\N{MULTIPLICATION SIGN}'): '{\\mbox{$\\times$}}',
-    ord(u'\N{LATIN CAPITAL LETTER O WITH STROKE}'): '{\\O}',
-    ord(u'\N{LATIN CAPITAL LETTER U WITH GRAVE}'): '{\\`U}',
-    ord(u'\N{LATIN CAPITAL LETTER U WITH ACUTE}'): "{\\'U}",
-    ord(u'\N{LATIN CAPITAL LETTER U WITH CIRCUMFLEX}'): '{\\^U}',
-    ord(u'\N{LATIN CAPITAL LETTER U WITH DIAERESIS}'): '{\\"U}',
-    ord(u'\N{LATIN CAPITAL LETTER Y WITH ACUTE}'): "{\\'Y}",
-    ord(u'\N{LATIN SMALL LETTER SHARP S}'): '{\\ss}',
-    ord(u'\N{LATIN SMALL LETTER A WITH GRAVE}'): '{\\`a}',
-    ord(u'\N{LATIN SMALL LETTER A WITH ACUTE}'): "{\\'a}",
-    ord(u'\N{LATIN SMALL LETTER A WITH CIRCUMFLEX}'): '{\\^a}',
-    ord(u'\N{LATIN SMALL LETTER A WITH TILDE}'): '{\\~a}',
-    ord(u'\N{LATIN SMALL LETTER A WITH DIAERESIS}'): '{\\"a}',
-    ord(u'\N{LATIN SMALL LETTER A WITH RING ABOVE}'): '{\\aa}',
-    ord(u'\N{LATIN SMALL LETTER AE}'): '{\\ae}',
-    ord(u'\N{LATIN SMALL LETTER C WITH CEDILLA}'): '{\\c{c}}',
-    ord(u'\N{LATIN SMALL LETTER E WITH GRAVE}'): '{\\`e}',
-    ord(u'\N{LATIN SMALL LETTER E WITH ACUTE}'): "{\\'e}",
-    ord(u'\N{LATIN SMALL LETTER E WITH CIRCUMFLEX}'): '{\\^e}',
-    ord(u'\N{LATIN SMALL LETTER E WITH DIAERESIS}'): '{\\"e}',
-    ord(u'\N{LATIN SMALL LETTER I WITH GRAVE}'): '{\\`\\i}',
-    ord(u'\N{LATIN SMALL LETTER I WITH ACUTE}'): "{\\'\\i}",
-    ord(u'\N{LATIN SMALL LETTER I WITH CIRCUMFLEX}'): '{\\^\\i}',
-    ord(u'\N{LATIN SMALL LETTER I WITH DIAERESIS}'): '{\\"\\i}',
-    ord(u'\N{LATIN SMALL LETTER N WITH TILDE}'): '{\\~n}',
-    ord(u'\N{LATIN SMALL LETTER O WITH GRAVE}'): '{\\`o}',
-    ord(u'\N{LATIN SMALL LETTER O WITH ACUTE}'): "{\\'o}",
-    ord(u'\N{LATIN SMALL LETTER O WITH CIRCUMFLEX}'): '{\\^o}',
-    ord(u'\N{LATIN SMALL LETTER O WITH TILDE}'): '{\\~o}',
-    ord(u'\N{LATIN SMALL LETTER O WITH DIAERESIS}'): '{\\"o}',
-    ord(u'\N{DIVISION SIGN}'): '{\\mbox{$\\div$}}',
-    ord(u'\N{LATIN SMALL LETTER O WITH STROKE}'): '{\\o}',
-    ord(u'\N{LATIN SMALL LETTER U WITH GRAVE}'): '{\\`u}',
-    ord(u'\N{LATIN SMALL LETTER U WITH ACUTE}'): "{\\'u}",
-    ord(u'\N{LATIN SMALL LETTER U WITH CIRCUMFLEX}'): '{\\^u}',
-    ord(u'\N{LATIN SMALL LETTER U WITH DIAERESIS}'): '{\\"u}',
-    ord(u'\N{LATIN SMALL LETTER Y WITH ACUTE}'): "{\\'y}",
-    ord(u'\N{LATIN SMALL LETTER Y WITH DIAERESIS}'): '{\\"y}',
-    ord(u'\N{LATIN CAPITAL LETTER A WITH MACRON}'): '{\\=A}',
-    ord(u'\N{LATIN SMALL LETTER A WITH MACRON}'): '{\\=a}',
-    ord(u'\N{LATIN CAPITAL LETTER A WITH BREVE}'): '{\\u{A}}',
-    ord(u'\N{LATIN SMALL LETTER A WITH BREVE}'): '{\\u{a}}',
-    ord(u'\N{LATIN CAPITAL LETTER A WITH OGONEK}'): '{\\c{A}}',
-    ord(u'\N{LATIN SMALL LETTER A WITH OGONEK}'): '{\\c{a}}',
-    ord(u'\N{LATIN CAPITAL LETTER C WITH ACUTE}'): "{\\'C}",
-    ord(u'\N{LATIN SMALL LETTER C WITH ACUTE}'): "{\\'c}",
-    ord(u'\N{LATIN CAPITAL LETTER C WITH CIRCUMFLEX}'): '{\\^C}',
-    ord(u'\N{LATIN SMALL LETTER C WITH CIRCUMFLEX}'): '{\\^c}',
-    ord(u'\N{LATIN CAPITAL LETTER C WITH DOT ABOVE}'): '{\\.C}',
-    ord(u'\N{LATIN SMALL LETTER C WITH DOT ABOVE}'): '{\\.c}',
-    ord(u'\N{LATIN CAPITAL LETTER C WITH CARON}'): '{\\v{C}}',
-    ord(u'\N{LATIN SMALL LETTER C WITH CARON}'): '{\\v{c}}',
-    ord(u'\N{LATIN CAPITAL LETTER D WITH CARON}'): '{\\v{D}}',
-    ord(u'\N{LATIN SMALL LETTER D WITH CARON}'): '{\\v{d}}',
-    ord(u'\N{LATIN CAPITAL LETTER E WITH MACRON}'): '{\\=E}',
-    ord(u'\N{LATIN SMALL LETTER E WITH MACRON}'): '{\\=e}',
-    ord(u'\N{LATIN CAPITAL LETTER E WITH BREVE}'): '{\\u{E}}',
-    ord(u'\N{LATIN SMALL LETTER E WITH BREVE}'): '{\\u{e}}',
-    ord(u'\N{LATIN CAPITAL LETTER E WITH DOT ABOVE}'): '{\\.E}',
-    ord(u'\N{LATIN SMALL LETTER E WITH DOT ABOVE}'): '{\\.e}',
-    ord(u'\N{LATIN CAPITAL LETTER E WITH OGONEK}'): '{\\c{E}}',
-    ord(u'\N{LATIN SMALL LETTER E WITH OGONEK}'): '{\\c{e}}',
-    ord(u'\N{LATIN CAPITAL LETTER E WITH CARON}'): '{\\v{E}}',
-    ord(u'\N{LATIN SMALL LETTER E WITH CARON}'): '{\\v{e}}',
-    ord(u'\N{LATIN CAPITAL LETTER G WITH CIRCUMFLEX}'): '{\\^G}',
-    ord(u'\N{LATIN SMALL LETTER G WITH CIRCUMFLEX}'): '{\\^g}',
-    ord(u'\N{LATIN CAPITAL LETTER G WITH BREVE}'): '{\\u{G}}',
-    ord(u'\N{LATIN SMALL LETTER G WITH BREVE}'): '{\\u{g}}',
-    ord(u'\N{LATIN CAPITAL LETTER G WITH DOT ABOVE}'): '{\\.G}',
-    ord(u'\N{LATIN SMALL LETTER G WITH DOT ABOVE}'): '{\\.g}',
-    ord(u'\N{LATIN CAPITAL LETTER G WITH CEDILLA}'): '{\\c{G}}',
-    ord(u'\N{LATIN SMALL LETTER G WITH CEDILLA}'): '{\\c{g}}',
-    ord(u'\N{LATIN CAPITAL LETTER H WITH CIRCUMFLEX}'): '{\\^H}',
-    ord(u'\N{LATIN SMALL LETTER H WITH CIRCUMFLEX}'): '{\\^h}',
-    ord(u'\N{LATIN CAPITAL LETTER I WITH TILDE}'): '{\\~I}',
-    ord(u'\N{LATIN SMALL LETTER I WITH TILDE}'): '{\\~\\i}',
-    ord(u'\N{LATIN CAPITAL LETTER I WITH MACRON}'): '{\\=I}',
-    ord(u'\N{LATIN SMALL LETTER I WITH MACRON}'): '{\\=\\i}',
-    ord(u'\N{LATIN CAPITAL LETTER I WITH BREVE}'): '{\\u{I}}',
-    ord(u'\N{LATIN SMALL LETTER I WITH BREVE}'): '{\\u\\i}',
-    ord(u'\N{LATIN CAPITAL LETTER I WITH OGONEK}'): '{\\c{I}}',
-    ord(u'\N{LATIN SMALL LETTER I WITH OGONEK}'): '{\\c{i}}',
-    ord(u'\N{LATIN CAPITAL LETTER I WITH DOT ABOVE}'): '{\\.I}',
-    ord(u'\N{LATIN SMALL LETTER DOTLESS I}'): '{\\i}',
-    ord(u'\N{LATIN CAPITAL LIGATURE IJ}'): '{IJ}',
-    ord(u'\N{LATIN SMALL LIGATURE IJ}'): '{ij}',
-    ord(u'\N{LATIN CAPITAL LETTER J WITH CIRCUMFLEX}'): '{\\^J}',
-    ord(u'\N{LATIN SMALL LETTER J WITH CIRCUMFLEX}'): '{\\^\\j}',
-    ord(u'\N{LATIN CAPITAL LETTER K WITH CEDILLA}'): '{\\c{K}}',
-    ord(u'\N{LATIN SMALL LETTER K WITH CEDILLA}'): '{\\c{k}}',
-    ord(u'\N{LATIN CAPITAL LETTER L WITH ACUTE}'): "{\\'L}",
-    ord(u'\N{LATIN SMALL LETTER L WITH ACUTE}'): "{\\'l}",
-    ord(u'\N{LATIN CAPITAL LETTER L WITH CEDILLA}'): '{\\c{L}}',
-    ord(u'\N{LATIN SMALL LETTER L WITH CEDILLA}'): '{\\c{l}}',
-    ord(u'\N{LATIN CAPITAL LETTER L WITH CARON}'): '{\\v{L}}',
-    ord(u'\N{LATIN SMALL LETTER L WITH CARON}'): '{\\v{l}}',
-    ord(u'\N{LATIN CAPITAL LETTER L WITH STROKE}'): '{\\L}',
-    ord(u'\N{LATIN SMALL LETTER L WITH STROKE}'): '{\\l}',
-    ord(u'\N{LATIN CAPITAL LETTER N WITH ACUTE}'): "{\\'N}",
-    ord(u'\N{LATIN SMALL LETTER N WITH ACUTE}'): "{\\'n}",
-    ord(u'\N{LATIN CAPITAL LETTER N WITH CEDILLA}'): '{\\c{N}}',
-    ord(u'\N{LATIN SMALL LETTER N WITH CEDILLA}'): '{\\c{n}}',
-    ord(u'\N{LATIN CAPITAL LETTER N WITH CARON}'): '{\\v{N}}',
-    ord(u'\N{LATIN SMALL LETTER N WITH CARON}'): '{\\v{n}}',
-    ord(u'\N{LATIN CAPITAL LETTER O WITH MACRON}'): '{\\=O}',
-    ord(u'\N{LATIN SMALL LETTER O WITH MACRON}'): '{\\=o}',
-    ord(u'\N{LATIN CAPITAL LETTER O WITH BREVE}'): '{\\u{O}}',
-    ord(u'\N{LATIN SMALL LETTER O WITH BREVE}'): '{\\u{o}}',
-    ord(u'\N{LATIN CAPITAL LETTER O WITH DOUBLE ACUTE}'): '{\\H{O}}',
-    ord(u'\N{LATIN SMALL LETTER O WITH DOUBLE ACUTE}'): '{\\H{o}}',
-    ord(u'\N{LATIN CAPITAL LIGATURE OE}'): '{\\OE}',
-    ord(u'\N{LATIN SMALL LIGATURE OE}'): '{\\oe}',
-    ord(u'\N{LATIN CAPITAL LETTER R WITH ACUTE}'): "{\\'R}",
-    ord(u'\N{LATIN SMALL LETTER R WITH ACUTE}'): "{\\'r}",
-    ord(u'\N{LATIN CAPITAL LETTER R WITH CEDILLA}'): '{\\c{R}}',
-    ord(u'\N{LATIN SMALL LETTER R WITH CEDILLA}'): '{\\c{r}}',
-    ord(u'\N{LATIN CAPITAL LETTER R WITH CARON}'): '{\\v{R}}',
-    ord(u'\N{LATIN SMALL LETTER R WITH CARON}'): '{\\v{r}}',
-    ord(u'\N{LATIN CAPITAL LETTER S WITH ACUTE}'): "{\\'S}",
-    ord(u'\N{LATIN SMALL LETTER S WITH ACUTE}'): "{\\'s}",
-    ord(u'\N{LATIN CAPITAL LETTER S WITH CIRCUMFLEX}'): '{\\^S}',
-    ord(u'\N{LATIN SMALL LETTER S WITH CIRCUMFLEX}'): '{\\^s}',
-    ord(u'\N{LATIN CAPITAL LETTER S WITH CEDILLA}'): '{\\c{S}}',
-    ord(u'\N{LATIN SMALL LETTER S WITH CEDILLA}'): '{\\c{s}}',
-    ord(u'\N{LATIN CAPITAL LETTER S WITH CARON}'): '{\\v{S}}',
-    ord(u'\N{LATIN SMALL LETTER S WITH CARON}'): '{\\v{s}}',
-    ord(u'\N{LATIN CAPITAL LETTER T WITH CEDILLA}'): '{\\c{T}}',
-    ord(u'\N{LATIN SMALL LETTER T WITH CEDILLA}'): '{\\c{t}}',
-    ord(u'\N{LATIN CAPITAL LETTER T WITH CARON}'): '{\\v{T}}',
-    ord(u'\N{LATIN SMALL LETTER T WITH CARON}'): '{\\v{t}}',
-    ord(u'\N{LATIN CAPITAL LETTER U WITH TILDE}'): '{\\~U}',
-    ord(u'\N{LATIN SMALL LETTER U WITH TILDE}'): '{\\~u}',
-    ord(u'\N{LATIN CAPITAL LETTER U WITH MACRON}'): '{\\=U}',
-    ord(u'\N{LATIN SMALL LETTER U WITH MACRON}'): '{\\=u}',
-    ord(u'\N{LATIN CAPITAL LETTER U WITH BREVE}'): '{\\u{U}}',
-    ord(u'\N{LATIN SMALL LETTER U WITH BREVE}'): '{\\u{u}}',
-    ord(u'\N{LATIN CAPITAL LETTER U WITH RING ABOVE}'): '{\\r{U}}',
-    ord(u'\N{LATIN SMALL LETTER U WITH RING ABOVE}'): '{\\r{u}}',
-    ord(u'\N{LATIN CAPITAL LETTER U WITH DOUBLE ACUTE}'): '{\\H{U}}',
-    ord(u'\N{LATIN SMALL LETTER U WITH DOUBLE ACUTE}'): '{\\H{u}}',
-    ord(u'\N{LATIN CAPITAL LETTER U WITH OGONEK}'): '{\\c{U}}',
-    ord(u'\N{LATIN SMALL LETTER U WITH OGONEK}'): '{\\c{u}}',
-    ord(u'\N{LATIN CAPITAL LETTER W WITH CIRCUMFLEX}'): '{\\^W}',
-    ord(u'\N{LATIN SMALL LETTER W WITH CIRCUMFLEX}'): '{\\^w}',
-    ord(u'\N{LATIN CAPITAL LETTER Y WITH CIRCUMFLEX}'): '{\\^Y}',
-    ord(u'\N{LATIN SMALL LETTER Y WITH CIRCUMFLEX}'): '{\\^y}',
-    ord(u'\N{LATIN CAPITAL LETTER Y WITH DIAERESIS}'): '{\\"Y}',
-    ord(u'\N{LATIN CAPITAL LETTER Z WITH ACUTE}'): "{\\'Z}",
-    ord(u'\N{LATIN SMALL LETTER Z WITH ACUTE}'): "{\\'Z}",
-    ord(u'\N{LATIN CAPITAL LETTER Z WITH DOT ABOVE}'): '{\\.Z}',
-    ord(u'\N{LATIN SMALL LETTER Z WITH DOT ABOVE}'): '{\\.Z}',
-    ord(u'\N{LATIN CAPITAL LETTER Z WITH CARON}'): '{\\v{Z}}',
-    ord(u'\N{LATIN SMALL LETTER Z WITH CARON}'): '{\\v{z}}',
-    ord(u'\N{LATIN CAPITAL LETTER DZ WITH CARON}'): '{D\\v{Z}}',
-    ord(u'\N{LATIN CAPITAL LETTER D WITH SMALL LETTER Z WITH CARON}'): '{D\\v{z}}',
-    ord(u'\N{LATIN SMALL LETTER DZ WITH CARON}'): '{d\\v{z}}',
-    ord(u'\N{LATIN CAPITAL LETTER LJ}'): '{LJ}',
-    ord(u'\N{LATIN CAPITAL LETTER L WITH SMALL LETTER J}'): '{Lj}',
-    ord(u'\N{LATIN SMALL LETTER LJ}'): '{lj}',
-    ord(u'\N{LATIN CAPITAL LETTER NJ}'): '{NJ}',
-    ord(u'\N{LATIN CAPITAL LETTER N WITH SMALL LETTER J}'): '{Nj}',
-    ord(u'\N{LATIN SMALL LETTER NJ}'): '{nj}',
-    ord(u'\N{LATIN CAPITAL LETTER A WITH CARON}'): '{\\v{A}}',
-    ord(u'\N{LATIN SMALL LETTER A WITH CARON}'): '{\\v{a}}',
-    ord(u'\N{LATIN CAPITAL LETTER I WITH CARON}'): '{\\v{I}}',
-    ord(u'\N{LATIN SMALL LETTER I WITH CARON}'): '{\\v\\i}',
-    ord(u'\N{LATIN CAPITAL LETTER O WITH CARON}'): '{\\v{O}}',
-    ord(u'\N{LATIN SMALL LETTER O WITH CARON}'): '{\\v{o}}',
-    ord(u'\N{LATIN CAPITAL LETTER U WITH CARON}'): '{\\v{U}}',
-    ord(u'\N{LATIN SMALL LETTER U WITH CARON}'): '{\\v{u}}',
-    ord(u'\N{LATIN CAPITAL LETTER G WITH CARON}'): '{\\v{G}}',
-    ord(u'\N{LATIN SMALL LETTER G WITH CARON}'): '{\\v{g}}',
-    ord(u'\N{LATIN CAPITAL LETTER K WITH CARON}'): '{\\v{K}}',
-    ord(u'\N{LATIN SMALL LETTER K WITH CARON}'): '{\\v{k}}',
-    ord(u'\N{LATIN CAPITAL LETTER O WITH OGONEK}'): '{\\c{O}}',
-    ord(u'\N{LATIN SMALL LETTER O WITH OGONEK}'): '{\\c{o}}',
-    ord(u'\N{LATIN SMALL LETTER J WITH CARON}'): '{\\v\\j}',
-    ord(u'\N{LATIN CAPITAL LETTER DZ}'): '{DZ}',
-    ord(u'\N{LATIN CAPITAL LETTER D WITH SMALL LETTER Z}'): '{Dz}',
-    ord(u'\N{LATIN SMALL LETTER DZ}'): '{dz}',
-    ord(u'\N{LATIN CAPITAL LETTER G WITH ACUTE}'): "{\\'G}",
-    ord(u'\N{LATIN SMALL LETTER G WITH ACUTE}'): "{\\'g}",
-    ord(u'\N{LATIN CAPITAL LETTER AE WITH ACUTE}'): "{\\'\\AE}",
-    ord(u'\N{LATIN SMALL LETTER AE WITH ACUTE}'): "{\\'\\ae}",
-    ord(u'\N{LATIN CAPITAL LETTER O WITH STROKE AND ACUTE}'): "{\\'\\O}",
-    ord(u'\N{LATIN SMALL LETTER O WITH STROKE AND ACUTE}'): "{\\'\\o}",
-    ord(u'\N{PARTIAL DIFFERENTIAL}'): '{\\mbox{$\\partial$}}',
-    ord(u'\N{N-ARY PRODUCT}'): '{\\mbox{$\\prod$}}',
-    ord(u'\N{N-ARY SUMMATION}'): '{\\mbox{$\\sum$}}',
-    ord(u'\N{SQUARE ROOT}'): '{\\mbox{$\\surd$}}',
-    ord(u'\N{INFINITY}'): '{\\mbox{$\\infty$}}',
-    ord(u'\N{INTEGRAL}'): '{\\mbox{$\\int$}}',
-    ord(u'\N{INTERSECTION}'): '{\\mbox{$\\cap$}}',
-    ord(u'\N{UNION}'): '{\\mbox{$\\cup$}}',
-    ord(u'\N{RIGHTWARDS ARROW}'): '{\\mbox{$\\rightarrow$}}',
-    ord(u'\N{RIGHTWARDS DOUBLE ARROW}'): '{\\mbox{$\\Rightarrow$}}',
-    ord(u'\N{LEFTWARDS ARROW}'): '{\\mbox{$\\leftarrow$}}',
-    ord(u'\N{LEFTWARDS DOUBLE ARROW}'): '{\\mbox{$\\Leftarrow$}}',
-    ord(u'\N{LOGICAL OR}'): '{\\mbox{$\\vee$}}',
-    ord(u'\N{LOGICAL AND}'): '{\\mbox{$\\wedge$}}',
-    ord(u'\N{ALMOST EQUAL TO}'): '{\\mbox{$\\approx$}}',
-    ord(u'\N{NOT EQUAL TO}'): '{\\mbox{$\\neq$}}',
-    ord(u'\N{LESS-THAN OR EQUAL TO}'): '{\\mbox{$\\leq$}}',
-    ord(u'\N{GREATER-THAN OR EQUAL TO}'): '{\\mbox{$\\geq$}}',
-    ord(u'\N{MODIFIER LETTER CIRCUMFLEX ACCENT}'): '{\\^{}}',
-    ord(u'\N{CARON}'): '{\\v{}}',
-    ord(u'\N{BREVE}'): '{\\u{}}',
-    ord(u'\N{DOT ABOVE}'): '{\\.{}}',
-    ord(u'\N{RING ABOVE}'): '{\\r{}}',
-    ord(u'\N{OGONEK}'): '{\\c{}}',
-    ord(u'\N{SMALL TILDE}'): '{\\~{}}',
-    ord(u'\N{DOUBLE ACUTE ACCENT}'): '{\\H{}}',
-    ord(u'\N{LATIN SMALL LIGATURE FI}'): '{fi}',
-    ord(u'\N{LATIN SMALL LIGATURE FL}'): '{fl}',
-    ord(u'\N{GREEK SMALL LETTER ALPHA}'): '{\\mbox{$\\alpha$}}',
-    ord(u'\N{GREEK SMALL LETTER BETA}'): '{\\mbox{$\\beta$}}',
-    ord(u'\N{GREEK SMALL LETTER GAMMA}'): '{\\mbox{$\\gamma$}}',
-    ord(u'\N{GREEK SMALL LETTER DELTA}'): '{\\mbox{$\\delta$}}',
-    ord(u'\N{GREEK SMALL LETTER EPSILON}'): '{\\mbox{$\\epsilon$}}',
-    ord(u'\N{GREEK SMALL LETTER ZETA}'): '{\\mbox{$\\zeta$}}',
-    ord(u'\N{GREEK SMALL LETTER ETA}'): '{\\mbox{$\\eta$}}',
-    ord(u'\N{GREEK SMALL LETTER THETA}'): '{\\mbox{$\\theta$}}',
-    ord(u'\N{GREEK SMALL LETTER IOTA}'): '{\\mbox{$\\iota$}}',
-    ord(u'\N{GREEK SMALL LETTER KAPPA}'): '{\\mbox{$\\kappa$}}',
-    ord(u'\N{GREEK SMALL LETTER LAMDA}'): '{\\mbox{$\\lambda$}}', # NO B??!?
-    ord(u'\N{GREEK SMALL LETTER MU}'): '{\\mbox{$\\mu$}}',
-    ord(u'\N{GREEK SMALL LETTER NU}'): '{\\mbox{$\\nu$}}',
-    ord(u'\N{GREEK SMALL LETTER XI}'): '{\\mbox{$\\xi$}}',
-    ord(u'\N{GREEK SMALL LETTER OMICRON}'): '{\\mbox{$\\omicron$}}',
-    ord(u'\N{GREEK SMALL LETTER PI}'): '{\\mbox{$\\pi$}}',
-    ord(u'\N{GREEK SMALL LETTER RHO}'): '{\\mbox{$\\rho$}}',
-    ord(u'\N{GREEK SMALL LETTER SIGMA}'): '{\\mbox{$\\sigma$}}',
-    ord(u'\N{GREEK SMALL LETTER TAU}'): '{\\mbox{$\\tau$}}',
-    ord(u'\N{GREEK SMALL LETTER UPSILON}'): '{\\mbox{$\\upsilon$}}',
-    ord(u'\N{GREEK SMALL LETTER PHI}'): '{\\mbox{$\\phi$}}',
-    ord(u'\N{GREEK SMALL LETTER CHI}'): '{\\mbox{$\\chi$}}',
-    ord(u'\N{GREEK SMALL LETTER PSI}'): '{\\mbox{$\\psi$}}',
-    ord(u'\N{GREEK SMALL LETTER OMEGA}'): '{\\mbox{$\\omega$}}',
-    ord(u'\N{GREEK CAPITAL LETTER ALPHA}'): '{\\mbox{$\\Alpha$}}',
-    ord(u'\N{GREEK CAPITAL LETTER BETA}'): '{\\mbox{$\\Beta$}}',
-    ord(u'\N{GREEK CAPITAL LETTER GAMMA}'): '{\\mbox{$\\Gamma$}}',
-    ord(u'\N{GREEK CAPITAL LETTER DELTA}'): '{\\mbox{$\\Delta$}}',
-    ord(u'\N{GREEK CAPITAL LETTER EPSILON}'): '{\\mbox{$\\Epsilon$}}',
-    ord(u'\N{GREEK CAPITAL LETTER ZETA}'): '{\\mbox{$\\Zeta$}}',
-    ord(u'\N{GREEK CAPITAL LETTER ETA}'): '{\\mbox{$\\Eta$}}',
-    ord(u'\N{GREEK CAPITAL LETTER THETA}'): '{\\mbox{$\\Theta$}}',
-    ord(u'\N{GREEK CAPITAL LETTER IOTA}'): '{\\mbox{$\\Iota$}}',
-    ord(u'\N{GREEK CAPITAL LETTER KAPPA}'): '{\\mbox{$\\Kappa$}}',
-    ord(u'\N{GREEK CAPITAL LETTER LAMDA}'): '{\\mbox{$\\Lambda$}}', # DITTO
-    ord(u'\N{GREEK CAPITAL LETTER MU}'): '{\\mbox{$\\Mu$}}',
-    ord(u'\N{GREEK CAPITAL LETTER NU}'): '{\\mbox{$\\Nu$}}',
-    ord(u'\N{GREEK CAPITAL LETTER XI}'): '{\\mbox{$\\Xi$}}',
-    ord(u'\N{GREEK CAPITAL LETTER OMICRON}'): '{\\mbox{$\\Omicron$}}',
-    ord(u'\N{GREEK CAPITAL LETTER PI}'): '{\\mbox{$\\Pi$}}',
-    ord(u'\N{GREEK CAPITAL LETTER RHO}'): '{\\mbox{$\\Rho$}}',
-    ord(u'\N{GREEK CAPITAL LETTER SIGMA}'): '{\\mbox{$\\Sigma$}}',
-    ord(u'\N{GREEK CAPITAL LETTER TAU}'): '{\\mbox{$\\Tau$}}',
-    ord(u'\N{GREEK CAPITAL LETTER UPSILON}'): '{\\mbox{$\\Upsilon$}}',
-    ord(u'\N{GREEK CAPITAL LETTER PHI}'): '{\\mbox{$\\Phi$}}',
-    ord(u'\N{GREEK CAPITAL LETTER CHI}'): '{\\mbox{$\\Chi$}}',
-    ord(u'\N{GREEK CAPITAL LETTER PSI}'): '{\\mbox{$\\Psi$}}',
-    ord(u'\N{GREEK CAPITAL LETTER OMEGA}'): '{\\mbox{$\\Omega$}}',
-    ord(u'\N{COPYRIGHT SIGN}'): '{\\copyright}',
-    ord(u'\N{LATIN CAPITAL LETTER A WITH ACUTE}'): "{\\'A}",
-    ord(u'\N{LATIN CAPITAL LETTER I WITH ACUTE}'): "{\\'I}",
-    ord(u'\N{HORIZONTAL ELLIPSIS}'): '{\\ldots}',
-    ord(u'\N{TRADE MARK SIGN}'): '{\\mbox{$^\\mbox{TM}$}}',
+    ord('\N{EN DASH}'): '{--}',
+    ord('\N{EM DASH}'): '{---}',
+    ord('\N{LEFT SINGLE QUOTATION MARK}'): '{`}',
+    ord('\N{RIGHT SINGLE QUOTATION MARK}'): "{'}",
+    ord('\N{LEFT DOUBLE QUOTATION MARK}'): '{``}',
+    ord('\N{RIGHT DOUBLE QUOTATION MARK}'): "{''}",
+    ord('\N{DAGGER}'): '{\\dag}',
+    ord('\N{DOUBLE DAGGER}'): '{\\ddag}',
+    ord('\N{BULLET}'): '{\\mbox{$\\bullet$}}',
+    ord('\N{NUMBER SIGN}'): '{\\#}',
+    ord('\N{AMPERSAND}'): '{\\&}',
+    ord('\N{NO-BREAK SPACE}'): '{~}',
+    ord('\N{INVERTED EXCLAMATION MARK}'): '{!`}',
+    ord('\N{CENT SIGN}'): '{\\not{c}}',
+    ord('\N{POUND SIGN}'): '{\\pounds}',
+    ord('\N{SECTION SIGN}'): '{\\S}',
+    ord('\N{DIAERESIS}'): '{\\"{}}',
+    ord('\N{NOT SIGN}'): '{\\neg}',
+    ord('\N{SOFT HYPHEN}'): '{\\-}',
+    ord('\N{MACRON}'): '{\\={}}',
+    ord('\N{DEGREE SIGN}'): '{\\mbox{$^\\circ$}}',
+    ord('\N{PLUS-MINUS SIGN}'): '{\\mbox{$\\pm$}}',
+    ord('\N{SUPERSCRIPT TWO}'): '{\\mbox{$^2$}}',
+    ord('\N{SUPERSCRIPT THREE}'): '{\\mbox{$^3$}}',
+    ord('\N{ACUTE ACCENT}'): "{\\'{}}",
+    ord('\N{MICRO SIGN}'): '{\\mbox{$\\mu$}}',
+    ord('\N{PILCROW SIGN}'): '{\\P}',
+    ord('\N{MIDDLE DOT}'): '{\\mbox{$\\cdot$}}',
+    ord('\N{CEDILLA}'): '{\\c{}}',
+    ord('\N{SUPERSCRIPT ONE}'): '{\\mbox{$^1$}}',
+    ord('\N{INVERTED QUESTION MARK}'): '{?`}',
+    ord('\N{LATIN CAPITAL LETTER A WITH GRAVE}'): '{\\`A}',
+    ord('\N{LATIN CAPITAL LETTER A WITH CIRCUMFLEX}'): '{\\^A}',
+    ord('\N{LATIN CAPITAL LETTER A WITH TILDE}'): '{\\~A}',
+    ord('\N{LATIN CAPITAL LETTER A WITH DIAERESIS}'): '{\\"A}',
+    ord('\N{LATIN CAPITAL LETTER A WITH RING ABOVE}'): '{\\AA}',
+    ord('\N{LATIN CAPITAL LETTER AE}'): '{\\AE}',
+    ord('\N{LATIN CAPITAL LETTER C WITH CEDILLA}'): '{\\c{C}}',
+    ord('\N{LATIN CAPITAL LETTER E WITH GRAVE}'): '{\\`E}',
+    ord('\N{LATIN CAPITAL LETTER E WITH ACUTE}'): "{\\'E}",
+    ord('\N{LATIN CAPITAL LETTER E WITH CIRCUMFLEX}'): '{\\^E}',
+    ord('\N{LATIN CAPITAL LETTER E WITH DIAERESIS}'): '{\\"E}',
+    ord('\N{LATIN CAPITAL LETTER I WITH GRAVE}'): '{\\`I}',
+    ord('\N{LATIN CAPITAL LETTER I WITH CIRCUMFLEX}'): '{\\^I}',
+    ord('\N{LATIN CAPITAL LETTER I WITH DIAERESIS}'): '{\\"I}',
+    ord('\N{LATIN CAPITAL LETTER N WITH TILDE}'): '{\\~N}',
+    ord('\N{LATIN CAPITAL LETTER O WITH GRAVE}'): '{\\`O}',
+    ord('\N{LATIN CAPITAL LETTER O WITH ACUTE}'): "{\\'O}",
+    ord('\N{LATIN CAPITAL LETTER O WITH CIRCUMFLEX}'): '{\\^O}',
+    ord('\N{LATIN CAPITAL LETTER O WITH TILDE}'): '{\\~O}',
+    ord('\N{LATIN CAPITAL LETTER O WITH DIAERESIS}'): '{\\"O}',
+    ord('\N{MULTIPLICATION SIGN}'): '{\\mbox{$\\times$}}',
+    ord('\N{LATIN CAPITAL LETTER O WITH STROKE}'): '{\\O}',
+    ord('\N{LATIN CAPITAL LETTER U WITH GRAVE}'): '{\\`U}',
+    ord('\N{LATIN CAPITAL LETTER U WITH ACUTE}'): "{\\'U}",
+    ord('\N{LATIN CAPITAL LETTER U WITH CIRCUMFLEX}'): '{\\^U}',
+    ord('\N{LATIN CAPITAL LETTER U WITH DIAERESIS}'): '{\\"U}',
+    ord('\N{LATIN CAPITAL LETTER Y WITH ACUTE}'): "{\\'Y}",
+    ord('\N{LATIN SMALL LETTER SHARP S}'): '{\\ss}',
+    ord('\N{LATIN SMALL LETTER A WITH GRAVE}'): '{\\`a}',
+    ord('\N{LATIN SMALL LETTER A WITH ACUTE}'): "{\\'a}",
+    ord('\N{LATIN SMALL LETTER A WITH CIRCUMFLEX}'): '{\\^a}',
+    ord('\N{LATIN SMALL LETTER A WITH TILDE}'): '{\\~a}',
+    ord('\N{LATIN SMALL LETTER A WITH DIAERESIS}'): '{\\"a}',
+    ord('\N{LATIN SMALL LETTER A WITH RING ABOVE}'): '{\\aa}',
+    ord('\N{LATIN SMALL LETTER AE}'): '{\\ae}',
+    ord('\N{LATIN SMALL LETTER C WITH CEDILLA}'): '{\\c{c}}',
+    ord('\N{LATIN SMALL LETTER E WITH GRAVE}'): '{\\`e}',
+    ord('\N{LATIN SMALL LETTER E WITH ACUTE}'): "{\\'e}",
+    ord('\N{LATIN SMALL LETTER E WITH CIRCUMFLEX}'): '{\\^e}',
+    ord('\N{LATIN SMALL LETTER E WITH DIAERESIS}'): '{\\"e}',
+    ord('\N{LATIN SMALL LETTER I WITH GRAVE}'): '{\\`\\i}',
+    ord('\N{LATIN SMALL LETTER I WITH ACUTE}'): "{\\'\\i}",
+    ord('\N{LATIN SMALL LETTER I WITH CIRCUMFLEX}'): '{\\^\\i}',
+    ord('\N{LATIN SMALL LETTER I WITH DIAERESIS}'): '{\\"\\i}',
+    ord('\N{LATIN SMALL LETTER N WITH TILDE}'): '{\\~n}',
+    ord('\N{LATIN SMALL LETTER O WITH GRAVE}'): '{\\`o}',
+    ord('\N{LATIN SMALL LETTER O WITH ACUTE}'): "{\\'o}",
+    ord('\N{LATIN SMALL LETTER O WITH CIRCUMFLEX}'): '{\\^o}',
+    ord('\N{LATIN SMALL LETTER O WITH TILDE}'): '{\\~o}',
+    ord('\N{LATIN SMALL LETTER O WITH DIAERESIS}'): '{\\"o}',
+    ord('\N{DIVISION SIGN}'): '{\\mbox{$\\div$}}',
+    ord('\N{LATIN SMALL LETTER O WITH STROKE}'): '{\\o}',
+    ord('\N{LATIN SMALL LETTER U WITH GRAVE}'): '{\\`u}',
+    ord('\N{LATIN SMALL LETTER U WITH ACUTE}'): "{\\'u}",
+    ord('\N{LATIN SMALL LETTER U WITH CIRCUMFLEX}'): '{\\^u}',
+    ord('\N{LATIN SMALL LETTER U WITH DIAERESIS}'): '{\\"u}',
+    ord('\N{LATIN SMALL LETTER Y WITH ACUTE}'): "{\\'y}",
+    ord('\N{LATIN SMALL LETTER Y WITH DIAERESIS}'): '{\\"y}',
+    ord('\N{LATIN CAPITAL LETTER A WITH MACRON}'): '{\\=A}',
+    ord('\N{LATIN SMALL LETTER A WITH MACRON}'): '{\\=a}',
+    ord('\N{LATIN CAPITAL LETTER A WITH BREVE}'): '{\\u{A}}',
+    ord('\N{LATIN SMALL LETTER A WITH BREVE}'): '{\\u{a}}',
+    ord('\N{LATIN CAPITAL LETTER A WITH OGONEK}'): '{\\c{A}}',
+    ord('\N{LATIN SMALL LETTER A WITH OGONEK}'): '{\\c{a}}',
+    ord('\N{LATIN CAPITAL LETTER C WITH ACUTE}'): "{\\'C}",
+    ord('\N{LATIN SMALL LETTER C WITH ACUTE}'): "{\\'c}",
+    ord('\N{LATIN CAPITAL LETTER C WITH CIRCUMFLEX}'): '{\\^C}',
+    ord('\N{LATIN SMALL LETTER C WITH CIRCUMFLEX}'): '{\\^c}',
+    ord('\N{LATIN CAPITAL LETTER C WITH DOT ABOVE}'): '{\\.C}',
+    ord('\N{LATIN SMALL LETTER C WITH DOT ABOVE}'): '{\\.c}',
+    ord('\N{LATIN CAPITAL LETTER C WITH CARON}'): '{\\v{C}}',
+    ord('\N{LATIN SMALL LETTER C WITH CARON}'): '{\\v{c}}',
+    ord('\N{LATIN CAPITAL LETTER D WITH CARON}'): '{\\v{D}}',
+    ord('\N{LATIN SMALL LETTER D WITH CARON}'): '{\\v{d}}',
+    ord('\N{LATIN CAPITAL LETTER E WITH MACRON}'): '{\\=E}',
+    ord('\N{LATIN SMALL LETTER E WITH MACRON}'): '{\\=e}',
+    ord('\N{LATIN CAPITAL LETTER E WITH BREVE}'): '{\\u{E}}',
+    ord('\N{LATIN SMALL LETTER E WITH BREVE}'): '{\\u{e}}',
+    ord('\N{LATIN CAPITAL LETTER E WITH DOT ABOVE}'): '{\\.E}',
+    ord('\N{LATIN SMALL LETTER E WITH DOT ABOVE}'): '{\\.e}',
+    ord('\N{LATIN CAPITAL LETTER E WITH OGONEK}'): '{\\c{E}}',
+    ord('\N{LATIN SMALL LETTER E WITH OGONEK}'): '{\\c{e}}',
+    ord('\N{LATIN CAPITAL LETTER E WITH CARON}'): '{\\v{E}}',
+    ord('\N{LATIN SMALL LETTER E WITH CARON}'): '{\\v{e}}',
+    ord('\N{LATIN CAPITAL LETTER G WITH CIRCUMFLEX}'): '{\\^G}',
+    ord('\N{LATIN SMALL LETTER G WITH CIRCUMFLEX}'): '{\\^g}',
+    ord('\N{LATIN CAPITAL LETTER G WITH BREVE}'): '{\\u{G}}',
+    ord('\N{LATIN SMALL LETTER G WITH BREVE}'): '{\\u{g}}',
+    ord('\N{LATIN CAPITAL LETTER G WITH DOT ABOVE}'): '{\\.G}',
+    ord('\N{LATIN SMALL LETTER G WITH DOT ABOVE}'): '{\\.g}',
+    ord('\N{LATIN CAPITAL LETTER G WITH CEDILLA}'): '{\\c{G}}',
+    ord('\N{LATIN SMALL LETTER G WITH CEDILLA}'): '{\\c{g}}',
+    ord('\N{LATIN CAPITAL LETTER H WITH CIRCUMFLEX}'): '{\\^H}',
+    ord('\N{LATIN SMALL LETTER H WITH CIRCUMFLEX}'): '{\\^h}',
+    ord('\N{LATIN CAPITAL LETTER I WITH TILDE}'): '{\\~I}',
+    ord('\N{LATIN SMALL LETTER I WITH TILDE}'): '{\\~\\i}',
+    ord('\N{LATIN CAPITAL LETTER I WITH MACRON}'): '{\\=I}',
+    ord('\N{LATIN SMALL LETTER I WITH MACRON}'): '{\\=\\i}',
+    ord('\N{LATIN CAPITAL LETTER I WITH BREVE}'): '{\\u{I}}',
+    ord('\N{LATIN SMALL LETTER I WITH BREVE}'): '{\\u\\i}',
+    ord('\N{LATIN CAPITAL LETTER I WITH OGONEK}'): '{\\c{I}}',
+    ord('\N{LATIN SMALL LETTER I WITH OGONEK}'): '{\\c{i}}',
+    ord('\N{LATIN CAPITAL LETTER I WITH DOT ABOVE}'): '{\\.I}',
+    ord('\N{LATIN SMALL LETTER DOTLESS I}'): '{\\i}',
+    ord('\N{LATIN CAPITAL LIGATURE IJ}'): '{IJ}',
+    ord('\N{LATIN SMALL LIGATURE IJ}'): '{ij}',
+    ord('\N{LATIN CAPITAL LETTER J WITH CIRCUMFLEX}'): '{\\^J}',
+    ord('\N{LATIN SMALL LETTER J WITH CIRCUMFLEX}'): '{\\^\\j}',
+    ord('\N{LATIN CAPITAL LETTER K WITH CEDILLA}'): '{\\c{K}}',
+    ord('\N{LATIN SMALL LETTER K WITH CEDILLA}'): '{\\c{k}}',
+    ord('\N{LATIN CAPITAL LETTER L WITH ACUTE}'): "{\\'L}",
+    ord('\N{LATIN SMALL LETTER L WITH ACUTE}'): "{\\'l}",
+    ord('\N{LATIN CAPITAL LETTER L WITH CEDILLA}'): '{\\c{L}}',
+    ord('\N{LATIN SMALL LETTER L WITH CEDILLA}'): '{\\c{l}}',
+    ord('\N{LATIN CAPITAL LETTER L WITH CARON}'): '{\\v{L}}',
+    ord('\N{LATIN SMALL LETTER L WITH CARON}'): '{\\v{l}}',
+    ord('\N{LATIN CAPITAL LETTER L WITH STROKE}'): '{\\L}',
+    ord('\N{LATIN SMALL LETTER L WITH STROKE}'): '{\\l}',
+    ord('\N{LATIN CAPITAL LETTER N WITH ACUTE}'): "{\\'N}",
+    ord('\N{LATIN SMALL LETTER N WITH ACUTE}'): "{\\'n}",
+    ord('\N{LATIN CAPITAL LETTER N WITH CEDILLA}'): '{\\c{N}}',
+    ord('\N{LATIN SMALL LETTER N WITH CEDILLA}'): '{\\c{n}}',
+    ord('\N{LATIN CAPITAL LETTER N WITH CARON}'): '{\\v{N}}',
+    ord('\N{LATIN SMALL LETTER N WITH CARON}'): '{\\v{n}}',
+    ord('\N{LATIN CAPITAL LETTER O WITH MACRON}'): '{\\=O}',
+    ord('\N{LATIN SMALL LETTER O WITH MACRON}'): '{\\=o}',
+    ord('\N{LATIN CAPITAL LETTER O WITH BREVE}'): '{\\u{O}}',
+    ord('\N{LATIN SMALL LETTER O WITH BREVE}'): '{\\u{o}}',
+    ord('\N{LATIN CAPITAL LETTER O WITH DOUBLE ACUTE}'): '{\\H{O}}',
+    ord('\N{LATIN SMALL LETTER O WITH DOUBLE ACUTE}'): '{\\H{o}}',
+    ord('\N{LATIN CAPITAL LIGATURE OE}'): '{\\OE}',
+    ord('\N{LATIN SMALL LIGATURE OE}'): '{\\oe}',
+    ord('\N{LATIN CAPITAL LETTER R WITH ACUTE}'): "{\\'R}",
+    ord('\N{LATIN SMALL LETTER R WITH ACUTE}'): "{\\'r}",
+    ord('\N{LATIN CAPITAL LETTER R WITH CEDILLA}'): '{\\c{R}}',
+    ord('\N{LATIN SMALL LETTER R WITH CEDILLA}'): '{\\c{r}}',
+    ord('\N{LATIN CAPITAL LETTER R WITH CARON}'): '{\\v{R}}',
+    ord('\N{LATIN SMALL LETTER R WITH CARON}'): '{\\v{r}}',
+    ord('\N{LATIN CAPITAL LETTER S WITH ACUTE}'): "{\\'S}",
+    ord('\N{LATIN SMALL LETTER S WITH ACUTE}'): "{\\'s}",
+    ord('\N{LATIN CAPITAL LETTER S WITH CIRCUMFLEX}'): '{\\^S}',
+    ord('\N{LATIN SMALL LETTER S WITH CIRCUMFLEX}'): '{\\^s}',
+    ord('\N{LATIN CAPITAL LETTER S WITH CEDILLA}'): '{\\c{S}}',
+    ord('\N{LATIN SMALL LETTER S WITH CEDILLA}'): '{\\c{s}}',
+    ord('\N{LATIN CAPITAL LETTER S WITH CARON}'): '{\\v{S}}',
+    ord('\N{LATIN SMALL LETTER S WITH CARON}'): '{\\v{s}}',
+    ord('\N{LATIN CAPITAL LETTER T WITH CEDILLA}'): '{\\c{T}}',
+    ord('\N{LATIN SMALL LETTER T WITH CEDILLA}'): '{\\c{t}}',
+    ord('\N{LATIN CAPITAL LETTER T WITH CARON}'): '{\\v{T}}',
+    ord('\N{LATIN SMALL LETTER T WITH CARON}'): '{\\v{t}}',
+    ord('\N{LATIN CAPITAL LETTER U WITH TILDE}'): '{\\~U}',
+    ord('\N{LATIN SMALL LETTER U WITH TILDE}'): '{\\~u}',
+    ord('\N{LATIN CAPITAL LETTER U WITH MACRON}'): '{\\=U}',
+    ord('\N{LATIN SMALL LETTER U WITH MACRON}'): '{\\=u}',
+    ord('\N{LATIN CAPITAL LETTER U WITH BREVE}'): '{\\u{U}}',
+    ord('\N{LATIN SMALL LETTER U WITH BREVE}'): '{\\u{u}}',
+    ord('\N{LATIN CAPITAL LETTER U WITH RING ABOVE}'): '{\\r{U}}',
+    ord('\N{LATIN SMALL LETTER U WITH RING ABOVE}'): '{\\r{u}}',
+    ord('\N{LATIN CAPITAL LETTER U WITH DOUBLE ACUTE}'): '{\\H{U}}',
+    ord('\N{LATIN SMALL LETTER U WITH DOUBLE ACUTE}'): '{\\H{u}}',
+    ord('\N{LATIN CAPITAL LETTER U WITH OGONEK}'): '{\\c{U}}',
+    ord('\N{LATIN SMALL LETTER U WITH OGONEK}'): '{\\c{u}}',
+    ord('\N{LATIN CAPITAL LETTER W WITH CIRCUMFLEX}'): '{\\^W}',
+    ord('\N{LATIN SMALL LETTER W WITH CIRCUMFLEX}'): '{\\^w}',
+    ord('\N{LATIN CAPITAL LETTER Y WITH CIRCUMFLEX}'): '{\\^Y}',
+    ord('\N{LATIN SMALL LETTER Y WITH CIRCUMFLEX}'): '{\\^y}',
+    ord('\N{LATIN CAPITAL LETTER Y WITH DIAERESIS}'): '{\\"Y}',
+    ord('\N{LATIN CAPITAL LETTER Z WITH ACUTE}'): "{\\'Z}",
+    ord('\N{LATIN SMALL LETTER Z WITH ACUTE}'): "{\\'Z}",
+    ord('\N{LATIN CAPITAL LETTER Z WITH DOT ABOVE}'): '{\\.Z}',
+    ord('\N{LATIN SMALL LETTER Z WITH DOT ABOVE}'): '{\\.Z}',
+    ord('\N{LATIN CAPITAL LETTER Z WITH CARON}'): '{\\v{Z}}',
+    ord('\N{LATIN SMALL LETTER Z WITH CARON}'): '{\\v{z}}',
+    ord('\N{LATIN CAPITAL LETTER DZ WITH CARON}'): '{D\\v{Z}}',
+    ord('\N{LATIN CAPITAL LETTER D WITH SMALL LETTER Z WITH CARON}'): '{D\\v{z}}',
+    ord('\N{LATIN SMALL LETTER DZ WITH CARON}'): '{d\\v{z}}',
+    ord('\N{LATIN CAPITAL LETTER LJ}'): '{LJ}',
+    ord('\N{LATIN CAPITAL LETTER L WITH SMALL LETTER J}'): '{Lj}',
+    ord('\N{LATIN SMALL LETTER LJ}'): '{lj}',
+    ord('\N{LATIN CAPITAL LETTER NJ}'): '{NJ}',
+    ord('\N{LATIN CAPITAL LETTER N WITH SMALL LETTER J}'): '{Nj}',
+    ord('\N{LATIN SMALL LETTER NJ}'): '{nj}',
+    ord('\N{LATIN CAPITAL LETTER A WITH CARON}'): '{\\v{A}}',
+    ord('\N{LATIN SMALL LETTER A WITH CARON}'): '{\\v{a}}',
+    ord('\N{LATIN CAPITAL LETTER I WITH CARON}'): '{\\v{I}}',
+    ord('\N{LATIN SMALL LETTER I WITH CARON}'): '{\\v\\i}',
+    ord('\N{LATIN CAPITAL LETTER O WITH CARON}'): '{\\v{O}}',
+    ord('\N{LATIN SMALL LETTER O WITH CARON}'): '{\\v{o}}',
+    ord('\N{LATIN CAPITAL LETTER U WITH CARON}'): '{\\v{U}}',
+    ord('\N{LATIN SMALL LETTER U WITH CARON}'): '{\\v{u}}',
+    ord('\N{LATIN CAPITAL LETTER G WITH CARON}'): '{\\v{G}}',
+    ord('\N{LATIN SMALL LETTER G WITH CARON}'): '{\\v{g}}',
+    ord('\N{LATIN CAPITAL LETTER K WITH CARON}'): '{\\v{K}}',
+    ord('\N{LATIN SMALL LETTER K WITH CARON}'): '{\\v{k}}',
+    ord('\N{LATIN CAPITAL LETTER O WITH OGONEK}'): '{\\c{O}}',
+    ord('\N{LATIN SMALL LETTER O WITH OGONEK}'): '{\\c{o}}',
+    ord('\N{LATIN SMALL LETTER J WITH CARON}'): '{\\v\\j}',
+    ord('\N{LATIN CAPITAL LETTER DZ}'): '{DZ}',
+    ord('\N{LATIN CAPITAL LETTER D WITH SMALL LETTER Z}'): '{Dz}',
+    ord('\N{LATIN SMALL LETTER DZ}'): '{dz}',
+    ord('\N{LATIN CAPITAL LETTER G WITH ACUTE}'): "{\\'G}",
+    ord('\N{LATIN SMALL LETTER G WITH ACUTE}'): "{\\'g}",
+    ord('\N{LATIN CAPITAL LETTER AE WITH ACUTE}'): "{\\'\\AE}",
+    ord('\N{LATIN SMALL LETTER AE WITH ACUTE}'): "{\\'\\ae}",
+    ord('\N{LATIN CAPITAL LETTER O WITH STROKE AND ACUTE}'): "{\\'\\O}",
+    ord('\N{LATIN SMALL LETTER O WITH STROKE AND ACUTE}'): "{\\'\\o}",
+    ord('\N{PARTIAL DIFFERENTIAL}'): '{\\mbox{$\\partial$}}',
+    ord('\N{N-ARY PRODUCT}'): '{\\mbox{$\\prod$}}',
+    ord('\N{N-ARY SUMMATION}'): '{\\mbox{$\\sum$}}',
+    ord('\N{SQUARE ROOT}'): '{\\mbox{$\\surd$}}',
+    ord('\N{INFINITY}'): '{\\mbox{$\\infty$}}',
+    ord('\N{INTEGRAL}'): '{\\mbox{$\\int$}}',
+    ord('\N{INTERSECTION}'): '{\\mbox{$\\cap$}}',
+    ord('\N{UNION}'): '{\\mbox{$\\cup$}}',
+    ord('\N{RIGHTWARDS ARROW}'): '{\\mbox{$\\rightarrow$}}',
+    ord('\N{RIGHTWARDS DOUBLE ARROW}'): '{\\mbox{$\\Rightarrow$}}',
+    ord('\N{LEFTWARDS ARROW}'): '{\\mbox{$\\leftarrow$}}',
+    ord('\N{LEFTWARDS DOUBLE ARROW}'): '{\\mbox{$\\Leftarrow$}}',
+    ord('\N{LOGICAL OR}'): '{\\mbox{$\\vee$}}',
+    ord('\N{LOGICAL AND}'): '{\\mbox{$\\wedge$}}',
+    ord('\N{ALMOST EQUAL TO}'): '{\\mbox{$\\approx$}}',
+    ord('\N{NOT EQUAL TO}'): '{\\mbox{$\\neq$}}',
+    ord('\N{LESS-THAN OR EQUAL TO}'): '{\\mbox{$\\leq$}}',
+    ord('\N{GREATER-THAN OR EQUAL TO}'): '{\\mbox{$\\geq$}}',
+    ord('\N{MODIFIER LETTER CIRCUMFLEX ACCENT}'): '{\\^{}}',
+    ord('\N{CARON}'): '{\\v{}}',
+    ord('\N{BREVE}'): '{\\u{}}',
+    ord('\N{DOT ABOVE}'): '{\\.{}}',
+    ord('\N{RING ABOVE}'): '{\\r{}}',
+    ord('\N{OGONEK}'): '{\\c{}}',
+    ord('\N{SMALL TILDE}'): '{\\~{}}',
+    ord('\N{DOUBLE ACUTE ACCENT}'): '{\\H{}}',
+    ord('\N{LATIN SMALL LIGATURE FI}'): '{fi}',
+    ord('\N{LATIN SMALL LIGATURE FL}'): '{fl}',
+    ord('\N{GREEK SMALL LETTER ALPHA}'): '{\\mbox{$\\alpha$}}',
+    ord('\N{GREEK SMALL LETTER BETA}'): '{\\mbox{$\\beta$}}',
+    ord('\N{GREEK SMALL LETTER GAMMA}'): '{\\mbox{$\\gamma$}}',
+    ord('\N{GREEK SMALL LETTER DELTA}'): '{\\mbox{$\\delta$}}',
+    ord('\N{GREEK SMALL LETTER EPSILON}'): '{\\mbox{$\\epsilon$}}',
+    ord('\N{GREEK SMALL LETTER ZETA}'): '{\\mbox{$\\zeta$}}',
+    ord('\N{GREEK SMALL LETTER ETA}'): '{\\mbox{$\\eta$}}',
+    ord('\N{GREEK SMALL LETTER THETA}'): '{\\mbox{$\\theta$}}',
+    ord('\N{GREEK SMALL LETTER IOTA}'): '{\\mbox{$\\iota$}}',
+    ord('\N{GREEK SMALL LETTER KAPPA}'): '{\\mbox{$\\kappa$}}',
+    ord('\N{GREEK SMALL LETTER LAMDA}'): '{\\mbox{$\\lambda$}}', # NO B??!?
+    ord('\N{GREEK SMALL LETTER MU}'): '{\\mbox{$\\mu$}}',
+    ord('\N{GREEK SMALL LETTER NU}'): '{\\mbox{$\\nu$}}',
+    ord('\N{GREEK SMALL LETTER XI}'): '{\\mbox{$\\xi$}}',
+    ord('\N{GREEK SMALL LETTER OMICRON}'): '{\\mbox{$\\omicron$}}',
+    ord('\N{GREEK SMALL LETTER PI}'): '{\\mbox{$\\pi$}}',
+    ord('\N{GREEK SMALL LETTER RHO}'): '{\\mbox{$\\rho$}}',
+    ord('\N{GREEK SMALL LETTER SIGMA}'): '{\\mbox{$\\sigma$}}',
+    ord('\N{GREEK SMALL LETTER TAU}'): '{\\mbox{$\\tau$}}',
+    ord('\N{GREEK SMALL LETTER UPSILON}'): '{\\mbox{$\\upsilon$}}',
+    ord('\N{GREEK SMALL LETTER PHI}'): '{\\mbox{$\\phi$}}',
+    ord('\N{GREEK SMALL LETTER CHI}'): '{\\mbox{$\\chi$}}',
+    ord('\N{GREEK SMALL LETTER PSI}'): '{\\mbox{$\\psi$}}',
+    ord('\N{GREEK SMALL LETTER OMEGA}'): '{\\mbox{$\\omega$}}',
+    ord('\N{GREEK CAPITAL LETTER ALPHA}'): '{\\mbox{$\\Alpha$}}',
+    ord('\N{GREEK CAPITAL LETTER BETA}'): '{\\mbox{$\\Beta$}}',
+    ord('\N{GREEK CAPITAL LETTER GAMMA}'): '{\\mbox{$\\Gamma$}}',
+    ord('\N{GREEK CAPITAL LETTER DELTA}'): '{\\mbox{$\\Delta$}}',
+    ord('\N{GREEK CAPITAL LETTER EPSILON}'): '{\\mbox{$\\Epsilon$}}',
+    ord('\N{GREEK CAPITAL LETTER ZETA}'): '{\\mbox{$\\Zeta$}}',
+    ord('\N{GREEK CAPITAL LETTER ETA}'): '{\\mbox{$\\Eta$}}',
+    ord('\N{GREEK CAPITAL LETTER THETA}'): '{\\mbox{$\\Theta$}}',
+    ord('\N{GREEK CAPITAL LETTER IOTA}'): '{\\mbox{$\\Iota$}}',
+    ord('\N{GREEK CAPITAL LETTER KAPPA}'): '{\\mbox{$\\Kappa$}}',
+    ord('\N{GREEK CAPITAL LETTER LAMDA}'): '{\\mbox{$\\Lambda$}}', # DITTO
+    ord('\N{GREEK CAPITAL LETTER MU}'): '{\\mbox{$\\Mu$}}',
+    ord('\N{GREEK CAPITAL LETTER NU}'): '{\\mbox{$\\Nu$}}',
+    ord('\N{GREEK CAPITAL LETTER XI}'): '{\\mbox{$\\Xi$}}',
+    ord('\N{GREEK CAPITAL LETTER OMICRON}'): '{\\mbox{$\\Omicron$}}',
+    ord('\N{GREEK CAPITAL LETTER PI}'): '{\\mbox{$\\Pi$}}',
+    ord('\N{GREEK CAPITAL LETTER RHO}'): '{\\mbox{$\\Rho$}}',
+    ord('\N{GREEK CAPITAL LETTER SIGMA}'): '{\\mbox{$\\Sigma$}}',
+    ord('\N{GREEK CAPITAL LETTER TAU}'): '{\\mbox{$\\Tau$}}',
+    ord('\N{GREEK CAPITAL LETTER UPSILON}'): '{\\mbox{$\\Upsilon$}}',
+    ord('\N{GREEK CAPITAL LETTER PHI}'): '{\\mbox{$\\Phi$}}',
+    ord('\N{GREEK CAPITAL LETTER CHI}'): '{\\mbox{$\\Chi$}}',
+    ord('\N{GREEK CAPITAL LETTER PSI}'): '{\\mbox{$\\Psi$}}',
+    ord('\N{GREEK CAPITAL LETTER OMEGA}'): '{\\mbox{$\\Omega$}}',
+    ord('\N{COPYRIGHT SIGN}'): '{\\copyright}',
+    ord('\N{LATIN CAPITAL LETTER A WITH ACUTE}'): "{\\'A}",
+    ord('\N{LATIN CAPITAL LETTER I WITH ACUTE}'): "{\\'I}",
+    ord('\N{HORIZONTAL ELLIPSIS}'): '{\\ldots}',
+    ord('\N{TRADE MARK SIGN}'): '{\\mbox{$^\\mbox{TM}$}}',
 }
 for _i in range(0x0020):
     if _i not in latex_equivalents:
@@ -541,7 +673,7 @@ for _i in range(0x0020,0x007f):
         latex_equivalents[_i] = chr(_i)
 
 # Characters that should be ignored and not output in tokenization
-_ignore = set([chr(i) for i in range(32)+[127]]) - set('\t\n\r')
+_ignore = set([chr(i) for i in list(range(32))+[127]]) - set('\t\n\r')
 
 # Regexp of chars not in blacklist, for quick start of tokenize
 _stoppers = re.compile('[\x00-\x1f!$\\-?\\{~\\\\`\']')
@@ -551,7 +683,7 @@ _blacklist.add(None)    # shortcut candidate generation at end of data
 
 # Construction of inverse translation table
 _l2u = {
-    '\ ':ord(' ')   # unexpanding space makes no sense in non-TeX contexts
+    '\\ ':ord(' ')   # unexpanding space makes no sense in non-TeX contexts
 }
 
 for _tex in latex_equivalents:
@@ -592,3 +724,59 @@ for candidate in _l2u:
     else:
         firstchar = candidate[0]
     _blacklist.discard(firstchar)
+
+# Tokens that can start a translation (others translate to themselves),
+# and a regular expression for the tokens of `_fast_tokenize`:
+# characters other than `_special` ones (and digits, '/' and '}')
+# translate to themselves and are collected into runs.
+_starters = set(['{', '$', '\\mbox'])
+for candidate in _l2u:
+    _starters.add(candidate[0] if isinstance(candidate,tuple) else candidate)
+_special_chars = set(_ignore)
+_special_chars.update(t[0] for t in _starters)
+_special = re.compile('[%s]' % re.escape(''.join(sorted(_special_chars))))
+_plain = '[^%s\\d/}]' % re.escape(''.join(sorted(_special_chars)))
+_token = re.compile(r'''[%s]*(?:
+    (\$\$|/~|\d+|-+|\\(?:char|accent)\d+|\\[^\W\d_]+|\\.|\\\Z)  # token
+    |(%s)(%s*)  # plain character, and a run of plain characters
+    |(.)  # any other character
+    )?''' % (re.escape(''.join(sorted(_ignore))), _plain, _plain), re.VERBOSE | re.DOTALL)
+_spaces = re.compile(r'\s*')
+
+
+def benchmark(n_entries=100000):
+    """Print the time to decode the fields of `n_entries` generated BibTeX entries
+    with `_unlatex`, `latex_to_unicode` and `decode_entries`.
+    """
+    import random, time
+    from bibstuff.bibfile import BibEntry
+    rng = random.Random(0)
+    names = [r'M\"{u}ller, J\"{o}rg', r"Fran\c{c}ois, {\'E}mile", 'Smith, John',
+        r"Nu\~{n}ez, Mar\'{\i}a", r"Dvo\v{r}\'ak, Anton\'{\i}n", 'van der Berg, Hans']
+    words = ['analysis', 'of', 'the', r'na\"{\i}ve', r"r\'esum\'e", '--', r'$\alpha$-stable',
+        'fire', 'evolution', r'{\ss}', 'models', r'\emph{in situ}']
+    journals = [r'Journal of {\"O}kology', 'Ecology', r"Revue d\'{E}conomie", 'Nature']
+    entries = []
+    for i in range(n_entries):
+        entry = BibEntry()
+        entry.entry_type, entry.citekey = 'article', 'key%d' % i
+        entry['author'] = ' and '.join(rng.sample(names, 2))
+        entry['title'] = ' '.join(rng.choice(words) for j in range(8))
+        entry['journal'] = rng.choice(journals)
+        entry['year'] = str(rng.randint(1950, 2020))
+        entry['pages'] = '%d--%d' % (i, i + 10)
+        entries.append(entry)
+    values = [dict.get(entry, name) for entry in entries for name in entry.fields]
+    start = time.perf_counter()
+    expected = [''.join(_unlatex(value)) for value in values]
+    print("_unlatex:         %.2f s" % (time.perf_counter() - start))
+    start = time.perf_counter()
+    result = [latex_to_unicode(value) for value in values]
+    print("latex_to_unicode: %.2f s" % (time.perf_counter() - start))
+    assert result == expected
+    start = time.perf_counter()
+    decode_entries(entries)
+    print("decode_entries:   %.2f s (%d entries)" % (time.perf_counter() - start, n_entries))
+
+if __name__ == '__main__':
+    benchmark()
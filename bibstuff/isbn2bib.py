@@ -34,13 +34,22 @@ Your Amazon Web Services key
 	[isbn2bib]
 	aws_key : your_AWS_key_here 
 
+Publisher addresses
+-------------------
+
+Amazon's book data has no publisher address, so `make_bookdict` looks the
+publisher up in data/publisher_addresses.txt.  The file is read, on first
+use, into a `PublisherIndex`, which matches publisher names exactly after
+normalisation (case, punctuation, and words such as "Inc." or "Publishing"
+are ignored) and otherwise by character n-grams (see `jabbrev.NgramIndex`).
+
 """
 __docformat__ = "restructuredtext en"
 __authors__  = ['Alan G. Isaac']
 __version__ = '0.1'
 __needs__ = '2.4'
 
-import os
+import os, re
 from os.path import join as pjoin, dirname
 import shutil
 
@@ -61,7 +70,7 @@ def import_pyaws_ecs():
 def set_license_key():
 	ecs = import_pyaws_ecs()
 	# need an AWS key to proceed (see above)
-	import ConfigParser as configparser #anticipate name change
+	import configparser
 	cfg = configparser.ConfigParser()
 	cfg.read('bibstuff.cfg')
 	aws_key = cfg.get('isbn2bib','aws_key')
@@ -72,27 +81,86 @@ def set_license_key():
 						   " file in your current directory?")
 
 
-def read_publisher_dict():
+def read_publisher_dict(path=None):
+	"""Return dict, publisher name -> bibliographic address,
+	from `path` (default: data/publisher_addresses.txt).
+	"""
 	#unfortunately, addresses are not available in bookinfo
 	# hope it's in my list ...
+	if path is None:
+		path = pjoin(dirname(__file__), 'data', 'publisher_addresses.txt')
 	publisher_addresses = dict()
-	my_path = dirname(__file__)
-	fh = open(pjoin(my_path, 'data', 'publisher_addresses.txt'),'rt')
-	for line in fh:
-		if line.startswith('#') or not line.strip():
-			continue
-		info = tuple(item.strip() for item in line.split('|') )
-		try:
-			name = info[0].strip()
-			address = info[2].strip()
-		except:
-			continue #TODO: log error
-			publisher_addresses[name] = address
-	fh.close()
+	with open(path, 'rt', encoding='utf-8') as fh:
+		for line in fh:
+			if line.startswith('#') or not line.strip():
+				continue
+			info = line.split('|')
+			if len(info) < 3:
+				isbn2bib_logger.info("Skipping bad publisher line: %s" % line.strip())
+				continue
+			publisher_addresses[info[0].strip()] = info[2].strip()
 	return publisher_addresses
 
 
-PUBLISHER_ADDRESSES = read_publisher_dict()
+#words that do not distinguish publishers
+_publisher_noise = re.compile(r'\b(inc|ltd|llc|plc|co|corp|corporation|company|publishing|publishers?)\b')
+
+def publisher_key(name):
+	"""Return str, the lookup key of publisher `name` (see `jabbrev.journal_key`),
+	without words such as "Inc." and "Publishing".
+	"""
+	from .jabbrev import journal_key
+	key = journal_key(name)
+	short = ' '.join(_publisher_noise.sub(' ', key).split())
+	return short or key
+
+
+class PublisherIndex(object):
+	"""Stores publisher addresses by `publisher_key`, for exact and approximate lookup.
+	The first address given for a key is kept.
+
+	:Parameters:
+	  `publisher_addresses` : dict
+	    publisher name -> address (see `read_publisher_dict`)
+	"""
+	def __init__(self, publisher_addresses=()):
+		from .jabbrev import NgramIndex
+		self.addresses = dict()  #key -> address
+		for name, address in dict(publisher_addresses).items():
+			self.addresses.setdefault(publisher_key(name), address)
+		self._matcher = NgramIndex(self.addresses)
+
+	def __len__(self):
+		return len(self.addresses)
+
+	def address(self, publisher, threshold=0.6):
+		"""Return str, the address of `publisher` or of its best approximate match
+		with similarity at least `threshold`, or None.
+		"""
+		key = publisher_key(publisher)
+		result = self.addresses.get(key)
+		if result is None and key:
+			best = self._matcher.search(key, threshold, 1)
+			if best:
+				result = self.addresses[best[0][1]]
+		return result
+
+
+_publisher_index = None
+
+def get_publisher_index():
+	"""Return PublisherIndex, for data/publisher_addresses.txt (built on first use)."""
+	global _publisher_index
+	if _publisher_index is None:
+		_publisher_index = PublisherIndex(read_publisher_dict())
+	return _publisher_index
+
+def __getattr__(name):
+	"""Provide the module attribute `PUBLISHER_ADDRESSES` (read lazily)."""
+	if name == 'PUBLISHER_ADDRESSES':
+		result = globals()[name] = read_publisher_dict()
+		return result
+	raise AttributeError("module %r has no attribute %r" % (__name__, name))
 
 
 def make_entry(isbn):
@@ -105,14 +173,14 @@ def make_entry(isbn):
 	:todo: this is reusing too much add2bib code
 	"""
 	ecs = import_pyaws_ecs()
-	import bibfile
+	from . import bibfile
 	entry = bibfile.BibEntry()
 	entry.entry_type = 'book'
 	try:
 		bkinfo = ecs.ItemLookup(ItemId=isbn, IdType='ISBN',
 			SearchIndex="Books", ResponseGroup="Medium")
 	except ecs.AWSException:
-		print "ItemLookup failed"
+		print("ItemLookup failed")
 		raise
 	bkdict = make_bookdict(bkinfo)
 	entry.citekey = bkdict['citekey']
@@ -124,10 +192,17 @@ def make_entry(isbn):
 
 
 def make_bookdict(bkinfo, publisher_addresses=None):
+	"""Return dict, the fields of a book entry (and its citekey) for `bkinfo`.
+
+	:Parameters:
+	  `publisher_addresses` : PublisherIndex or dict
+	    publisher addresses (default: `get_publisher_index()`)
+	"""
 	from collections import defaultdict
-	import difflib
 	if publisher_addresses is None:
-		publisher_addresses = PUBLISHER_ADDRESSES
+		publisher_addresses = get_publisher_index()
+	elif not isinstance(publisher_addresses, PublisherIndex):
+		publisher_addresses = PublisherIndex(publisher_addresses)
 	bd = defaultdict(str)
 	try:
 		author = bkinfo.Author.strip()
@@ -150,9 +225,9 @@ def make_bookdict(bkinfo, publisher_addresses=None):
 	publisher = bkinfo.Manufacturer.strip() #?att name??
 	bd['publisher'] = publisher
 	#thanks to Greg Pinero for nicer address matching:
-	best_pub_matches = difflib.get_close_matches(publisher,publisher_addresses.keys(),1)
-	if best_pub_matches:
-		bd['address'] = publisher_addresses[best_pub_matches[0]]	   
+	address = publisher_addresses.address(publisher)
+	if address:
+		bd['address'] = address
 	return bd
 
 
@@ -167,7 +242,7 @@ def main():
 	"""
 
 	import sys
-	import add2bib
+	from bibstuff import bibadd
 
 	output = sys.stdout
 	
@@ -211,16 +286,16 @@ def main():
 			isbn2bib_logger.info("Appending to %s.\n(Use -n option to nuke (overwrite) the old output file.)"
 			                     %options.outfile)
 			output = open(options.outfile,'a')
-	print args
+	print(args)
 	for isbn in args:
 		isbn = isbn.replace('-','')
 		entry = make_entry(isbn)
 		output.write( str(entry) )
 		
 	if 'h' in options.format:
-		output.write( add2bib.html_format(entry) )
+		output.write( bibadd.html_format(entry) )
 	if 't' in options.format:
-		output.write( add2bib.text_format(entry) )
+		output.write( bibadd.text_format(entry) )
 
 if __name__ == '__main__':
 	main()
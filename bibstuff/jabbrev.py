@@ -0,0 +1,385 @@
+"""
+:mod:`bibstuff.jabbrev`: journal name abbreviation and expansion
+-----------------------------------------------------------------
+
+Provides `JournalIndex`, which maps journal names to abbreviations and
+back.  Names are matched by `journal_key`, which ignores case, LaTeX
+markup, punctuation and the difference between "and" and "&", so
+``J. Ecol.`` matches ``J Ecol`` and ``Journal of Ecology``
+matches ``journal of ecology``.
+
+Abbreviation files have one journal per line, as ``abbreviation = full name``
+(see examples/journal_abbreviations.txt), or are in the Cambridge Scientific
+Abstracts format (see examples/journals_from_csa.txt).  `JournalIndex.from_file`
+stores the built index in the user cache directory (see `cache.user_cache_dir`)
+and loads it from there while the abbreviation file is unchanged.
+The stored index is a pickle, so it is only loaded from files the user owns
+and others cannot write (see `cache.load_pickle`).
+
+Names that are not in the index can be matched approximately, by the
+character n-grams they share with the indexed names (see `NgramIndex`)::
+
+    index.candidates('Jounral of Ecolgy')  #-> [(0.72, 'J. Ecol.'), ...]
+    index.translate('Jounral of Ecolgy', threshold=0.6)  #-> 'J. Ecol.'
+
+Example::
+
+    index = JournalIndex.from_file('journal_abbreviations.txt')
+    index.abbreviate('Journal of Ecology')  #-> 'J. Ecol.'
+    with open('refs.bib') as src, open('abbreviated.bib', 'w') as dst:
+        translate_stream(src, dst, index)
+
+See scripts/jabbrev.py for the command-line tool.
+
+:copyright: Dylan Schwilk and Alan G Isaac, see AUTHORS
+:license: MIT (see LICENSE)
+"""
+__docformat__ = "restructuredtext en"
+
+###################  IMPORTS  ##################################################
+#import from standard library
+import math, os, pickle, re, tempfile
+from collections import Counter, OrderedDict
+import logging
+jabbrev_logger = logging.getLogger('bibstuff_logger')
+
+#bibstuff imports
+from .bibnorm import default_normalizer
+from .cache import content_hash, load_pickle, make_private_dir, user_cache_dir
+################################################################################
+
+#version of the stored index format (change when `journal_key` changes)
+INDEX_FORMAT = 1
+#default minimum similarity (Dice coefficient of n-gram sets) of approximate matches
+DEFAULT_THRESHOLD = 0.6
+
+_ampersand = re.compile(r'\s*&\s*')
+_punctuation = re.compile(r'[^\w\s]+')
+_csa_tail = re.compile(r'(,\s*(\d{4}-\d{3}[\dX]|Core|Priority|Selective))+\s*$')
+
+
+def journal_key(name) -> str:
+    """Return str, the lookup key of journal `name`: LaTeX decoded,
+    case folded, "&" read as "and", punctuation dropped and spaces collapsed.
+    """
+    key = default_normalizer(name)
+    if '&' in key:
+        key = _ampersand.sub(' and ', key)
+    return ' '.join(_punctuation.sub(' ', key).split())
+
+def read_abbreviations(fileobj):
+    """Yield (abbreviation, full name) for each ``abbreviation = full name``
+    line of text file `fileobj` (other lines are skipped).
+    """
+    for line in fileobj:
+        abbrev, sep, full = line.partition('=')
+        abbrev, full = abbrev.strip(), full.strip()
+        if sep and abbrev and full:
+            yield abbrev, full
+
+def read_csa(fileobj):
+    """Yield (abbreviation, full name) for each line of text file `fileobj`
+    in the Cambridge Scientific Abstracts format, ``full name, ( abbreviation), ...``
+    (see examples/jmaker.py); the abbreviation defaults to the full name.
+    """
+    for line in fileobj:
+        full, sep, rest = line.partition(', (')
+        if sep:
+            abbrev = rest.partition(')')[0].strip()
+        else:  #no abbreviation: drop the ISSN and coverage fields
+            abbrev = ''
+            full = _csa_tail.sub('', full)
+        full = full.strip()
+        if full:
+            yield abbrev or full, full
+
+
+class NgramIndex(object):
+    """Finds the indexed names most similar to a query name.
+    Names are compared by their sets of character `n`-grams (of `journal_key`,
+    padded with a space), scored with the Dice coefficient.
+    An inverted index from n-gram to names supplies the candidates,
+    taking the rarest n-grams of the query first and stopping as soon as
+    no other name can reach the threshold; only the candidates whose
+    counts and sizes still allow the threshold (raised to the score of
+    the `limit`-th best name found so far) are scored.
+    Results are cached for up to `cache_size` distinct queries.
+    """
+    def __init__(self, names=(), n=3, cache_size=2**14):
+        self.n = n
+        self.names = []  #in order of addition
+        self._grams = []  #n-gram set of each name
+        self._sizes = []  #number of n-grams of each name
+        self._postings = dict()  #n-gram -> list of name numbers
+        self._keys = set()
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+        for name in names:
+            self.add(name)
+
+    def __len__(self):
+        return len(self.names)
+
+    def ngrams(self, name):
+        """Return frozenset, the n-grams of `name`."""
+        key = ' %s ' % journal_key(name)
+        n = self.n
+        return frozenset(key[i:i+n] for i in range(len(key) - n + 1))
+
+    def add(self, name):
+        """Add `name` (unless a name with the same `journal_key` is present)."""
+        key = journal_key(name)
+        if key in self._keys:
+            return
+        self._keys.add(key)
+        self._cache.clear()
+        number = len(self.names)
+        grams = self.ngrams(key)
+        self.names.append(name)
+        self._grams.append(grams)
+        self._sizes.append(len(grams))
+        for gram in grams:
+            self._postings.setdefault(gram, []).append(number)
+
+    def search(self, name, threshold=DEFAULT_THRESHOLD, limit=5):
+        """Return list of (score, name) for the (at most `limit`) indexed names
+        with similarity `score` (between 0 and 1) at least `threshold`, best first.
+        """
+        cache_key = (journal_key(name), threshold, limit)
+        try:
+            result = self._cache[cache_key]
+        except KeyError:
+            pass
+        else:
+            self._cache.move_to_end(cache_key)
+            return result
+        grams = self.ngrams(name)
+        #close matches are common and cheap to find (few candidates share
+        #the rarest n-grams), so look for them first
+        result = self._search(grams, max(threshold, 0.9), limit)
+        if len(result) < limit and threshold < 0.9:
+            result = self._search(grams, threshold, limit)
+        self._cache[cache_key] = result
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return result
+
+    def _search(self, grams, threshold, limit):
+        size = len(grams)
+        if not size:
+            return []
+        postings = self._postings
+        #a name with score >= threshold shares at least `min_shared` n-grams,
+        #so it shares one of any (size - min_shared + 1) n-grams of the query
+        min_shared = max(1, math.ceil(threshold * size / (2 - threshold) - 1e-9))
+        if min_shared > size:
+            return []
+        found = sorted((gram for gram in grams if gram in postings), key=lambda gram: len(postings[gram]))
+        prefix = max(0, size - min_shared + 1 - (size - len(found)))
+        counts = Counter()  #name number -> n-grams shared within the prefix
+        for gram in found[:prefix]:
+            counts.update(postings[gram])
+        #score the names that can still reach the threshold, most shared n-grams first;
+        #once `limit` names are found, the threshold rises to the worst of them
+        rest = len(found) - prefix
+        sizes = self._sizes
+        order = lambda item: (-item[0], item[1])
+        result = []
+        for number, count in counts.most_common():
+            shared = count + rest  #at most, so the score is at most 2 * shared / (size + shared)
+            if 2.0 * shared < threshold * (size + shared):
+                break
+            other_size = sizes[number]
+            if 2.0 * shared < threshold * (size + other_size):
+                continue
+            score = 2.0 * len(grams & self._grams[number]) / (size + other_size)
+            if score >= threshold:
+                result.append((score, self.names[number]))
+                if len(result) >= limit:
+                    result.sort(key=order)
+                    del result[limit:]
+                    threshold = result[-1][0]
+        result.sort(key=order)
+        return result[:limit]
+
+
+class JournalIndex(object):
+    """Stores journal abbreviations and full names by `journal_key`.
+    The first abbreviation given for a name (and the first name
+    given for an abbreviation) is kept.
+
+    :Parameters:
+      `pairs` : iterable of (abbreviation, full name) pairs
+    """
+    def __init__(self, pairs=()):
+        self.abbreviations = dict()  #key of full name -> abbreviation
+        self.expansions = dict()  #key of abbreviation -> full name
+        self._matchers = dict()  #expand -> NgramIndex of the keys (built on first use)
+        for abbrev, full in pairs:
+            self.add(abbrev, full)
+
+    def add(self, abbrev, full):
+        """Add the abbreviation `abbrev` of journal name `full`."""
+        self.abbreviations.setdefault(journal_key(full), abbrev)
+        self.expansions.setdefault(journal_key(abbrev), full)
+        self._matchers.clear()
+
+    def __len__(self):
+        return len(self.abbreviations)
+
+    def abbreviate(self, name, default=None):
+        """Return str, the abbreviation of journal `name` (or `default`)."""
+        return self.abbreviations.get(journal_key(name), default)
+
+    def expand(self, name, default=None):
+        """Return str, the full name of abbreviated journal `name` (or `default`)."""
+        return self.expansions.get(journal_key(name), default)
+
+    def candidates(self, name, expand=False, threshold=DEFAULT_THRESHOLD, limit=5):
+        """Return list of (score, abbreviation) (or if `expand`, (score, full name))
+        for the journals most similar to `name` (see `NgramIndex.search`), best first.
+        """
+        table = self.expansions if expand else self.abbreviations
+        matcher = self._matchers.get(expand)
+        if matcher is None:
+            matcher = self._matchers[expand] = NgramIndex(table)
+        return [(score, table[key]) for score, key in matcher.search(name, threshold, limit)]
+
+    def translate(self, name, expand=False, threshold=None):
+        """Return str, the abbreviation (or if `expand`, the full name) of `name`,
+        or `name` itself if it is not in the index.
+        If `threshold` is given, a name not in the index is replaced by
+        its best approximate match with at least that score (see `candidates`),
+        unless it is already an abbreviation (or if `expand`, a full name).
+        """
+        if expand:
+            table, others = self.expansions, self.abbreviations
+        else:
+            table, others = self.abbreviations, self.expansions
+        key = journal_key(name)
+        result = table.get(key)
+        if result is None and threshold is not None and key not in others:
+            best = self.candidates(name, expand, threshold, 1)
+            if best:
+                result = best[0][1]
+        return name if result is None else result
+
+    def save(self, path):
+        """Write the index to file `path` (replaced atomically)."""
+        dirname = os.path.dirname(os.path.abspath(path))
+        fd, tmpname = tempfile.mkstemp(dir=dirname, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as fh:
+                pickle.dump((INDEX_FORMAT, self.abbreviations, self.expansions),
+                    fh, pickle.HIGHEST_PROTOCOL)
+            os.replace(tmpname, path)
+        except BaseException:
+            os.unlink(tmpname)
+            raise
+
+    @classmethod
+    def load(cls, path):
+        """Return JournalIndex, read from file `path` (written by `save`).
+        Raise pickle.UnpicklingError if the file is not owned by the user
+        or is writable by others (see `cache.load_pickle`).
+        """
+        data = load_pickle(path)
+        if not (isinstance(data, tuple) and data[0] == INDEX_FORMAT):
+            raise ValueError("%s is not a journal index (format %d)." % (path, INDEX_FORMAT))
+        result = cls()
+        result.abbreviations, result.expansions = data[1:]
+        return result
+
+    @classmethod
+    def from_file(cls, path, cache_dir=None, use_cache=True):
+        """Return JournalIndex for the abbreviation file `path`.
+        The index is stored in `cache_dir` (default: the journals directory
+        of `user_cache_dir()`), keyed by the file's path, size and modification
+        time, and loaded from there by later calls.
+        """
+        if use_cache:
+            if cache_dir is None:
+                cache_dir = os.path.join(user_cache_dir(), 'journals')
+            stat = os.stat(path)
+            key = content_hash(os.path.abspath(path), stat.st_size, stat.st_mtime_ns, INDEX_FORMAT)
+            index_path = os.path.join(cache_dir, key + '.pickle')
+            try:
+                return cls.load(index_path)
+            except (OSError, ValueError, pickle.UnpicklingError, EOFError):
+                pass
+        with open(path, 'r', encoding='utf-8', errors='replace') as fh:
+            line = fh.readline()
+            fh.seek(0)
+            reader = read_csa if ', (' in line and '=' not in line else read_abbreviations
+            result = cls(reader(fh))
+        if use_cache:
+            try:
+                make_private_dir(cache_dir)
+                result.save(index_path)
+            except OSError as err:
+                jabbrev_logger.info("Journal cache: cannot write %s (%s)." % (index_path, err))
+        return result
+
+
+def translate_entries(entries, index, expand=False, threshold=None):
+    """Abbreviate (or if `expand`, expand) the journal field of each entry
+    in `entries` in place, matching approximately if `threshold` is given
+    (see `JournalIndex.translate`).  Return int, the number of entries changed.
+    """
+    changed = 0
+    for entry in entries:
+        journal = dict.get(entry, 'journal', '')
+        if journal:
+            new = index.translate(journal, expand, threshold)
+            if new != journal:
+                entry['journal'] = new
+                changed += 1
+    return changed
+
+def _field_value_span(taglist, src, field):
+    """Return (start, stop), the span in `src` of the value of `field`
+    in the entry parsed as `taglist` (the last one, if repeated), or None.
+    """
+    result = None
+    for tag, start, stop, subtags in taglist[1]:
+        if tag != 'entry' or len(subtags) < 3:
+            continue
+        for field_tag in subtags[2][3] or ():
+            name, value = field_tag[3][:2]
+            if src[name[1]:name[2]].lower() == field:
+                result = value[1:3]
+    return result
+
+def translate_stream(infile, outfile, index, expand=False, threshold=None, chunk_size=1 << 16):
+    """Copy the .bib file `infile` to `outfile` (text files), abbreviating
+    (or if `expand`, expanding) journal names (see `translate_entries`).
+    Objects are read one at a time.  Only the journal values that change
+    are rewritten, as ``{new name}``; all other text (other fields,
+    macros, comments and the text between objects) is copied verbatim.
+    Return int, the number of entries changed.
+    """
+    from . import bibgrammar
+    from .bibfile import BibFile
+    processor = BibFile()  #keeps the macros
+    parser = bibgrammar.get_parser('bibfile')
+    changed = [0]
+    def pieces():
+        for gap, src in bibgrammar.iter_objects(infile, chunk_size, gaps=True):
+            yield gap
+            if src is None:
+                return
+            taglist = parser.parse(src)
+            processor(taglist, src)
+            entries = processor.entries
+            if entries:
+                journal = dict.get(entries[0], 'journal', '')
+                span = journal and _field_value_span(taglist, src, 'journal')
+                if span:
+                    new = index.translate(journal, expand, threshold)
+                    if new != journal:
+                        changed[0] += 1
+                        src = '%s{%s}%s' % (src[:span[0]], new, src[span[1]:])
+                del entries[:]
+            yield src
+    outfile.writelines(pieces())
+    return changed[0]
@@ -33,7 +33,9 @@ You can then include this in your reST document with an ``include`` directive.
 
 How it works:
 
-- Uses SimpleParse_ to convert an EBNF_ grammar into an object for scanning reST files for citation references.
+- Scans reST files for citation references with regular expressions that match
+  the EBNF_ grammars in ``ebnf_sp`` (or, with ``--simpleparse``, uses SimpleParse_
+  to convert those grammars into an object for scanning).
 - Uses SimpleParse_ to convert an EBNF_ grammar into an object for scanning .bib files.  (See Bibstuff's bibgrammar.py.)
 - Extracts the citation references from the input document.
 - Outputs a sorted list of citation definitions, to be used in the References section of your documents.
@@ -58,7 +60,7 @@ __needs__ = '3.6+'
 
 ###################  IMPORTS  ##################################################
 #import from standard library
-import importlib, os, sys
+import os, sys
 import logging
 logging.basicConfig(format='\n%(levelname)s:\n%(message)s\n')
 bib4txt_logger = logging.getLogger('bibstuff_logger')
@@ -68,12 +70,12 @@ import simpleparse
 
 #local imports
 try:
-    from bibstuff import bibfile, bibgrammar, bibstyles, ebnf_sp
+    from bibstuff import bibfile, bibgrammar, bibstyles, cache, citescan, ebnf_sp
 except (ImportError, ModuleNotFoundError): #hack to allow user to run without installing
     scriptdir = os.path.dirname(os.path.realpath(__file__))
     bibdir = os.path.dirname(scriptdir)
     sys.path.insert(0, bibdir)
-    from bibstuff import bibfile, bibgrammar, bibstyles, ebnf_sp
+    from bibstuff import bibfile, bibgrammar, bibstyles, cache, citescan, ebnf_sp
 ################################################################################
 
 
@@ -88,12 +90,26 @@ except (ImportError, ModuleNotFoundError): #hack to allow user to run without in
 
 
 
+def make_cite_parser(ebnf_dec, use_simpleparse=False):
+    """Return a parser for documents, based on the grammar `ebnf_dec`.
+    By default, the grammars in `ebnf_sp` are handled by a fast
+    `citescan.CiteScanner` (which produces the same parse);
+    any other grammar (or `use_simpleparse`) gets a simpleparse parser
+    (a `cache.CachedParser`, which reuses its generated tag table).
+    """
+    if not use_simpleparse:
+        scanner = citescan.scanner_for(ebnf_dec)
+        if scanner is not None:
+            return scanner
+    return cache.CachedParser(ebnf_dec, root='src')
+
 def make_text_output(
     src_as_string,
     src_parser,
     parsed_bibfile,
     style,   # imported style module
-    citations_only=True
+    citations_only=True,
+    citation_cache=None  #optional bibstuff.cache.CitationCache
     ):
     """Create intext citations and the bibliography"""
     #first: create a citation manager to handle the bibfile(s)
@@ -101,6 +117,8 @@ def make_text_output(
     citation_manager = style.CitationManager([parsed_bibfile],
                                             citekeys=None,
                                             citation_template=style.CITATION_TEMPLATE)
+    if citation_cache is not None:
+        citation_manager.set_citation_cache(citation_cache)
     #second: create CiteRefProcessor object to process cites during src parsing
     #        (and associate it with the citation_manager)
     bib4txt_logger.debug('create cite processor')
@@ -126,6 +144,393 @@ def make_text_output(
         result = cite_processor.__repr__() + result
     return result
 
+
+###################  STREAMING  ################################################
+# The streaming pass reads the document in chunks and writes processed text
+# as soon as it is known to be final.  Each grammar production reads forward
+# to a known delimiter: a cite, footnote, or bracketed text from ``[`` to the
+# first ``]`` (plus one character, to check for ``_``); an inline literal
+# from its opening to its closing double backquote.  If that delimiter is not
+# yet in the buffer, the parse at that position might change when more text
+# arrives.  So only tokens that end before the first such position are
+# dispatched; the rest of the buffer is carried into the next chunk.
+
+def _stable_prefix_length(buf, inline_literals=False):
+    """Return int, the length of the prefix of `buf`
+    whose parse cannot be changed by text appended to `buf`.
+    """
+    limit = len(buf) - 1  #always leave one character of lookahead
+    #a '[' is open if there is no ']' after it (with a character to spare)
+    rb = buf.rfind(']')
+    if rb == len(buf) - 1:
+        rb = buf.rfind(']', 0, rb)
+    lb = buf.find('[', rb + 1)
+    if lb != -1:
+        limit = min(limit, lb)
+    if inline_literals:
+        #a double backquote is open if no double backquote starts 3 or more places later
+        last = buf.rfind('``')
+        for pos in range(max(0, last - 2), last + 1):
+            if buf.startswith('``', pos):
+                limit = min(limit, pos)
+                break
+        if buf.endswith('`'):
+            limit = min(limit, len(buf) - 1)
+    return max(limit, 0)
+
+def stream_text_output(
+    infile,            #file-like, the reST document (read in chunks)
+    outfile,           #file-like, receives the output
+    src_parser,        #simpleparse Parser; must *report* plain text (not cites_only_rest)
+    parsed_bibfile,
+    style,             #imported style module
+    citations_only=True,
+    chunk_size=1<<16,
+    inline_literals=False, #True if `src_parser` recognizes inline literals (cites_xp)
+    citation_cache=None    #optional bibstuff.cache.CitationCache
+    ):
+    """Return None; write the same output as `make_text_output` to `outfile`,
+    without holding the whole document (or its processed copy) in memory.
+    Document text (with inline cites substituted) is written as it is processed;
+    the reference list is appended at the end.
+    """
+    from simpleparse.dispatchprocessor import dispatch
+    citation_manager = style.CitationManager([parsed_bibfile],
+                                            citekeys=None,
+                                            citation_template=style.CITATION_TEMPLATE)
+    if citation_cache is not None:
+        citation_manager.set_citation_cache(citation_cache)
+    if citations_only:
+        write = lambda text: None
+    else:
+        write = outfile.write
+    cite_processor = bibstyles.shared.CiteRefProcessor(citation_manager, write=write)
+    buf = ''
+    at_eof = False
+    while not at_eof:
+        chunk = infile.read(chunk_size)
+        at_eof = not chunk
+        buf += chunk
+        if not buf:
+            break
+        limit = len(buf) if at_eof else _stable_prefix_length(buf, inline_literals)
+        success, taglist, nextchar = src_parser.parse(buf)
+        done = 0
+        for tag in taglist:
+            if tag[2] > limit:
+                break
+            dispatch(cite_processor, tag, buf)
+            done = tag[2]
+        buf = buf[done:]
+    outfile.write(citation_manager.make_citations() + "\n")
+
+################################################################################
+
+
+###################  WATCH MODE  ###############################################
+# In watch mode, bib4txt polls the document and the .bib files.
+# The document is rescanned (as a whole) only when it changes, and a .bib
+# file is reparsed only when it, or a file before it, changes
+# (see `_WatchedBibfiles`).  An `IncrementalRenderer` then
+# reuses each inline cite and reference whose inputs did not change:
+# the entries cited (compared by content) and their citation ranks.
+
+class IncrementalRenderer(object):
+    """Renders documents against one parsed database,
+    reusing formatted inline cites and references from earlier renders.
+    """
+    def __init__(self, parsed_bibfile, src_parser, style, citations_only=True, citation_cache=None):
+        self.src_parser = src_parser
+        self.style = style
+        self.citations_only = citations_only
+        self.citation_cache = citation_cache
+        self._inline_cites = dict()   #tuple of citekeys -> (dependencies, text)
+        self._citations = dict()      #citekey -> (dependency, text)
+        self._sortkeys = dict()       #citekey -> (dependency, sortkey)
+        self.set_database(parsed_bibfile)
+
+    def set_database(self, parsed_bibfile):
+        """Use a new (or reparsed) database; cached output is checked against it."""
+        style = self.style
+        self.citation_manager = style.CitationManager([parsed_bibfile],
+                                                      citekeys=None,
+                                                      citation_template=style.CITATION_TEMPLATE)
+        if self.citation_cache is not None:
+            self.citation_manager.set_citation_cache(self.citation_cache)
+        self._fingerprints = dict()   #citekey -> content of its entry (for this database)
+
+    def fingerprint(self, citekey):
+        """Return str, the content of the entry for `citekey` ('' if none)."""
+        result = self._fingerprints.get(citekey)
+        if result is None:
+            entry = self.citation_manager.resolve_entries([citekey])[0]
+            if entry is None:
+                result = ''
+            else:
+                result = repr(entry)
+                crossref = entry.get('crossref')
+                if crossref and not isinstance(crossref, str):
+                    result += repr(crossref)
+            self._fingerprints[citekey] = result
+        return result
+
+    def dependency(self, citekey):
+        """Return tuple, what formatted output for `citekey` depends on."""
+        return (self.fingerprint(citekey), self.citation_manager.citation_ranks.get(citekey))
+
+    def render(self, src):
+        """Return str, the same output as `make_text_output` for `src`."""
+        citation_manager = self.citation_manager
+        citation_manager.set_citekeys(None)  #forget the previous document's citations
+        cite_processor = _ReusingCiteRefProcessor(citation_manager, self)
+        if self.citations_only:
+            cite_processor.write = lambda text: None
+        self.src_parser.parse(src, processor=cite_processor)
+        entries = citation_manager.find_entries(cite_processor.all_citekeys)
+        entries.sort(key=self._sortkey)
+        citation_sep = citation_manager.citation_template['citation_sep']
+        result = citation_sep.join([self._format_citation(entry) for entry in entries]) + "\n"
+        if not self.citations_only:
+            result = cite_processor.__repr__() + result
+        return result
+
+    def _sortkey(self, entry):
+        dependency = self.dependency(entry.citekey)
+        cached = self._sortkeys.get(entry.citekey)
+        if cached is None or cached[0] != dependency:
+            cached = self._sortkeys[entry.citekey] = (dependency, self.citation_manager.sortkey(entry))
+        return cached[1]
+
+    def _format_citation(self, entry):
+        dependency = self.dependency(entry.citekey)
+        cached = self._citations.get(entry.citekey)
+        if cached is None or cached[0] != dependency:
+            bib4txt_logger.debug("watch: formatting reference %s", entry.citekey)
+            cached = self._citations[entry.citekey] = (dependency, self.citation_manager.format_citation(entry))
+        return cached[1]
+
+    def format_inline_cite(self, cite_key_list):
+        key = tuple(cite_key_list)
+        dependencies = tuple(self.dependency(citekey) for citekey in key)
+        cached = self._inline_cites.get(key)
+        if cached is None or cached[0] != dependencies:
+            bib4txt_logger.debug("watch: formatting inline cite %s", key)
+            text = self.citation_manager.cached_format_inline_cite(cite_key_list)
+            cached = self._inline_cites[key] = (dependencies, text)
+        return cached[1]
+
+
+class _ReusingCiteRefProcessor(bibstyles.shared.CiteRefProcessor):
+    """CiteRefProcessor that gets inline cites from an IncrementalRenderer."""
+    def __init__(self, citation_manager, renderer):
+        bibstyles.shared.CiteRefProcessor.__init__(self, citation_manager)
+        self.renderer = renderer
+
+    def format_inline_cite(self, cite_key_list):
+        return self.renderer.format_inline_cite(cite_key_list)
+
+
+def _mtimes(paths):
+    """Return list, the modification time of each path (None if missing)."""
+    result = []
+    for path in paths:
+        try:
+            result.append(os.stat(path).st_mtime_ns)
+        except OSError:
+            result.append(None)
+    return result
+
+class _WatchedBibfiles(object):
+    """The .bib files of a watched document, parsed one file at a time.
+    A file can use the @string macros of the files before it,
+    so when a file changes it and the files after it are reparsed;
+    the files before it are reused.  (With pybtex, all files are reparsed.)
+    """
+    def __init__(self, bibfile_names, use_pybtex=False):
+        self.bibfile_names = list(bibfile_names)
+        self.use_pybtex = use_pybtex
+        self._mtimes = [None] * len(self.bibfile_names)
+        self._parts = [None] * len(self.bibfile_names)  #(entries, macros after the file)
+        self.database = None  #the parsed database (None if no .bib file was found)
+
+    def update(self):
+        """Return bool, whether a .bib file changed since the last call.
+        If so, `self.database` is the new parsed database.
+        """
+        mtimes = _mtimes(self.bibfile_names)
+        changed = [idx for idx, (old, new) in enumerate(zip(self._mtimes, mtimes)) if old != new]
+        if not changed:
+            return False
+        self._mtimes = mtimes
+        if self.use_pybtex:
+            self.database = parse_bibfiles(self.bibfile_names, True)
+            return True
+        macros = dict()
+        if changed[0] > 0:
+            macros = self._parts[changed[0] - 1][1]
+        for idx in range(changed[0], len(self.bibfile_names)):
+            bibfile_processor = bibfile.BibFile()
+            bibfile_processor._macroMap = dict(macros)
+            if mtimes[idx] is not None:
+                src = bibfiles2string(self.bibfile_names[idx:idx + 1])
+                bib4txt_logger.debug(f"watch: parsing {self.bibfile_names[idx]}")
+                bibgrammar.Parse(src, bibfile_processor)
+            macros = bibfile_processor._macroMap
+            self._parts[idx] = (bibfile_processor.entries, macros)
+        if all(mtime is None for mtime in mtimes):
+            self.database = None
+            return True
+        result = bibfile.BibFile()
+        for entries, macros in self._parts:
+            for entry in entries:
+                #forget cross references resolved against an earlier database
+                crossref = dict.get(entry, 'crossref')
+                if crossref is not None and not isinstance(crossref, str):
+                    entry['crossref'] = crossref.citekey
+            result.entries.extend(entries)
+        result._macroMap = dict(macros)
+        self.database = result
+        return True
+
+def watch(
+    infile,            #str, path to the reST document
+    outfile,           #str, path for the output
+    bibfile_names,     #sequence of str, paths to the .bib files
+    renderer,          #IncrementalRenderer (holding the parsed .bib files)
+    use_pybtex=False,
+    interval=0.5,      #float, seconds between checks
+    max_renders=None,  #int, stop after this many renders (default: never stop)
+    bibfiles=None      #_WatchedBibfiles whose database the renderer holds (default: parse now)
+    ):
+    """Return None; poll for changes, rewriting `outfile` after each change.
+    The output file is replaced atomically, so readers never see a partial file.
+    """
+    import time
+    doc_mtime = None
+    if bibfiles is None:
+        bibfiles = _WatchedBibfiles(bibfile_names, use_pybtex)
+        bibfiles.update()
+        if bibfiles.database is not None:
+            renderer.set_database(bibfiles.database)
+    renders = 0
+    while max_renders is None or renders < max_renders:
+        changed = False
+        if bibfiles.update():
+            if bibfiles.database is None:
+                bib4txt_logger.error("No BibTeX databases found; keeping the previous databases.")
+            else:
+                renderer.set_database(bibfiles.database)
+                changed = True
+        new_doc_mtime = _mtimes([infile])[0]
+        if new_doc_mtime != doc_mtime:
+            doc_mtime = new_doc_mtime
+            changed = True
+        if changed and doc_mtime is not None:
+            start = time.perf_counter()
+            with open(infile, mode='r', encoding='utf-8') as fh:
+                src = fh.read()
+            result = renderer.render(src)
+            tmpfile = outfile + '.tmp'
+            with open(tmpfile, 'w', encoding="utf8") as fh:
+                fh.write(result)
+            os.replace(tmpfile, outfile)
+            if renderer.citation_cache is not None:
+                renderer.citation_cache.flush()
+            renders += 1
+            bib4txt_logger.info(f"watch: wrote {outfile} in {time.perf_counter() - start:.3f}s")
+        elif max_renders is None or renders < max_renders:
+            time.sleep(interval)
+
+################################################################################
+
+
+###################  BATCH PROCESSING  #########################################
+# Batch mode formats many documents against one parsed database.
+# The database and the cite parser are handed to each worker process once
+# (by the pool initializer), not once per document.
+_batch_state = dict()
+
+def _init_batch_worker(parsed_bibfile, stylename, ebnf_dec, citations_only, use_simpleparse=False,
+                       cache_options=None):
+    """Prepare a (worker) process for `_batch_process_document`.
+    `cache_options` (path, max_size) opens a citation cache for this process.
+    """
+    citation_cache = None
+    if cache_options is not None:
+        import atexit
+        from bibstuff.cache import CitationCache
+        citation_cache = CitationCache(*cache_options)
+        atexit.register(citation_cache.close)
+    _batch_state.update(
+        citation_cache = citation_cache,
+        parsed_bibfile = parsed_bibfile,
+        style = bibstyles.from_name(stylename),
+        cite_parser = make_cite_parser(ebnf_dec, use_simpleparse),
+        citations_only = citations_only,
+        )
+
+def _batch_process_document(paths):
+    """Return str, the input path, after writing its output file.
+    Each document gets its own citation manager (citation state is per document).
+    """
+    infile, outfile = paths
+    with open(infile, mode='r', encoding='utf-8') as fh:
+        src = fh.read()
+    result = make_text_output(
+        src,
+        _batch_state['cite_parser'],
+        _batch_state['parsed_bibfile'],
+        _batch_state['style'],
+        citations_only = _batch_state['citations_only'],
+        citation_cache = _batch_state['citation_cache'])
+    with open(outfile, 'w', encoding="utf8") as fh:
+        fh.write(result)
+    if _batch_state['citation_cache'] is not None:
+        _batch_state['citation_cache'].flush()
+    return infile
+
+def make_batch_output(
+    infiles,           #sequence of str, paths of reST documents
+    outdir,            #str, directory for the output files
+    parsed_bibfile,
+    stylename,         #str, name of a bibstuff.bibstyles module
+    ebnf_dec,          #str, simpleparse grammar for the documents
+    citations_only=True,
+    jobs=None,         #int, number of worker processes (default: cpu count)
+    overwrite=False,
+    use_simpleparse=False,
+    cache_options=None #(path, max_size) for a citation cache, or None
+    ):
+    """Return list of str, the output paths (in the order of `infiles`).
+    Processes each document in `infiles` against the same parsed database,
+    writing one output file per document to `outdir`
+    (with the same base name as the input).
+    Output does not depend on `jobs`.
+    """
+    outfiles = [os.path.join(outdir, os.path.basename(infile)) for infile in infiles]
+    if len(set(outfiles)) != len(outfiles):
+        raise ValueError("Batch input files must have distinct base names.")
+    if not overwrite:
+        existing = [outfile for outfile in outfiles if os.path.exists(outfile)]
+        if existing:
+            raise ValueError("Output files already exist (use -n to overwrite):\n" + "\n".join(existing))
+    os.makedirs(outdir, exist_ok=True)
+    initargs = (parsed_bibfile, stylename, ebnf_dec, citations_only, use_simpleparse, cache_options)
+    tasks = list(zip(infiles, outfiles))
+    if jobs is None:
+        jobs = os.cpu_count() or 1
+    jobs = max(1, min(jobs, len(tasks)))
+    if jobs == 1:
+        _init_batch_worker(*initargs)
+        for task in tasks:
+            bib4txt_logger.info(f"processed {_batch_process_document(task)}")
+    else:
+        import multiprocessing
+        with multiprocessing.Pool(jobs, initializer=_init_batch_worker, initargs=initargs) as pool:
+            for infile in pool.imap(_batch_process_document, tasks):
+                bib4txt_logger.info(f"processed {infile}")
+    return outfiles
+
 ################################################################################
 
 
@@ -150,6 +555,32 @@ def bibfiles2string(
         
         
 
+def parse_bibfiles(
+    bibfile_names,     #sequence of strings, the file paths
+    use_pybtex=False   #bool, parse with pybtex (experimental)
+    ):
+    """Return parsed database (a bibfile.BibFile or bibfile4pybtex.BibFile),
+    or None if no database was found.
+    """
+    bibfile_as_string = bibfiles2string(bibfile_names)
+    if 0 == len(bibfile_as_string):
+        return None
+    if use_pybtex:
+        import pybtex.errors
+        pybtex.errors.set_strict_mode(False)
+        from pybtex.database.input.bibtex import Parser
+        bibdata = Parser().parse_string(bibfile_as_string)
+        from bibstuff import bibfile4pybtex
+        bibfile_processor = bibfile4pybtex.BibFile(bibdata)
+    else:
+        # create object to store parsed .bib file
+        bibfile_processor = bibfile.BibFile()
+        bib4txt_logger.debug('Ready to parse bib file.')
+        #store parsed .bib files in the bibfile_processor
+        bibgrammar.Parse(bibfile_as_string, bibfile_processor)
+    return bibfile_processor
+        
+
 def main():
     """Return None; provide command-line tool.
     See bib4txt.py -h for help.
@@ -164,6 +595,10 @@ def main():
     %(prog)s [options] BIB_DATABASE
     Or with standard options:
     %(prog)s -i reST_FILE  -n -o refs_FILE BIB_DATABASE
+    Or, rewriting refs_FILE whenever reST_FILE or BIB_DATABASE changes:
+    %(prog)s -w -i reST_FILE -n -o refs_FILE BIB_DATABASE
+    Or, in batch mode (one output file per input, in DIR):
+    %(prog)s -I reST_FILE1 -I reST_FILE2 -d DIR BIB_DATABASE
     """
     _epilog = """
     User defined styles are easy to add.
@@ -204,6 +639,29 @@ def main():
                       help="Set logging level to integer value (per logging module).")
     argparser.add_argument("-x", "--xp", action="store_true", dest="xp_parse",
                       default=False, help="Use experimental document parser, default=%(default)s")
+    argparser.add_argument("--simpleparse", action="store_true", dest="use_simpleparse", default=False,
+                      help="Parse the document with the simpleparse grammar instead of the fast scanner, default=%(default)s")
+    argparser.add_argument("--stream", action="store_true", dest="stream", default=False,
+                      help="Process the document in chunks, writing output as it is produced, default=%(default)s")
+    argparser.add_argument("--chunk-size", action="store", type=int, dest="chunk_size", default=1<<16,
+                      help="Characters read per chunk in streaming mode, default=%(default)s")
+    argparser.add_argument("-C", "--cache", action="store_true", dest="use_cache", default=False,
+                      help="Reuse formatted citations from earlier runs (kept in a cache file), default=%(default)s")
+    argparser.add_argument("--cache-file", action="store", dest="cache_file", metavar="FILE",
+                      help="Citation cache file (implies -C), default: citations.sqlite in the user cache directory")
+    argparser.add_argument("--cache-size", action="store", type=float, dest="cache_size", default=64,
+                      help="Citation cache size budget in MB, default=%(default)s")
+    argparser.add_argument("-w", "--watch", action="store_true", dest="watch", default=False,
+                      help="Watch the input and .bib files, rewriting the output when they change (needs -i and -o)")
+    argparser.add_argument("--interval", action="store", type=float, dest="interval", default=0.5,
+                      help="Seconds between checks for changes in watch mode, default=%(default)s")
+    argparser.add_argument("-I", "--batch-infile", action="append", dest="batch_infiles",
+                      default=[], metavar="FILE",
+                      help="Add FILE to a batch of documents (repeatable); requires --batch-outdir")
+    argparser.add_argument("-d", "--batch-outdir", action="store", dest="batch_outdir",
+                      help="Batch mode: write one output per batch document to DIR", metavar="DIR")
+    argparser.add_argument("-j", "--jobs", action="store", type=int, dest="jobs",
+                      help="Number of worker processes for batch mode, default: cpu count")
     argparser.add_argument("bibfiles", action="store", nargs='*',
                       help="The .bib files for the references.")
 
@@ -235,10 +693,21 @@ def main():
             )
     #import a bibliography style based on `stylefile` command-line option
     #TODO: add error handling for unknown styles
-    style = importlib.import_module('bibstuff.bibstyles.%s'%stylename)
+    style = bibstyles.from_name(stylename)
+
+    batch_mode = bool(args.batch_infiles or args.batch_outdir)
+    if batch_mode and not (args.batch_infiles and args.batch_outdir):
+        bib4txt_logger.error("Batch mode needs both -I (--batch-infile) and -d (--batch-outdir).")
+        sys.exit(1)
+
+    if args.watch and (batch_mode or args.stream or not (args.infile and args.outfile)):
+        bib4txt_logger.error("Watch mode needs -i and -o (and no batch or streaming options).")
+        sys.exit(1)
 
     # open output file for writing (default: stdout)
-    if args.outfile:
+    if batch_mode:
+        pass
+    elif args.outfile:
         if os.path.exists(args.outfile) and not args.overwrite:
             _msg = """ABORTED because output file %s already exists:
             Use -n option to nuke (overwrite) this file.
@@ -246,12 +715,15 @@ def main():
             """%(args.outfile)
             bib4txt_logger.error(_msg)
             sys.exit(1)
-        _outfile = open(args.outfile,'w', encoding="utf8")
+        if not args.watch:  #watch mode rewrites the output file on each change
+            _outfile = open(args.outfile,'w', encoding="utf8")
 
 
     _infile = sys.stdin #default
     # read input file if provided as option:
-    if args.infile:
+    if batch_mode or args.watch:
+        pass
+    elif args.infile:
         try:
             _infile = open(args.infile, mode='r', encoding='utf-8')
         except:
@@ -263,40 +735,91 @@ def main():
         ebnf_dec = ebnf_sp.cites_only_rest
     if args.xp_parse:
         ebnf_dec = ebnf_sp.cites_xp
-    # Create a simpleparse.parser Parser based on the chosen grammar
-    cite_parser = simpleparse.parser.Parser(ebnf_dec, root='src')
+    elif args.stream:
+        #streaming needs the plain text tokens reported (so it knows where they end)
+        ebnf_dec = ebnf_sp.cites_rest
+    if not batch_mode:
+        # Create a parser (by default, a fast scanner) based on the chosen grammar
+        cite_parser = make_cite_parser(ebnf_dec, args.use_simpleparse)
 
     # read database (.bib) files
     bibfile_names = args.bibfiles
-    bibfile_as_string = bibfiles2string(bibfile_names)
-    if 0 == len(bibfile_as_string):
+    if args.watch:  #parsed file by file, so that changed files can be reparsed
+        watched_bibfiles = _WatchedBibfiles(bibfile_names, args.usePybtex)
+        watched_bibfiles.update()
+        bibfile_processor = watched_bibfiles.database
+    else:
+        bibfile_processor = parse_bibfiles(bibfile_names, args.usePybtex)
+    if bibfile_processor is None:
         bib4txt_logger.error("No BibTeX databases found.")
         argparser.print_help()
         sys.exit(1)
-    if args.usePybtex:
-        import pybtex.errors
-        pybtex.errors.set_strict_mode(False)
-        from pybtex.database.input.bibtex import Parser
-        bibdata = Parser().parse_string(bibfile_as_string)
-        from bibstuff import bibfile4pybtex
-        bibfile_processor = bibfile4pybtex.BibFile(bibdata)
-    else:
-        # create object to store parsed .bib file
-        bibfile_processor = bibfile.BibFile()
-        bib4txt_logger.debug('Ready to parse bib file.')
-        #store parsed .bib files in the bibfile_processor
-        bibgrammar.Parse(bibfile_as_string, bibfile_processor)
 
     bib4txt_logger.info('bib file parsed.')
 
-    result = make_text_output(
-        _infile.read(),
-        cite_parser,
-        bibfile_processor,  #a bibfile.BibFile or bibfile4pybtex.BibFile
-        style,
-        citations_only = not args.entire_doc)
-
-    _outfile.write(result)        
+    cache_options = None
+    citation_cache = None
+    if args.use_cache or args.cache_file:
+        from bibstuff.cache import CitationCache
+        cache_options = (args.cache_file, int(args.cache_size * 2**20))
+        if not batch_mode:  #batch workers open their own
+            citation_cache = CitationCache(*cache_options)
+
+    if args.watch:
+        renderer = IncrementalRenderer(bibfile_processor, cite_parser, style,
+                                       citations_only = not args.entire_doc,
+                                       citation_cache = citation_cache)
+        try:
+            watch(args.infile, args.outfile, bibfile_names, renderer,
+                  use_pybtex = args.usePybtex, interval = args.interval,
+                  bibfiles = watched_bibfiles)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            if citation_cache is not None:
+                citation_cache.close()
+        return
+
+    if batch_mode:
+        try:
+            make_batch_output(
+                args.batch_infiles,
+                args.batch_outdir,
+                bibfile_processor,
+                stylename,
+                ebnf_dec,
+                citations_only = not args.entire_doc,
+                jobs = args.jobs,
+                overwrite = args.overwrite,
+                use_simpleparse = args.use_simpleparse,
+                cache_options = cache_options)
+        except ValueError as e:
+            bib4txt_logger.error(f"ABORTED: {e}")
+            sys.exit(1)
+        return
+
+    if args.stream:
+        stream_text_output(
+            _infile,
+            _outfile,
+            cite_parser,
+            bibfile_processor,  #a bibfile.BibFile or bibfile4pybtex.BibFile
+            style,
+            citations_only = not args.entire_doc,
+            chunk_size = args.chunk_size,
+            inline_literals = args.xp_parse,
+            citation_cache = citation_cache)
+    else:
+        result = make_text_output(
+            _infile.read(),
+            cite_parser,
+            bibfile_processor,  #a bibfile.BibFile or bibfile4pybtex.BibFile
+            style,
+            citations_only = not args.entire_doc,
+            citation_cache = citation_cache)
+        _outfile.write(result)
+    if citation_cache is not None:
+        citation_cache.close()
     _outfile.close()
     _infile.close()
 
@@ -0,0 +1,125 @@
+#! /usr/bin/env python
+# File: bibdb.py
+"""
+Utility for keeping a bibtex database in an SQLite file.
+Import .bib files into the database, export the database as a .bib file,
+or search it (full-text).
+
+bibdb.py -h gives usage options.
+
+Example::
+
+    python bibdb.py import refs.sqlite my_database.bib other.bib
+       -> adds the entries of the .bib files to refs.sqlite
+    python bibdb.py export refs.sqlite -o my_database.bib
+       -> writes all entries (and macros) as a .bib file
+    python bibdb.py search refs.sqlite "fire AND evolution"
+       -> prints the citekeys of entries matching the full-text query
+
+The database can also be searched with bibsearch.py.
+
+:license: MIT (see `license.txt`_)
+:date: 2026-10-19
+:see: bibstuff.bibdb
+
+.. _`license.txt`: ./license.txt
+"""
+__docformat__ = "restructuredtext en"
+__version__ = "1.0"
+
+
+###################  IMPORTS  ##################################################
+#imports from standard library
+import sys, os
+import logging
+logging.basicConfig(format='\n%(levelname)s:\n%(message)s\n')
+bibdb_logger = logging.getLogger('bibstuff_logger')
+
+#local imports
+try:
+	from bibstuff import bibdb, bibgrammar
+except ImportError: #allow user to run without installing
+	scriptdir = os.path.dirname(os.path.realpath(__file__))
+	bibdir = os.path.dirname(scriptdir)
+	sys.path.append(bibdir)
+	from bibstuff import bibdb, bibgrammar
+################################################################################
+
+
+def import_bibfiles(database, bibfile_names, replace=False):
+    """Add the entries and macros of the .bib files to `database` (an SQLiteBibFile)."""
+    database.replace = replace
+    for fname in bibfile_names:
+        with open(fname, 'r') as fh:
+            src = fh.read()
+        before = len(database)
+        bibgrammar.Parse(src, database)
+        database.commit()
+        bibdb_logger.info("%s: %d entries added." % (fname, len(database) - before))
+
+def export_bibfile(database, outfile, macros=True):
+    """Write the entries (and, if `macros`, the macros) of `database` to `outfile`."""
+    if macros and database.get_macros():
+        database.write_macros(outfile)
+        outfile.write('\n')
+    database.write(outfile)
+
+
+def main():
+    """Command-line tool.
+    See bibdb.py -h for help.
+    """
+    from argparse import ArgumentParser
+    parser = ArgumentParser(description="Keep a bibtex database in an SQLite file.")
+    parser.add_argument('--version', action='version', version=__version__)
+    parser.add_argument("-V", "--verbosity", action="store", dest="verbosity",
+                      type=int, default=0,
+                      help="2: print DEBUG messages; 1: print INFO messages; default=%(default)s")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    import_parser = commands.add_parser("import", help="Add .bib files to the database")
+    import_parser.add_argument("database", help="The SQLite database file (created if missing)")
+    import_parser.add_argument("bibfiles", nargs='+', help="The .bib files to import")
+    import_parser.add_argument("-r", "--replace", action="store_true", dest="replace", default=False,
+                      help="Replace stored entries that have the same citekey, default=%(default)s")
+
+    export_parser = commands.add_parser("export", help="Write the database as a .bib file")
+    export_parser.add_argument("database", help="The SQLite database file")
+    export_parser.add_argument("-o", "--outfile", action="store", dest="outfile",
+                      help="Write to FILE (default: stdout)", metavar="FILE")
+    export_parser.add_argument("--no-macros", action="store_false", dest="macros", default=True,
+                      help="Do not write @string macros")
+
+    search_parser = commands.add_parser("search", help="Full-text search; print matching citekeys")
+    search_parser.add_argument("database", help="The SQLite database file")
+    search_parser.add_argument("query", help="FTS5 query, e.g., 'fire AND evolution'")
+    search_parser.add_argument("-f", "--field", action="store", dest="field", default='',
+                      help="Search only this field")
+    search_parser.add_argument("-l", "--long", action="store_true", dest="long_output",
+                      default=False, help="Output entire bibtex entry")
+
+    args = parser.parse_args()
+    if 1 == args.verbosity:
+        bibdb_logger.setLevel(logging.INFO)
+    if 2 == args.verbosity:
+        bibdb_logger.setLevel(logging.DEBUG)
+
+    if args.command != "import" and not os.path.exists(args.database):
+        print("Error: No database file found.")
+        sys.exit(1)
+    with bibdb.SQLiteBibFile(args.database) as database:
+        if args.command == "import":
+            import_bibfiles(database, args.bibfiles, replace=args.replace)
+        elif args.command == "export":
+            if args.outfile:
+                with open(args.outfile, 'w') as outfile:
+                    export_bibfile(database, outfile, macros=args.macros)
+            else:
+                export_bibfile(database, sys.stdout, macros=args.macros)
+        else:
+            for entry in database.search_text(args.query, field=args.field):
+                print(str(entry) if args.long_output else entry.citekey)
+
+
+if __name__ == '__main__':
+    main()
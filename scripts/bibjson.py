@@ -0,0 +1,96 @@
+#! /usr/bin/env python
+# File: bibjson.py
+"""
+Filter for converting between bibtex and JSON.
+Converts a .bib file to NDJSON (one JSON object per entry, per line)
+or to CSL-JSON, or converts NDJSON back to bibtex.
+Entries are converted one at a time, so files of any size can be piped.
+
+bibjson.py -h gives usage options.
+
+Example::
+
+    python bibjson.py my_database.bib > my_database.ndjson
+       -> one JSON object per entry, fields in entry order
+    cat my_database.bib | python bibjson.py --csl --array > my_database.json
+       -> a CSL-JSON array
+    python bibjson.py -r my_database.ndjson > my_database.bib
+       -> back to bibtex
+
+:license: MIT (see `license.txt`_)
+:date: 2026-10-19
+:see: bibstuff.bibjson
+
+.. _`license.txt`: ./license.txt
+"""
+__docformat__ = "restructuredtext en"
+__version__ = "1.0"
+
+
+###################  IMPORTS  ##################################################
+#imports from standard library
+import sys, os
+import logging
+logging.basicConfig(format='\n%(levelname)s:\n%(message)s\n')
+bibjson_logger = logging.getLogger('bibstuff_logger')
+
+#local imports
+try:
+	from bibstuff import bibgrammar, bibjson
+except ImportError: #allow user to run without installing
+	scriptdir = os.path.dirname(os.path.realpath(__file__))
+	bibdir = os.path.dirname(scriptdir)
+	sys.path.append(bibdir)
+	from bibstuff import bibgrammar, bibjson
+################################################################################
+
+
+def main():
+    """Command-line tool.
+    See bibjson.py -h for help.
+    """
+    from argparse import ArgumentParser
+    parser = ArgumentParser(description="Convert bibtex to NDJSON or CSL-JSON, or NDJSON to bibtex.")
+    parser.add_argument('--version', action='version', version=__version__)
+    parser.add_argument("infile", nargs='?', default='-',
+                      help="Input file (default: stdin)")
+    parser.add_argument("-o", "--outfile", action="store", dest="outfile",
+                      help="Write to FILE (default: stdout)", metavar="FILE")
+    parser.add_argument("-r", "--reverse", action="store_true", dest="reverse", default=False,
+                      help="Convert NDJSON to bibtex, default=%(default)s")
+    parser.add_argument("--csl", action="store_true", dest="csl", default=False,
+                      help="Write CSL-JSON items, default=%(default)s")
+    parser.add_argument("--array", action="store_true", dest="array", default=False,
+                      help="Write CSL-JSON as a JSON array (implies --csl), default=%(default)s")
+    parser.add_argument("-V", "--verbosity", action="store", dest="verbosity",
+                      type=int, default=0,
+                      help="2: print DEBUG messages; 1: print INFO messages; default=%(default)s")
+    args = parser.parse_args()
+    if 1 == args.verbosity:
+        bibjson_logger.setLevel(logging.INFO)
+    if 2 == args.verbosity:
+        bibjson_logger.setLevel(logging.DEBUG)
+
+    infile = sys.stdin if args.infile == '-' else open(args.infile, 'r')
+    outfile = open(args.outfile, 'w') if args.outfile else sys.stdout
+    try:
+        if args.reverse:
+            for count, entry in enumerate(bibjson.iter_ndjson(infile), 1):
+                if count > 1:
+                    outfile.write('\n')
+                entry.write_to(outfile)
+        elif args.array:
+            bibjson.write_csl_array(bibgrammar.iter_entries(infile), outfile)
+        else:
+            bibjson.write_ndjson(bibgrammar.iter_entries(infile), outfile, csl=args.csl)
+    except BrokenPipeError:  #e.g., piped to head
+        sys.stderr.close()
+    finally:
+        if infile is not sys.stdin:
+            infile.close()
+        if outfile is not sys.stdout:
+            outfile.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -29,7 +29,14 @@ logging.basicConfig(format='\n%(levelname)s:\n%(message)s\n')
 biblabel_logger = logging.getLogger('bibstuff_logger')
 
 # bibstuff imports
-from bibstuff import bibfile, bibgrammar
+try:
+	from bibstuff import bibfile, bibgrammar
+except ImportError: #allow user to run without installing
+	import os, sys
+	scriptdir = os.path.dirname(os.path.realpath(__file__))
+	bibdir = os.path.dirname(scriptdir)
+	sys.path.append(bibdir)
+	from bibstuff import bibfile, bibgrammar
 
 ################################################################################
 
@@ -85,6 +92,8 @@ examples directory: The file must include only a valid JSON structure of the for
 	
 	parser.add_option("-s", "--style", action="store", type="string", \
 	 				  dest="style", default = '', help="File with label format (json)")
+	parser.add_option("-j", "--jobs", action="store", type="int", dest="jobs", default=1,
+					  help="Number of worker processes for making labels, default=%default")
 	parser.add_option("-v", "--verbose", action="store_true", dest="verbose", default=False,
 					  help="Print INFO messages to stdout, default=%default")
 	# :TODO: Add an options group stype_opts and an option for each style item
@@ -118,15 +127,9 @@ examples directory: The file must include only a valid JSON structure of the for
 	 
 	bfile = bibfile.BibFile()
 	bibgrammar.Parse(src, bfile)
-	used_citekeys = [] # stores created keys
+	bfile.relabel(citekey_label_style, jobs=options.jobs)
 	for entry in bfile.entries:
-		label = entry.make_citekey(used_citekeys, citekey_label_style)
-		entry.citekey = label
-		used_citekeys.insert(0,label) # prepend to take advantage (in
-									  # make_entry_citekey) of possibly sorted
-									  # bfile
-	for entry in bfile.entries:
-		print entry
+		print(entry)
 
 if __name__ == '__main__':
 	main()
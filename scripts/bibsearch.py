@@ -14,6 +14,9 @@ Example::
 
     python bibsearch.py my_database.bib Smith:1998
        -> produces a formated reference if citekey Smith:1998 is found
+
+    python bibsearch.py -r my_database.sqlite fire
+       -> searches a database made by bibdb.py
     
     cat ref_list.txt | python bibsearch.py -l my_database.bib
         -> produces a bibtex-format file of all references in list.
@@ -40,19 +43,19 @@ __needs__ = '2.7+'
 
 ###################  IMPORTS  ##################################################
 #imports from standard library
-import importlib, string, sys, os
+import string, sys, os
 import logging
 logging.basicConfig(format='\n%(levelname)s:\n%(message)s\n')
 bibsearch_logger = logging.getLogger('bibstuff_logger')
 
 #local imports
 try:
-	from bibstuff import bibfile, bibgrammar, bibstyles, ebnf_sp
+	from bibstuff import bibdb, bibfile, bibgrammar, bibstyles, ebnf_sp
 except ImportError: #allow user to run without installing
 	scriptdir = os.path.dirname(os.path.realpath(__file__))
 	bibdir = os.path.dirname(scriptdir)
 	sys.path.append(bibdir)
-	from bibstuff import bibfile, bibgrammar, bibstyles, ebnf_sp
+	from bibstuff import bibdb, bibfile, bibgrammar, bibstyles, ebnf_sp
 ################################################################################
 
  
@@ -90,6 +93,14 @@ def main():
     parser.add_argument("-V", "--verbosity", action="store", dest="verbosity",
                       type=int, default=0,
                       help="Print DEBUG messages to stdout, default=%default")
+    parser.add_argument("-C", "--cache", action="store_true", dest="use_cache", default=False,
+                      help="Reuse formatted references from earlier runs (kept in a cache file)")
+    parser.add_argument("--cache-file", action="store", dest="cache_file", metavar="FILE",
+                      help="Citation cache file (implies -C), default: citations.sqlite in the user cache directory")
+    parser.add_argument("--cache-size", action="store", type=float, dest="cache_size", default=64,
+                      help="Citation cache size budget in MB")
+    parser.add_argument("-j", "--jobs", action="store", type=int, dest="jobs", default=1,
+                      help="Number of processes for formatting references, default=%(default)s")
     parser.add_argument("bibtexFile", action="store",
                       help="The bibtex file to search for the references.")
     parser.add_argument("searchstrings", action="store", nargs='*',
@@ -104,21 +115,27 @@ def main():
                  %(args, args.stylefile)
                 )
 
-    try:
-        src = open(args.bibtexFile).read()
-    except :
-        print("Error: No bibtex file found.")
-        sys.exit(1)
+    if bibdb.is_database(args.bibtexFile):  #an SQLite database (see bibdb.py)
+        src = None
+    else:
+        try:
+            src = open(args.bibtexFile).read()
+        except :
+            print("Error: No bibtex file found.")
+            sys.exit(1)
     # If no search string was sepcified was specified, read search strings from stdin
     if 0 == len(args.searchstrings):
         searches = str.split(sys.stdin.read())
     else :
         searches = args.searchstrings
 
-    # create object to store parsed .bib file
-    parsed_bibfile = bibfile.BibFile()
-    # store a parsed .bib file in parsed_bibfile
-    bibgrammar.Parse(src, parsed_bibfile)
+    if src is None:
+        parsed_bibfile = bibdb.SQLiteBibFile(args.bibtexFile)
+    else:
+        # create object to store parsed .bib file
+        parsed_bibfile = bibfile.BibFile()
+        # store a parsed .bib file in parsed_bibfile
+        bibgrammar.Parse(src, parsed_bibfile)
 
     # list of entries
     entrylist = []
@@ -138,24 +155,24 @@ def main():
         elif args.long_output :
             result = "\n".join(str(e) for e in entrylist)
         else :
-            #import a formatting style based on `style` command-line option
-            style = importlib.import_module('bibstuff.bibstyles.%s'%args.style)
-            """
-            str2exec = "import bibstuff.bibstyles.%s as style"%stylename
-            workaround = {}  #work around Python 2 exec vs Python 3 exec
-            exec(str2exec, {}, workaround)
-            style = workaround['style']
-            #exec("import bibstuff.bibstyles.%s as style"%os.path.splitext(args.stylefile)[0])
-            """
-            str2exec = "import bibstuff.bibstyles.%s as style"%os.path.splitext(args.stylefile)[0]
-            workaround = {}  #work around Python 2 exec vs Python 3 exec
-            exec(str2exec, {}, workaround)
-            style = workaround['style']
+            #import a formatting style based on the `stylefile` or `style` command-line option
+            if args.stylefile != "default.py":
+                style = bibstyles.from_name(os.path.splitext(args.stylefile)[0])
+            else:
+                style = bibstyles.from_name(args.style)
             citation_manager = style.CitationManager([parsed_bibfile],
                                                      citekeys=[e.citekey for e in entrylist],
                                                      citation_template=style.CITATION_TEMPLATE)
             cite_processor = bibstyles.shared.CiteRefProcessor(citation_manager)
-            result = citation_manager.make_citations()
+            if args.use_cache or args.cache_file:
+                from bibstuff.cache import CitationCache
+                with CitationCache(args.cache_file, int(args.cache_size * 2**20)) as citation_cache:
+                    citation_manager.set_citation_cache(citation_cache)
+                    result = citation_manager.make_citations()
+            elif args.jobs > 1:
+                result = citation_manager.make_citations_parallel(jobs=args.jobs)
+            else:
+                result = citation_manager.make_citations()
         print(result)
     else: #did not find any matches
         bibsearch_logger.info("No matches.")
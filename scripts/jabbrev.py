@@ -3,87 +3,100 @@
 
 """
 A utility to read journal abbreviations from a text file and modify a
-bibtex database to use the abbreviations.  Right now it just replaces
-long versions with abbreviations in bib file.
+bibtex database to use the abbreviations (or, with -e, the full names).
+Journal names are matched ignoring case, punctuation, LaTeX markup
+and "and" vs. "&".  Only the journal values are rewritten; everything
+else in the file (other fields, macros, comments) is copied verbatim.
+
+The abbreviation file has lines ``abbreviation = full name``
+(see examples/journal_abbreviations.txt) or is in the CSA format
+(see examples/journals_from_csa.txt).  The index built from it is cached,
+so later runs skip reading the file.  With -f, journal names with small
+variations (e.g., typos) are replaced by their closest match.
+
+Example::
+
+    python jabbrev.py refs.bib journal_abbreviations.txt > abbreviated.bib
+    python jabbrev.py -e abbreviated.bib journal_abbreviations.txt > expanded.bib
+    python jabbrev.py -f 0.7 refs.bib journals_from_csa.txt > abbreviated.bib
 
 :author: Dylan Schwilk
-:contact: http://www.pricklysoft.org 
+:contact: http://www.pricklysoft.org
 :copyright: 2006 by Dylan Schwilk and Alan G Isaac
 :license: MIT (see `license.txt`_)
 :date: 2006-09-15
-:TODO: Move this to a scripts directory or the examples directory?
+:see: bibstuff.jabbrev
 
 .. _`license.txt`: ../license.txt
 """
 
 __docformat__ = "restructuredtext en"
-__version__ = "1.5"
+__version__ = "2.0"
 __author__ = "Dylan W. Schwilk"
 
-import string, sys, re
-from simpleparse.parser import Parser
-from simpleparse.dispatchprocessor import * 
-
-from bibstuff import bibfile,  bibgrammar
+import sys, os
+import logging
+logging.basicConfig(format='\n%(levelname)s:\n%(message)s\n')
+jabbrev_logger = logging.getLogger('bibstuff_logger')
 
+try:
+	from bibstuff import jabbrev
+except ImportError: #allow user to run without installing
+	scriptdir = os.path.dirname(os.path.realpath(__file__))
+	bibdir = os.path.dirname(scriptdir)
+	sys.path.append(bibdir)
+	from bibstuff import jabbrev
 
-def MakeMap(jlist):
-	"""makes a dictionary of journals.
-	key long name by default, data abbreviation.
-	"""
-	jmap = {}
-	for j in jlist:
-		l = j.split("=")
-		jmap[l[1].strip()] = l[0].strip()
-	return jmap
 
-def Translate(bib, jmap):
-	"""Translate"""
-	for entry in bib.entries:
-		j = entry['journal']
-		if j :
-			entry['journal'] = jmap.get(j, j)
-		print entry   
-			
-	  
 def main():
 	'''Command-line tool.  See jabbrev.py -h for help'''
+	from argparse import ArgumentParser
+	parser = ArgumentParser(usage="%(prog)s [options] DATABASE_FILE [ABBREVIATION_FILE]",
+		description="Abbreviate (or expand) the journal names in a bibtex database.")
+	parser.add_argument('--version', action='version', version=__version__)
+	parser.add_argument("database", metavar="DATABASE_FILE",
+		help="bibtex file ('-' for stdin)")
+	parser.add_argument("abbreviations", nargs='?', metavar="ABBREVIATION_FILE",
+		help="journal abbreviations file (default: read from stdin)")
+	parser.add_argument("-e", "--expand", action="store_true", dest="expand", default=False,
+		help="Expand abbreviations to full names, default=%(default)s")
+	parser.add_argument("-f", "--fuzzy", action="store", dest="threshold", type=float,
+		default=None, metavar="THRESHOLD",
+		help="Also replace names that match approximately, with similarity at least THRESHOLD (0 to 1; e.g., %s)" % jabbrev.DEFAULT_THRESHOLD)
+	parser.add_argument("-o", "--outfile", action="store", dest="outfile",
+		help="Write to FILE (default: stdout)", metavar="FILE")
+	parser.add_argument("--no-cache", action="store_false", dest="use_cache", default=True,
+		help="Do not use (or write) the cached abbreviation index")
+	parser.add_argument("-V", "--verbosity", action="store", dest="verbosity",
+		type=int, default=0,
+		help="2: print DEBUG messages; 1: print INFO messages; default=%(default)s")
+	args = parser.parse_args()
+	if 1 == args.verbosity:
+		jabbrev_logger.setLevel(logging.INFO)
+	if 2 == args.verbosity:
+		jabbrev_logger.setLevel(logging.DEBUG)
 
-	input = sys.stdin
-	output = sys.stdout
-	
-	try:
-		from optparse import OptionParser
-	except (ImportError, AttributeError):
-		try:
-			from optik import OptionParser
-		except (ImportError, AttributeError):
-			print "jabbrev needs python 2.3 or Greg Ward's optik module."
-	
-	usage = "usage: %prog [options] DATABASE_FILE [ABBREVIATION_FILE] "
-	parser = OptionParser(usage=usage, version ="%prog " + __version__)
-	 
-	(options, args) = parser.parse_args()
-
-	if len(args) > 2 :
-		print "Too many arguments"
-		sys.exit(1)
-	try :
-		# bibtex file is last argument
-		bib = open(args[0]).read()
-	except :
-		print "No bibtex file found."
-		sys.exit(1)
-	if len(args) == 2 :
-		input = open(args[1])
-	else :
-		input = sys.stdin.read()
-			  
-	bfile = bibfile.BibFile()
-	bibgrammar.Parse(bib, bfile)
+	if args.abbreviations:
+		index = jabbrev.JournalIndex.from_file(args.abbreviations, use_cache=args.use_cache)
+	elif args.database == '-':
+		parser.error("Need an abbreviation file when the database is read from stdin.")
+	else:
+		index = jabbrev.JournalIndex(jabbrev.read_abbreviations(sys.stdin))
+	jabbrev_logger.info("%d journals in the abbreviation index." % len(index))
 
-	journals = MakeMap(input.readlines())	
-	Translate(bfile, journals)
+	infile = sys.stdin if args.database == '-' else open(args.database, 'r')
+	outfile = open(args.outfile, 'w') if args.outfile else sys.stdout
+	try:
+		changed = jabbrev.translate_stream(infile, outfile, index,
+			expand=args.expand, threshold=args.threshold)
+		jabbrev_logger.info("%d journal fields changed." % changed)
+	except BrokenPipeError:  #e.g., piped to head
+		sys.stderr.close()
+	finally:
+		if infile is not sys.stdin:
+			infile.close()
+		if outfile is not sys.stdout:
+			outfile.close()
 
 if __name__ == '__main__':
 	main()
@@ -0,0 +1,313 @@
+#!/usr/bin/env python
+"""
+Provides tests for the output modes of the bib4txt script
+
+:author: Dylan Schwilk
+:contact: http://www.schwilk.org
+:license: MIT (see `license.txt`_)
+:date: 2026-10-19
+
+.. _`license.txt`: ../../license.txt
+
+"""
+
+import importlib.util
+import io
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+from bibstuff import bibstyles, ebnf_sp
+
+script = os.path.join(os.path.dirname(__file__), '..', '..', 'scripts', 'bib4txt.py')
+spec = importlib.util.spec_from_file_location('bib4txt', script)
+bib4txt = importlib.util.module_from_spec(spec)
+sys.modules['bib4txt'] = bib4txt  #so that batch workers can find its functions
+spec.loader.exec_module(bib4txt)
+
+bib_a = r"""@string{jecol = {Journal of Ecology}}
+@article{Schwilk1999,
+	author = {Schwilk, Dylan W.},
+	title = {Flammability},
+	journal = jecol,
+	year = 1999
+}
+@incollection{Isaac2000,
+	author = {Isaac, Alan G.},
+	title = {Games},
+	crossref = {Proc2000},
+	pages = {1--10}
+}
+"""
+
+bib_b = r"""@book{Proc2000,
+	editor = {Ackerly, David},
+	title = {Proceedings},
+	publisher = {Elsevier},
+	year = 2000
+}
+@article{Hidden2001,
+	author = {Hidden, Ann},
+	title = {Literals},
+	journal = jecol,
+	year = 2001
+}
+"""
+
+doc = """Intro [Schwilk1999]_ and [Isaac2000,Schwilk1999]_ text.
+A footnote [#]_ and [1]_ and brackets [not a cite] here.
+Inline ``[Hidden2001]_`` literal and `single` ticks.
+See [Isaac2000]_ again.
+
+.. [#] note
+"""
+
+#cites next to (and inside) inline literals, and brackets split across lines
+doc_literals = """``[Schwilk1999]_`` and ``code`` [Isaac2000]_``x``
+Ticks ` and `` [Hidden2001, Isaac2000]_ `` and [not
+a cite] and [#]_ end [Schwilk1999]_"""
+
+
+def write_file(path, text):
+	"""Write `text` to `path`, making sure its modification time changes."""
+	old = os.stat(path).st_mtime_ns if os.path.exists(path) else 0
+	with open(path, 'w') as fh:
+		fh.write(text)
+	mtime = max(os.stat(path).st_mtime_ns, old + 1000)
+	os.utime(path, ns=(mtime, mtime))
+
+
+class TestWatch(unittest.TestCase):
+
+	def setUp(self):
+		self.tmpdir = tempfile.mkdtemp()
+		self.infile = os.path.join(self.tmpdir, 'doc.rst')
+		self.outfile = os.path.join(self.tmpdir, 'refs.rst')
+		self.bibfile_names = [os.path.join(self.tmpdir, 'a.bib'), os.path.join(self.tmpdir, 'b.bib')]
+		write_file(self.infile, doc)
+		write_file(self.bibfile_names[0], bib_a)
+		write_file(self.bibfile_names[1], bib_b)
+		self.style = bibstyles.from_name('default')
+		self.parser = bib4txt.make_cite_parser(ebnf_sp.cites_rest)
+
+	def tearDown(self):
+		shutil.rmtree(self.tmpdir)
+
+	def expected(self, citations_only=True):
+		with open(self.infile) as fh:
+			src = fh.read()
+		return bib4txt.make_text_output(src, self.parser,
+			bib4txt.parse_bibfiles(self.bibfile_names), self.style, citations_only)
+
+	def output(self):
+		with open(self.outfile) as fh:
+			return fh.read()
+
+	def run_watch(self, renderer, edits, bibfiles=None):
+		"""Run watch mode, applying one of `edits` (a callable) after each render.
+		Return list of str, the debug messages logged.
+		"""
+		edits = list(edits)
+		render = renderer.render
+		self.renders = []
+		def render_then_edit(src):
+			result = render(src)
+			self.renders.append(result)
+			if edits:
+				edits.pop(0)()
+			return result
+		renderer.render = render_then_edit
+		with self.assertLogs('bibstuff_logger', level='DEBUG') as logs:
+			bib4txt.watch(self.infile, self.outfile, self.bibfile_names, renderer,
+				interval=0, max_renders=len(edits) + 1, bibfiles=bibfiles)
+		return [record.getMessage() for record in logs.records]
+
+	def parsed(self, messages):
+		"""Return list of str, the names of the .bib files parsed (in order)."""
+		return [os.path.basename(m.split()[-1]) for m in messages if m.startswith('watch: parsing')]
+
+	def make_renderer(self, citations_only=True):
+		return bib4txt.IncrementalRenderer(bib4txt.parse_bibfiles(self.bibfile_names),
+			self.parser, self.style, citations_only)
+
+	def test_document_edit(self):
+		renderer = self.make_renderer(citations_only=False)
+		def edit():
+			write_file(self.infile, doc.replace('Intro', 'Preface [Hidden2001]_'))
+		messages = self.run_watch(renderer, [edit])
+		self.assertEqual(self.renders[0], bib4txt.make_text_output(doc, self.parser,
+			bib4txt.parse_bibfiles(self.bibfile_names), self.style, False))
+		self.assertEqual(self.output(), self.expected(citations_only=False))
+		#Hidden2001 is cited first now, so every citation rank changes
+		self.assertIn('watch: formatting reference Hidden2001', messages)
+		#the .bib files are parsed once, when watching starts
+		self.assertEqual(self.parsed(messages), ['a.bib', 'b.bib'])
+
+	def test_unchanged_cites_reused(self):
+		renderer = self.make_renderer(citations_only=False)
+		def edit():
+			write_file(self.infile, doc + 'More text, and [Schwilk1999]_ again.\n')
+		messages = self.run_watch(renderer, [edit])
+		self.assertEqual(self.output(), self.expected(citations_only=False))
+		formatted = [m for m in messages if m.startswith('watch: formatting')]
+		#each reference and each distinct inline cite is formatted once
+		self.assertEqual(len([m for m in formatted if 'reference' in m]), 3)
+		self.assertEqual(len([m for m in formatted if 'inline cite' in m]), 4)
+
+	def test_bib_edit(self):
+		"""Output follows a changed entry, even in a crossref from an unchanged file"""
+		renderer = self.make_renderer()
+		edits = [
+			lambda: write_file(self.bibfile_names[1], bib_b.replace('Literals', 'Strings')),
+			lambda: write_file(self.bibfile_names[1], bib_b.replace('Literals', 'Strings').replace('Elsevier', 'Springer')),
+			]
+		messages = self.run_watch(renderer, edits)
+		output = self.output()
+		self.assertIn('Springer', output)
+		self.assertEqual(output, self.expected())
+		#only the changed file is parsed again
+		self.assertEqual(self.parsed(messages), ['a.bib', 'b.bib', 'b.bib', 'b.bib'])
+		#only the entries that changed (Isaac2000 through its crossref) are formatted again
+		formatted = [m for m in messages if m.startswith('watch: formatting reference')]
+		self.assertEqual(formatted.count('watch: formatting reference Isaac2000'), 2)
+		self.assertEqual(formatted.count('watch: formatting reference Schwilk1999'), 1)
+		self.assertEqual(formatted.count('watch: formatting reference Hidden2001'), 2)
+
+	def test_bib_edit_before_watch(self):
+		"""A .bib file changed after the renderer was made is not missed"""
+		renderer = self.make_renderer()
+		write_file(self.bibfile_names[1], bib_b.replace('Elsevier', 'Springer'))
+		messages = self.run_watch(renderer, [])
+		self.assertIn('Springer', self.output())
+		self.assertEqual(self.output(), self.expected())
+		self.assertEqual(self.parsed(messages), ['a.bib', 'b.bib'])
+
+	def test_seeded_bibfiles(self):
+		"""The .bib files parsed before watching are not parsed again"""
+		bibfiles = bib4txt._WatchedBibfiles(self.bibfile_names)
+		bibfiles.update()
+		renderer = bib4txt.IncrementalRenderer(bibfiles.database, self.parser, self.style)
+		def edit():
+			write_file(self.bibfile_names[1], bib_b.replace('Elsevier', 'Springer'))
+		messages = self.run_watch(renderer, [edit], bibfiles=bibfiles)
+		self.assertIn('Springer', self.output())
+		self.assertEqual(self.output(), self.expected())
+		self.assertEqual(self.parsed(messages), ['b.bib'])
+
+	def test_macro_edit(self):
+		"""Later files are parsed again, with the new macros"""
+		renderer = self.make_renderer()
+		def edit():
+			write_file(self.bibfile_names[0], bib_a.replace('Journal of Ecology', 'Ecology Letters'))
+		messages = self.run_watch(renderer, [edit])
+		output = self.output()
+		self.assertEqual(output.count('Ecology Letters'), 2)  #Hidden2001, in b.bib, uses the macro
+		self.assertEqual(output, self.expected())
+		self.assertEqual(self.parsed(messages), ['a.bib', 'b.bib'] * 2)
+
+
+class TestStream(unittest.TestCase):
+
+	@classmethod
+	def setUpClass(cls):
+		from bibstuff import bibfile, bibgrammar
+		cls.parsed_bibfile = bibfile.BibFile()
+		bibgrammar.Parse(bib_a + bib_b, cls.parsed_bibfile)
+		cls.style = bibstyles.from_name('default')
+
+	def test_stable_prefix_length(self):
+		self.assertEqual(bib4txt._stable_prefix_length('abc'), 2)
+		self.assertEqual(bib4txt._stable_prefix_length('ab [c'), 3)
+		self.assertEqual(bib4txt._stable_prefix_length('ab [c]'), 3)
+		self.assertEqual(bib4txt._stable_prefix_length('ab [c]_ d'), 8)
+		self.assertEqual(bib4txt._stable_prefix_length('a ``b', inline_literals=True), 2)
+		self.assertEqual(bib4txt._stable_prefix_length('a ``b`', inline_literals=True), 2)
+		#the last double backquote is held back (it might open a literal)
+		self.assertEqual(bib4txt._stable_prefix_length('a ``b`` c', inline_literals=True), 5)
+		self.assertEqual(bib4txt._stable_prefix_length('a ``b`` cde', inline_literals=False), 10)
+
+	def test_same_as_text_output(self):
+		"""Streamed output equals `make_text_output`, for any chunk size"""
+		grammars = [
+			(ebnf_sp.cites_rest, False, False),
+			(ebnf_sp.cites_rest, False, True),  #simpleparse
+			(ebnf_sp.cites_xp, True, False),
+			(ebnf_sp.cites_xp, True, True),
+			]
+		for ebnf_dec, inline_literals, use_simpleparse in grammars:
+			parser = bib4txt.make_cite_parser(ebnf_dec, use_simpleparse)
+			for src in (doc, doc_literals):
+				for citations_only in (True, False):
+					expected = bib4txt.make_text_output(src, parser, self.parsed_bibfile,
+						self.style, citations_only)
+					for chunk_size in (1, 2, 7):
+						out = io.StringIO()
+						bib4txt.stream_text_output(io.StringIO(src), out, parser,
+							self.parsed_bibfile, self.style, citations_only,
+							chunk_size=chunk_size, inline_literals=inline_literals)
+						self.assertEqual(out.getvalue(), expected,
+							(ebnf_dec is ebnf_sp.cites_xp, use_simpleparse, src[:10], chunk_size))
+
+
+class TestBatch(unittest.TestCase):
+
+	def setUp(self):
+		from bibstuff import bibfile, bibgrammar
+		self.tmpdir = tempfile.mkdtemp()
+		self.outdir = os.path.join(self.tmpdir, 'out')
+		self.parsed_bibfile = bibfile.BibFile()
+		bibgrammar.Parse(bib_a + bib_b, self.parsed_bibfile)
+		self.docs = [doc, doc_literals, 'No cites.\n', doc.replace('Intro', 'Preface [Hidden2001]_')]
+		self.infiles = []
+		for idx, src in enumerate(self.docs):
+			infile = os.path.join(self.tmpdir, 'doc%d.rst' % idx)
+			write_file(infile, src)
+			self.infiles.append(infile)
+
+	def tearDown(self):
+		shutil.rmtree(self.tmpdir)
+
+	def check_outputs(self, outfiles, citations_only):
+		parser = bib4txt.make_cite_parser(ebnf_sp.cites_rest)
+		style = bibstyles.from_name('default')
+		self.assertEqual(outfiles, [os.path.join(self.outdir, os.path.basename(infile))
+			for infile in self.infiles])
+		for src, outfile in zip(self.docs, outfiles):
+			with open(outfile, 'rb') as fh:
+				output = fh.read()
+			expected = bib4txt.make_text_output(src, parser, self.parsed_bibfile, style, citations_only)
+			self.assertEqual(output, expected.encode('utf8'))
+
+	def test_same_as_text_output(self):
+		"""Each output equals `make_text_output`, for any number of jobs"""
+		for jobs in (1, 2):
+			for citations_only in (True, False):
+				outfiles = bib4txt.make_batch_output(self.infiles, self.outdir, self.parsed_bibfile,
+					'default', ebnf_sp.cites_rest, citations_only, jobs=jobs, overwrite=True)
+				self.check_outputs(outfiles, citations_only)
+
+	def test_overwrite(self):
+		"""Existing output files are only replaced with `overwrite`"""
+		os.makedirs(self.outdir)
+		existing = os.path.join(self.outdir, 'doc1.rst')
+		write_file(existing, 'old output')
+		with self.assertRaises(ValueError):
+			bib4txt.make_batch_output(self.infiles, self.outdir, self.parsed_bibfile,
+				'default', ebnf_sp.cites_rest, jobs=1)
+		self.assertEqual(os.listdir(self.outdir), ['doc1.rst'])  #nothing was written
+		with open(existing) as fh:
+			self.assertEqual(fh.read(), 'old output')
+		outfiles = bib4txt.make_batch_output(self.infiles, self.outdir, self.parsed_bibfile,
+			'default', ebnf_sp.cites_rest, jobs=2, overwrite=True)
+		self.check_outputs(outfiles, True)
+
+	def test_distinct_names(self):
+		with self.assertRaises(ValueError):
+			bib4txt.make_batch_output([self.infiles[0], self.infiles[0]], self.outdir,
+				self.parsed_bibfile, 'default', ebnf_sp.cites_rest, jobs=1)
+
+
+if __name__ == '__main__':
+	unittest.main()
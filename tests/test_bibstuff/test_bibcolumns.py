@@ -0,0 +1,83 @@
+#!/usr/bin/env python
+"""
+Provides tests for the bibstuff.bibcolumns module
+
+:author: Dylan Schwilk
+:contact: http://www.schwilk.org
+:license: MIT (see `license.txt`_)
+:date: 2026-10-19
+
+.. _`license.txt`: ../../license.txt
+
+"""
+
+import unittest
+
+try:
+	import numpy
+except ImportError:
+	numpy = None
+
+from bibstuff import bibcolumns, bibfile, bibgrammar
+
+test_bib = r"""@article{Isaac:2010,
+	author = {Isaac, Alan G. and Dylan Schwilk},
+	title = {Ünïcode},
+	year = 2010,
+	volume = {12},
+	journal = {Testing quarterly}
+}
+@book{Schwilk:2011,
+	author = {Schwilk, Dylan},
+	title = {Flammability},
+	year = {circa 1999}
+}
+@article{Last:2012,
+	author = {Last, First AND Isaac, Alan G.},
+	title = {Last},
+	year = {forthcoming},
+	journal = {Testing quarterly}
+}"""
+
+
+@unittest.skipIf(numpy is None, "numpy is not installed")
+class TestColumns(unittest.TestCase):
+	"""Tests for `to_columns`"""
+
+	def setUp(self):
+		self.bfile = bibfile.BibFile()
+		bibgrammar.Parse(test_bib, self.bfile)
+		self.columns = bibcolumns.to_columns(self.bfile)
+
+	def test_values(self):
+		"""Each column gives back the entry values"""
+		columns = self.columns
+		self.assertEqual(columns.nrows, 3)
+		for i, entry in enumerate(self.bfile.entries):
+			for field in ('citekey', 'entry_type', 'journal', 'title'):
+				self.assertEqual(columns[field][i], entry[field])
+		self.assertEqual([columns['year'][i] for i in range(3)], [2010, 1999, None])
+		self.assertEqual(columns['volume'].valid.tolist(), [True, False, False])
+		self.assertEqual(columns['author'][2], ['Last, First', 'Isaac, Alan G.'])
+		self.assertEqual(columns['journal'].codes.tolist(), [0, -1, 0])
+
+	def test_group_by(self):
+		"""Counts and filters"""
+		columns = self.columns
+		self.assertEqual(columns['entry_type'].counts(), {'article': 2, 'book': 1})
+		self.assertEqual(columns['author'].counts()['Isaac, Alan G.'], 2)
+		self.assertEqual(columns['author'].rows().tolist(), [0, 0, 1, 2, 2])
+		articles = columns.take(columns['entry_type'].isin(['article']))
+		self.assertEqual(articles.nrows, 2)
+		self.assertEqual(articles['title'][1], 'Last')
+
+	def test_take(self):
+		"""Rows can be picked in any order"""
+		picked = self.columns.take(numpy.array([2, 0, 2]))
+		self.assertEqual([picked['title'][i] for i in range(3)], ['Last', 'Ünïcode', 'Last'])
+		self.assertEqual(picked['author'][1], ['Isaac, Alan G.', 'Dylan Schwilk'])
+		self.assertEqual(picked['year'][1], 2010)
+
+
+if __name__ == '__main__':
+	unittest.main()
@@ -0,0 +1,144 @@
+#!/usr/bin/env python
+"""
+Provides tests for the bibstuff.bibdb module
+
+:author: Dylan Schwilk
+:contact: http://www.schwilk.org
+:license: MIT (see `license.txt`_)
+:date: 2026-10-19
+
+.. _`license.txt`: ../../license.txt
+
+"""
+
+import io
+import os
+import shutil
+import tempfile
+import unittest
+
+from bibstuff import bibdb, bibfile, bibgrammar
+
+test_bib = r"""@string{tq = {Testing quarterly}}
+@article{Isaac:2010,
+	author = {Isaac, Alan G.},
+	title = {Fire and evolution},
+	year = 2010,
+	month = jun,
+	journal = tq
+}
+@inproceedings{Schwilk:2011,
+	author = {Schwilk, Dylan},
+	title = {Flammability},
+	crossref = {Proc:2011}
+}
+@proceedings{Proc:2011,
+	title = {Proceedings of the fire workshop},
+	year = 2011
+}"""
+
+
+class TestSQLiteBibFile(unittest.TestCase):
+	"""Tests for `SQLiteBibFile`"""
+
+	def setUp(self):
+		self.tmpdir = tempfile.mkdtemp()
+		self.path = os.path.join(self.tmpdir, 'refs.sqlite')
+		self.bfile = bibfile.BibFile()
+		bibgrammar.Parse(test_bib, self.bfile)
+		with bibdb.SQLiteBibFile(self.path) as db:
+			bibgrammar.Parse(test_bib, db)
+		self.db = bibdb.SQLiteBibFile(self.path)
+
+	def tearDown(self):
+		self.db.close()
+		shutil.rmtree(self.tmpdir)
+
+	def test_round_trip(self):
+		"""Stored entries and macros match a parsed BibFile"""
+		self.assertTrue(bibdb.is_database(self.path))
+		self.assertEqual(len(self.db), 3)
+		self.assertEqual(list(self.db.entries), self.bfile.entries)
+		self.assertEqual([e.fields for e in self.db.entries], [e.fields for e in self.bfile.entries])
+		self.assertEqual(self.db.entries[-1].citekey, 'Proc:2011')
+		self.assertEqual(self.db.get_macros(), {'tq': 'Testing quarterly'})
+		expected, result = io.StringIO(), io.StringIO()
+		self.bfile.write(expected)
+		self.db.write(result)
+		self.assertEqual(result.getvalue(), expected.getvalue())
+
+	def test_get_entrylist(self):
+		"""Missing keys are discarded or None; crossrefs are attached"""
+		entries = self.db.get_entrylist(['Schwilk:2011', 'missing'])
+		self.assertEqual([e.citekey for e in entries], ['Schwilk:2011'])
+		self.assertEqual(entries[0]['year'], '2011')
+		self.assertEqual(self.db.get_entrylist(['missing', 'Isaac:2010'], discard=False)[0], None)
+		self.assertIsNone(self.db.get_entry('missing'))
+
+	def test_search_entries(self):
+		"""Regular expression searches match an in-memory BibFile"""
+		for pattern, field in [('fire', ''), ('fire', 'title'), ('2011', 'year'),
+				('june', 'month'), ('isaac', 'citekey'), ('article', 'entry_type')]:
+			self.assertEqual(self.db.search_entries(pattern, field=field),
+				self.bfile.search_entries(pattern, field=field), (pattern, field))
+
+	def test_search_loads_matches(self):
+		"""Searches are done in SQL: only matching entries are loaded"""
+		loaded = []
+		load_entries = self.db._load_entries
+		def record(ids):
+			loaded.extend(ids)
+			return load_entries(ids)
+		self.db._load_entries = record
+		for pattern, field, expected in [('june', 'month', ['Isaac:2010']), ('june', '', ['Isaac:2010']),
+				('^jun$', '', []), ('schwilk', 'citekey', ['Schwilk:2011']),
+				('^proc', 'entry_type', ['Proc:2011']), ('proc', 'crossref', ['Schwilk:2011'])]:
+			del loaded[:]
+			result = self.db.search_entries(pattern, field=field)
+			self.assertEqual([e.citekey for e in result], expected, (pattern, field))
+			self.assertEqual(len(loaded), len(expected))
+			self.assertEqual(result, self.bfile.search_entries(pattern, field=field))
+
+	def test_search_text(self):
+		"""Full-text search, optionally in one field"""
+		self.assertEqual([e.citekey for e in self.db.search_text('fire')],
+			['Isaac:2010', 'Proc:2011'])
+		self.assertEqual([e.citekey for e in self.db.search_text('fire', field='journal')], [])
+		self.assertEqual([e.citekey for e in self.db.search_text('flamm*')], ['Schwilk:2011'])
+
+	def test_add_remove(self):
+		"""Duplicates are skipped unless replaced; entries can be removed"""
+		entry = self.db.get_entry('Isaac:2010')
+		entry['title'] = 'Replaced'
+		self.assertFalse(self.db.add_entry(entry))
+		self.assertEqual(self.db.get_entry('Isaac:2010')['title'], 'Fire and evolution')
+		self.assertTrue(self.db.add_entry(entry, replace=True))
+		self.assertEqual(self.db.get_entry('Isaac:2010')['title'], 'Replaced')
+		self.assertEqual([e.citekey for e in self.db.search_text('evolution')], [])
+		self.assertTrue(self.db.remove_entry('Isaac:2010'))
+		self.assertFalse(self.db.remove_entry('Isaac:2010'))
+		self.assertEqual(len(self.db), 2)
+
+	def test_entries_sequence(self):
+		"""Indexes and slices (with any step) match an in-memory BibFile"""
+		entries, expected = self.db.entries, self.bfile.entries
+		for index in range(-3, 3):
+			self.assertEqual(entries[index], expected[index])
+		for index in (3, -4):
+			with self.assertRaises(IndexError):
+				entries[index]
+		for index in [slice(None), slice(1, None), slice(None, None, -1), slice(-1, 0, -2),
+				slice(None, None, 2), slice(5, 10), slice(2, 0)]:
+			self.assertEqual(entries[index], expected[index], index)
+		#the cached order follows added and removed entries
+		self.assertTrue(self.db.remove_entry(expected[0].citekey))
+		entry = bibfile.BibEntry()
+		entry.entry_type, entry.citekey = 'misc', 'New:2012'
+		entry['year'] = '2012'
+		self.assertTrue(self.db.add_entry(entry))
+		self.assertEqual([e.citekey for e in self.db.entries[::-1]],
+			['New:2012'] + [e.citekey for e in expected[:0:-1]])
+
+
+if __name__ == '__main__':
+	unittest.main()
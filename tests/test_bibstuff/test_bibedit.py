@@ -0,0 +1,118 @@
+#!/usr/bin/env python
+"""
+Provides tests for the bibstuff.bibedit module
+
+:author: Dylan Schwilk
+:contact: http://www.schwilk.org
+:license: MIT (see `license.txt`_)
+:date: 2026-10-19
+
+.. _`license.txt`: ../../license.txt
+
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from bibstuff import bibedit, bibfile, bibgrammar
+
+test_bib = r"""% keep this comment
+@string{tq = {Testing quarterly}}
+
+@article{Isaac:2010,
+	author = {Isaac, Alan G.},
+	title = {Ünïcode test},
+	year = 2010,   journal = tq
+}
+
+@book{Schwilk:2011,
+  title={Flammability}, year=2011}
+
+@misc{Last:2012,
+  title = {Last}
+}
+"""
+
+
+class TestBibEditSession(unittest.TestCase):
+	"""Tests for `BibEditSession`"""
+
+	def setUp(self):
+		self.tmpdir = tempfile.mkdtemp()
+		self.path = os.path.join(self.tmpdir, 'refs.bib')
+		with open(self.path, 'w', encoding='utf-8') as fh:
+			fh.write(test_bib)
+
+	def tearDown(self):
+		shutil.rmtree(self.tmpdir)
+
+	def read(self):
+		with open(self.path, encoding='utf-8') as fh:
+			return fh.read()
+
+	def parse(self):
+		bfile = bibfile.BibFile()
+		bibgrammar.Parse(self.read(), bfile)
+		return bfile.entries
+
+	def test_unchanged(self):
+		"""Saving without edits reproduces the file"""
+		session = bibedit.BibEditSession(self.path)
+		self.assertFalse(session.is_dirty())
+		session.save()
+		self.assertEqual(self.read(), test_bib)
+
+	def test_edit(self):
+		"""Only edited entries are rewritten; the rest is copied verbatim"""
+		with bibedit.BibEditSession(self.path) as session:
+			session.set_field('Schwilk:2011', 'note', 'edited')
+		text = self.read()
+		before, after = test_bib.split('@book')[0], test_bib.split('2011}')[1]
+		self.assertTrue(text.startswith(before))
+		self.assertTrue(text.endswith(after))
+		self.assertEqual(self.parse(), session.entries)
+		self.assertEqual(self.parse()[1]['note'], 'edited')
+
+	def test_add_remove(self):
+		"""Removed entries are dropped, added entries are appended, and
+		the session can save again"""
+		session = bibedit.BibEditSession(self.path)
+		self.assertTrue(session.remove_entry('Isaac:2010'))
+		entry = bibfile.BibEntry()
+		entry.entry_type, entry.citekey = 'misc', 'New:2013'
+		entry['title'] = 'New'
+		session.add_entry(entry)
+		session.save()
+		self.assertEqual([e.citekey for e in self.parse()], ['Schwilk:2011', 'Last:2012', 'New:2013'])
+		self.assertIn('% keep this comment\n@string', self.read())
+		session.set_field('New:2013', 'year', '2013')
+		session.set_field('Last:2012', 'year', '2012')
+		session.save()
+		self.assertEqual(self.parse(), session.entries)
+		with open(self.path, 'rb') as fh:
+			data = fh.read()
+		for entry, start, stop in session._spans:
+			self.assertEqual(data[start:start + 1] + data[stop - 1:stop], b'@}')
+
+	def test_save_as(self):
+		"""Saving to another path leaves the original file alone"""
+		other = os.path.join(self.tmpdir, 'other.bib')
+		session = bibedit.BibEditSession(self.path)
+		session.set_field('Last:2012', 'year', '2012')
+		session.save(other)
+		self.assertEqual(self.read(), test_bib)
+		self.assertIn('2012', open(other, encoding='utf-8').read())
+
+	def test_changed_on_disk(self):
+		"""Refuse to overwrite a file that changed since it was read"""
+		session = bibedit.BibEditSession(self.path)
+		with open(self.path, 'a') as fh:
+			fh.write('\n')
+		session.set_field('Last:2012', 'year', '2012')
+		self.assertRaises(RuntimeError, session.save)
+
+
+if __name__ == '__main__':
+	unittest.main()
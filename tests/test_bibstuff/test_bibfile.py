@@ -87,6 +87,40 @@ class TestBibFile(unittest.TestCase):
 		self.assertEqual(ck, "isaac.schwilk-2010")
 
 
+	def test_pickle_bibfile(self):
+		"""Parsed entries survive pickling (e.g., for worker processes)"""
+		import pickle
+		bfile = pickle.loads(pickle.dumps(self.bfile))
+		self.assertEqual(bfile.entries, self.bfile.entries)
+		self.assertEqual(bfile.entries[0].fields, self.bfile.entries[0].fields)
+
+	def test_write(self):
+		"""BibFile.write matches the entries' repr and reparses to the same entries"""
+		import io
+		out = io.StringIO()
+		self.bfile.write(out, buffer_size=1)
+		self.assertEqual(out.getvalue(), "\n".join(repr(entry) for entry in self.bfile.entries))
+		bfile = bibfile.BibFile()
+		bibgrammar.Parse(out.getvalue(), bfile)
+		self.assertEqual(bfile.entries, self.bfile.entries)
+
+	def test_write_align(self):
+		"""Field names are padded to the alignment width"""
+		entry = self.bfile.entries[0]
+		self.assertIn("\n  title   = {Von test}", entry.to_bibtex())
+		self.assertIn("\n  title = {Von test}", entry.to_bibtex(align=0))
+		self.assertIn("\n  year         = 2010", entry.to_bibtex(align=12))
+
+	def test_compact_entry(self):
+		"""Entries survive conversion to and from the compact form"""
+		for entry in self.bfile.entries:
+			data = bibfile.entry_to_compact(entry)
+			self.assertIsInstance(data, tuple)
+			rebuilt = bibfile.entry_from_compact(data)
+			self.assertEqual(rebuilt, entry)
+			self.assertEqual(rebuilt.fields, entry.fields)
+			self.assertEqual((rebuilt.citekey, rebuilt.entry_type), (entry.citekey, entry.entry_type))
+
 
 class TestBibEntry(unittest.TestCase):
 	"""Tests for BibEntry class in `bibfile.py`"""
@@ -125,5 +159,33 @@ class TestBibEntry(unittest.TestCase):
 		ck = self.bfile.entries[2].make_citekey(style= self.label_style)
 		self.assertEqual(ck, "Schwilk+Isaac+etal-2012")
 
+	def test_make_citation_key_suffix(self):
+		"""Duplicate citation keys get suffixes b, c, ..., z, aa, bb, ..."""
+		entry = self.bfile.entries[1]
+		used = bibfile.CitekeyAllocator()
+		keys = [entry.make_citekey(used, style=self.label_style) for i in range(28)]
+		self.assertEqual(keys[:3], ["Isaac+Schwilk-2010", "Isaac+Schwilk-2010b", "Isaac+Schwilk-2010c"])
+		self.assertEqual(keys[-3:], ["Isaac+Schwilk-2010z", "Isaac+Schwilk-2010aa", "Isaac+Schwilk-2010bb"])
+		self.assertEqual(len(used), 28)
+		#a list of used keys gives the same key, without recording it
+		ck = entry.make_citekey(["Isaac+Schwilk-2010", "Isaac+Schwilk-2010c"], style=self.label_style)
+		self.assertEqual(ck, "Isaac+Schwilk-2010b")
+		used.add("Isaac+Schwilk-2010dd")
+		used.add("Isaac+Schwilk-2010cc")
+		self.assertEqual(entry.make_citekey(used, style=self.label_style), "Isaac+Schwilk-2010ee")
+
+	def test_relabel(self):
+		"""Relabelling in worker processes matches sequential labelling"""
+		expected = []
+		used = bibfile.CitekeyAllocator()
+		entries = self.bfile.entries * 3
+		for entry in entries:
+			expected.append(entry.make_citekey(used, style=self.label_style))
+		for jobs in (1, 2):
+			bfile = bibfile.BibFile()
+			bfile.entries = [bibfile.entry_from_compact(bibfile.entry_to_compact(e)) for e in entries]
+			self.assertEqual(bfile.relabel(self.label_style, jobs=jobs, shard_size=2), expected)
+			self.assertEqual([e.citekey for e in bfile.entries], expected)
+
 if __name__ == '__main__':
 	unittest.main() 
@@ -0,0 +1,119 @@
+#!/usr/bin/env python
+"""
+Provides tests for streaming parsing (bibgrammar.iter_entries)
+and the bibstuff.bibjson module
+
+:author: Dylan Schwilk
+:contact: http://www.schwilk.org
+:license: MIT (see `license.txt`_)
+:date: 2026-10-19
+
+.. _`license.txt`: ../../license.txt
+
+"""
+
+import io
+import json
+import unittest
+
+from bibstuff import bibfile, bibgrammar, bibjson
+
+test_bib = r"""% a comment with @misc{no, title = {entry}}
+@string{tq = {Testing quarterly}}
+@article{Isaac:2010,
+	title = {Ünïcode},
+	author = {Isaac, Alan G. and van der Berg, Hans},
+	year = 2010, month = jun,
+	journal = tq,
+	pages = {1--10}
+}
+junk text @ junk
+@inproceedings(Schwilk:2011,
+	author = {Schwilk, Dylan},
+	title = {Flammability},
+	crossref = {Proc:2011})
+@proceedings{Proc:2011,
+	title = {Proceedings of the fire workshop},
+	booktitle = {Proceedings of the fire workshop},
+	year = 2011
+}
+"""
+
+
+class TestIterEntries(unittest.TestCase):
+	"""Tests for `bibgrammar.iter_entries`"""
+
+	def test_same_entries(self):
+		"""Streamed entries match a full parse, for any chunk size"""
+		bfile = bibfile.BibFile()
+		bibgrammar.Parse(test_bib, bfile)
+		self.assertEqual([e.citekey for e in bfile.entries], ['Isaac:2010', 'Schwilk:2011', 'Proc:2011'])
+		for chunk_size in (1, 7, 1 << 16):
+			entries = list(bibgrammar.iter_entries(io.StringIO(test_bib), chunk_size=chunk_size))
+			self.assertEqual(entries, bfile.entries)
+			self.assertEqual([e.fields for e in entries], [e.fields for e in bfile.entries])
+
+	def test_quoted_delimiters(self):
+		"""Closing delimiters in quoted values and comments do not end an entry"""
+		src = r"""@article(Key1, title = "A (b) c)", year=2000)
+@article(Key2,
+	% a comment) with "a quote
+	title = "x)", note = "d {e "f)} g")
+@article{Key3, title = "a{"}b"}
+"""
+		bfile = bibfile.BibFile()
+		bibgrammar.Parse(src, bfile)
+		self.assertEqual([e.citekey for e in bfile.entries], ['Key1', 'Key2', 'Key3'])
+		self.assertEqual(bfile.entries[0]['title'], 'A (b) c)')
+		for chunk_size in (1, 7, 1 << 16):
+			entries = list(bibgrammar.iter_entries(io.StringIO(src), chunk_size=chunk_size))
+			self.assertEqual(entries, bfile.entries)
+
+	def test_macros(self):
+		"""Macros are kept in the processor; its entries are emptied"""
+		bfile = bibfile.BibFile()
+		for entry in bibgrammar.iter_entries(io.StringIO(test_bib), bfile):
+			self.assertEqual(bfile.entries, [])
+		self.assertEqual(bfile._macroMap, {'tq': 'Testing quarterly'})
+
+
+class TestJSON(unittest.TestCase):
+	"""Tests for NDJSON and CSL-JSON conversion"""
+
+	def setUp(self):
+		self.entries = list(bibgrammar.iter_entries(io.StringIO(test_bib)))
+
+	def test_round_trip(self):
+		"""NDJSON keeps field order and crossrefs"""
+		out = io.StringIO()
+		self.assertEqual(bibjson.write_ndjson(self.entries, out), 3)
+		lines = out.getvalue().splitlines()
+		self.assertEqual(list(json.loads(lines[1])),
+			['entry_type', 'citekey', 'author', 'title', 'crossref'])
+		entries = list(bibjson.iter_ndjson(io.StringIO(out.getvalue() + '\n')))
+		self.assertEqual(entries, self.entries)
+		self.assertEqual([e.fields for e in entries], [e.fields for e in self.entries])
+		#an attached crossref is written as its citekey
+		bfile = bibfile.BibFile()
+		bfile.entries = entries
+		schwilk = bfile.get_entrylist(['Schwilk:2011'])[0]
+		self.assertEqual(bibjson.entry_to_json(schwilk)['crossref'], 'Proc:2011')
+
+	def test_csl(self):
+		"""CSL-JSON items"""
+		item = bibjson.entry_to_csl(self.entries[0])
+		self.assertEqual(item['id'], 'Isaac:2010')
+		self.assertEqual(item['type'], 'article-journal')
+		self.assertEqual(item['container-title'], 'Testing quarterly')
+		self.assertEqual(item['page'], '1-10')
+		self.assertEqual(item['issued'], {'date-parts': [[2010, 6]]})
+		self.assertEqual(item['author'][1],
+			{'given': 'Hans', 'non-dropping-particle': 'van der', 'family': 'Berg'})
+		out = io.StringIO()
+		bibjson.write_csl_array(self.entries, out)
+		items = json.loads(out.getvalue())
+		self.assertEqual([item['type'] for item in items], ['article-journal', 'paper-conference', 'book'])
+
+
+if __name__ == '__main__':
+	unittest.main()
@@ -0,0 +1,75 @@
+#!/usr/bin/env python
+"""
+Provides tests for the bibstuff.bibnorm module
+
+:author: Dylan Schwilk
+:contact: http://www.schwilk.org
+:license: MIT (see `license.txt`_)
+:date: 2026-10-19
+
+.. _`license.txt`: ../../license.txt
+
+"""
+
+import unittest
+
+from bibstuff import bibfile, bibnorm
+
+
+def make_entry(citekey, **fields):
+	entry = bibfile.BibEntry()
+	entry.entry_type, entry.citekey = 'article', citekey
+	for name, value in fields.items():
+		entry[name] = value
+	return entry
+
+
+class TestPlainText(unittest.TestCase):
+
+	def test_plain_text(self):
+		self.assertEqual(bibnorm.plain_text(r'M\"{u}ller, {J\"{o}rg}'), 'müller, jörg')
+		self.assertEqual(bibnorm.plain_text('A  {DNA}\n study'), 'a dna study')
+		self.assertEqual(bibnorm.plain_text(r'\emph{In situ} fire'), 'in situ fire')
+		self.assertEqual(bibnorm.plain_text(r"Fran\c{c}ois", casefold=False, ascii=True), 'Francois')
+
+
+class TestFieldNormalizer(unittest.TestCase):
+
+	def test_cache(self):
+		normalizer = bibnorm.FieldNormalizer(max_size=2)
+		first = normalizer(r'Journal of {\"O}kology')
+		self.assertEqual(first, 'journal of ökology')
+		self.assertIs(normalizer(r'Journal of {\"O}kology'), first)
+		self.assertEqual((normalizer.hits, normalizer.misses), (1, 1))
+		normalizer('b')
+		normalizer(r'Journal of {\"O}kology')  #most recently used
+		normalizer('c')  #evicts 'b'
+		self.assertEqual(len(normalizer), 2)
+		normalizer('b')
+		self.assertEqual(normalizer.misses, 4)
+
+	def test_interned(self):
+		normalizer = bibnorm.FieldNormalizer()
+		self.assertIs(normalizer('{Ecology}'), normalizer('ECOLOGY'))
+
+
+class TestNormalizedEntry(unittest.TestCase):
+
+	def test_view(self):
+		entry = make_entry('Mu:2010', author=r'M\"{u}ller, J.', title='The {DNA} Study', year='2010')
+		view = bibnorm.NormalizedEntry(entry)
+		self.assertEqual(view['author'], 'müller, j.')
+		self.assertEqual(view['journal'], '')
+		self.assertEqual(list(view), ['author', 'title', 'year'])
+		self.assertEqual(view.key(('title', 'year')), ('the dna study', '2010'))
+		self.assertEqual(view.citekey, 'Mu:2010')
+		self.assertEqual(entry['author'], r'M\"{u}ller, J.')  #entry unchanged
+
+	def test_ascii_citekey(self):
+		entry = make_entry('x', author=r'M\"{u}ller, J\"{o}rg', year='2010')
+		style = dict(bibfile.BibEntry.citekey_label_style1, ascii_names=True)
+		self.assertEqual(entry.make_citekey([], style=style), 'Muller-2010')
+
+
+if __name__ == '__main__':
+	unittest.main()
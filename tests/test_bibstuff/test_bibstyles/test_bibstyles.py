@@ -92,6 +92,143 @@ class TestBibEntryFormatter(unittest.TestCase):
 		correct = "van Baer Wilgen, jr, Edward Charles. (1910) A vljf test. *Testing quarterly* 1, 21--30.  "
 		self.assertEqual(res, correct)
 
+	def test_compiled_type_templates(self):
+		"""Compiled templates give the same result as %-formatting"""
+		test_entry = self.tbib.entries[0]
+		for template in self.default_citation_template.values():
+			if isinstance(template, str) and '%(' in template:
+				formatter = bibstyles.shared.compile_type_template(template)
+				self.assertEqual(formatter(test_entry), template % test_entry)
+		self.assertIsNone(bibstyles.shared.compile_type_template('%(year)d'))
+
+	def test_default_post_processor(self):
+		"""The post processor matches the original chain of substitutions"""
+		import re
+		def chain(s):
+			s = re.sub(r"\s*$\s*", ' ', s, flags=re.MULTILINE)
+			s = re.sub(r"\\'", '', s)
+			s = re.sub(r'{\\([a-zA-Z])}', r'\1', s)
+			s = re.sub(r'[\\{}]', '', s)
+			return re.sub(r'``', '"', s)
+		post_processor = bibstyles.default_templates.default_post_processor
+		for s in ["A {\\'e}t{\\'{e}} \n ``x``", "`{`a`}`", "\\\\''", "{\\O}ne\n\n", ""]:
+			self.assertEqual(post_processor(s), chain(s))
+
+
+class TestReformatPara(unittest.TestCase):
+	"""Test paragraph wrapping"""
+	para = "The quick  brown fox\njumps over the extraordinarily-long-hyphenated dog."
+
+	def test_wrap_text(self):
+		"""Greedy fill; long words get their own line"""
+		text = " ".join(self.para.split())
+		self.assertEqual(bibstyles.shared.wrap_text(text, 16),
+			["The quick brown", "fox jumps over", "the", "extraordinarily-long-hyphenated", "dog."])
+		self.assertEqual(bibstyles.shared.wrap_text("", 16), [])
+		self.assertEqual(bibstyles.shared.wrap_text("a b", 0), ["a", "b"])
+
+	def test_justification(self):
+		"""LEFT, RIGHT and CENTER justification, with indent"""
+		reformat_para = bibstyles.shared.reformat_para
+		self.assertEqual(reformat_para("a bb ccc", left=2, right=8),
+			"  a bb\n  ccc")
+		self.assertEqual(reformat_para("a bb ccc", left=2, right=8, just="RIGHT"),
+			"    a bb\n     ccc")
+		self.assertEqual(reformat_para("a bb ccc", left=2, right=8, just="CENTER"),
+			"   a bb \n   ccc  ")
+		self.assertEqual(reformat_para("", left=2), "")
+
+	def test_batch(self):
+		"""reformat_paras formats each paragraph like reformat_para"""
+		paras = [self.para, "", "one", self.para.upper()]
+		for just in ("LEFT", "RIGHT", "CENTER"):
+			self.assertEqual(bibstyles.shared.reformat_paras(paras, left=3, right=20, just=just),
+				[bibstyles.shared.reformat_para(para, left=3, right=20, just=just) for para in paras])
+
+
+class TestCiteRefProcessor(unittest.TestCase):
+	"""Test citekey tracking and entry resolution for inline citations"""
+	test_bib = r"""@article{Isaac:2010,
+	author = {Isaac, Alan G.},
+	title = {Test},
+	year = 2010,
+	journal = {Testing quarterly}
+}
+@article{Schwilk:2012,
+	author = {Dylan Schwilk},
+	title = {Test},
+	year = 2012,
+	journal = {Testing quarterly}
+}"""
+
+	tbib = bibfile.BibFile()
+	bibgrammar.Parse(test_bib, tbib)
+
+	def test_citekey_set(self):
+		"""CitekeySet keeps insertion order and ranks"""
+		keys = bibstyles.shared.CitekeySet(["b", "a", "b", "c"])
+		self.assertEqual(list(keys), ["b", "a", "c"])
+		self.assertEqual(keys.index("a"), 1)
+		self.assertEqual(keys.rank("c"), 3)
+		self.assertIsNone(keys.rank("z"))
+		self.assertRaises(ValueError, keys.index, "z")
+
+	def test_resolve_entries_cached(self):
+		"""Each citekey is resolved once; missing keys give None"""
+		manager = bibstyles.default.CitationManager([self.tbib])
+		entries = manager.resolve_entries(["Schwilk:2012", "missing", "Isaac:2010"])
+		self.assertEqual(entries[0].citekey, "Schwilk:2012")
+		self.assertIsNone(entries[1])
+		self.assertEqual(entries[2].citekey, "Isaac:2010")
+		self.assertEqual(set(manager._resolved_entries), {"Schwilk:2012", "missing", "Isaac:2010"})
+		self.assertIs(manager.resolve_entries(["Isaac:2010"])[0], entries[2])
+
+	def test_citation_ranks(self):
+		"""Ranks are assigned in citation order as keys are found"""
+		from simpleparse.parser import Parser
+		from bibstuff import ebnf_sp
+		manager = bibstyles.example_numbered.CitationManager([self.tbib],
+			citation_template=bibstyles.example_numbered.CITATION_TEMPLATE)
+		processor = bibstyles.shared.CiteRefProcessor(manager)
+		parser = Parser(ebnf_sp.cites_rest, root='src')
+		parser.parse("See [Schwilk:2012]_ and [Isaac:2010,Schwilk:2012]_.", processor=processor)
+		self.assertEqual(manager.citation_ranks, {"Schwilk:2012": 1, "Isaac:2010": 2})
+		self.assertEqual(repr(processor), "See (1) and (2, 1).")
+		self.assertEqual(manager.get_citation_rank(self.tbib.entries[0]), 2)
+
+
+class TestParallelCitations(unittest.TestCase):
+	"""Parallel reference lists must match the sequential output"""
+	test_bib = "".join(r"""@book{Book%(i)d,
+	editor = {Doe, Jane},
+	title = {Book %(i)d},
+	year = %(year)d,
+	publisher = {Pub}
+}
+@incollection{Art%(i)d,
+	author = {Smith, J. and Last, First},
+	title = {Article %(i)d},
+	crossref = {Book%(i)d},
+	pages = {1--%(i)d},
+	month = jan
+}
+""" % dict(i=i, year=2000 - i) for i in range(6))
+
+	tbib = bibfile.BibFile()
+	bibgrammar.Parse(test_bib, tbib)
+	citekeys = [entry.citekey for entry in tbib.entries]
+
+	def test_parallel_citations(self):
+		"""make_citations_parallel == make_citations, for each style"""
+		for style in (bibstyles.default, bibstyles.example_numbered):
+			manager = style.CitationManager([self.tbib], citekeys=self.citekeys,
+				citation_template=style.CITATION_TEMPLATE)
+			expected = manager.make_citations()
+			manager = style.CitationManager([self.tbib], citekeys=self.citekeys,
+				citation_template=style.CITATION_TEMPLATE)
+			self.assertEqual(manager.make_citations_parallel(jobs=2, shard_size=3), expected)
+
+
 if __name__ == '__main__':
  	unittest.main()
 
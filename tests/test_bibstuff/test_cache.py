@@ -0,0 +1,163 @@
+#!/usr/bin/env python
+"""
+Provides tests for the bibstuff.cache module
+
+:author: Dylan Schwilk
+:contact: http://www.schwilk.org
+:license: MIT (see `license.txt`_)
+:date: 2026-10-19
+
+.. _`license.txt`: ../../license.txt
+
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from bibstuff import bibfile, bibgrammar, bibstyles, cache
+
+test_bib = r"""@article{Isaac:2010,
+	author = {Isaac, Alan G.},
+	title = {Test},
+	year = 2010,
+	journal = {Testing quarterly}
+}"""
+
+
+class TestCitationCache(unittest.TestCase):
+	"""Tests for `CitationCache`"""
+
+	def setUp(self):
+		self.tmpdir = tempfile.mkdtemp()
+		self.path = os.path.join(self.tmpdir, 'citations.sqlite')
+
+	def tearDown(self):
+		shutil.rmtree(self.tmpdir)
+
+	def test_persistence(self):
+		"""Values survive closing and reopening the cache"""
+		with cache.CitationCache(self.path) as c:
+			self.assertIsNone(c.get('a'))
+			c.put('a', 'formatted')
+			self.assertEqual(c.get('a'), 'formatted')
+		with cache.CitationCache(self.path) as c:
+			self.assertEqual(c.get('a'), 'formatted')
+
+	def test_lru_eviction(self):
+		"""Least recently used values are evicted to meet the size budget"""
+		with cache.CitationCache(self.path, max_size=20) as c:
+			c.put('a', 'x' * 8)
+			c.flush()
+			c.put('b', 'y' * 8)
+			c.flush()
+			c.get('a')  #now 'b' is least recently used
+			c.flush()
+			c.put('c', 'z' * 8)
+			c.flush()
+			self.assertIsNone(c.get('b'))
+			self.assertEqual(c.get('a'), 'x' * 8)
+			self.assertEqual(c.get('c'), 'z' * 8)
+
+	def test_citation_manager(self):
+		"""Cached output matches uncached output, and is reused"""
+		bfile = bibfile.BibFile()
+		bibgrammar.Parse(test_bib, bfile)
+		style = bibstyles.default
+		expected = style.CitationManager([bfile], citekeys=['Isaac:2010']).make_citations()
+		for trial in range(2):
+			with cache.CitationCache(self.path) as c:
+				manager = style.CitationManager([bfile], citekeys=['Isaac:2010'])
+				manager.set_citation_cache(c)
+				self.assertEqual(manager.make_citations(), expected)
+				self.assertEqual(c.hits, trial)
+
+	def test_template_hash(self):
+		"""Different templates have different hashes"""
+		template = bibstyles.default.CITATION_TEMPLATE
+		other = dict(template, indent_left=0)
+		self.assertNotEqual(cache.template_hash(template), cache.template_hash(other))
+		self.assertEqual(cache.template_hash(template), cache.template_hash(dict(template)))
+
+
+class TestCachedParser(unittest.TestCase):
+	"""Tests for `CachedParser`"""
+
+	def setUp(self):
+		self.tmpdir = tempfile.mkdtemp()
+
+	def tearDown(self):
+		shutil.rmtree(self.tmpdir)
+
+	def test_same_parse(self):
+		"""Parses match simpleparse, and the table is reused from disk"""
+		from simpleparse.parser import Parser
+		expected = Parser(bibgrammar.dec, 'bibfile').parse(test_bib)
+		parser = cache.CachedParser(bibgrammar.dec, 'bibfile', cache_dir=self.tmpdir)
+		self.assertEqual(parser.parse(test_bib), expected)
+		self.assertTrue(os.path.exists(parser.table_path('bibfile')))
+		parser = cache.CachedParser(bibgrammar.dec, 'bibfile', cache_dir=self.tmpdir)
+		self.assertEqual(parser.parse(test_bib), expected)
+		self.assertIsNone(parser._parser)  #no grammar generation
+
+	def test_processor(self):
+		"""Processors get the parse result"""
+		parser = cache.CachedParser(bibgrammar.dec, 'bibfile', cache_dir=self.tmpdir)
+		bfile = bibfile.BibFile()
+		parser.parse(test_bib, processor=bfile)
+		self.assertEqual([entry.citekey for entry in bfile.entries], ['Isaac:2010'])
+
+	def test_method_source(self):
+		"""Method-source processors get a table built for them"""
+		class Source(object):
+			def _m_citekey(self, *args):
+				pass
+		parser = cache.CachedParser(bibgrammar.dec, 'bibfile', cache_dir=self.tmpdir)
+		self.assertFalse(cache._is_method_source(bibfile.BibFile()))
+		self.assertTrue(cache._is_method_source(Source()))
+		self.assertIsNot(parser.buildTagger('bibfile', Source()), parser.buildTagger('bibfile'))
+
+	def test_private_cache_dir(self):
+		"""The cache directory is created private"""
+		cache_dir = os.path.join(self.tmpdir, 'bibstuff', 'grammars')
+		parser = cache.CachedParser(bibgrammar.dec, 'bibfile', cache_dir=cache_dir)
+		parser.parse(test_bib)
+		for path in (cache_dir, os.path.dirname(cache_dir)):
+			self.assertEqual(os.stat(path).st_mode & 0o777, 0o700)
+		self.assertEqual(os.stat(parser.table_path('bibfile')).st_mode & 0o077, 0)
+
+	def test_untrusted_table(self):
+		"""Tables writable by others are not unpickled, but replaced"""
+		import pickle
+		parser = cache.CachedParser(bibgrammar.dec, 'bibfile', cache_dir=self.tmpdir)
+		path = parser.table_path('bibfile')
+		with open(path, 'wb') as fh:
+			pickle.dump(('not', 'a', 'table'), fh)
+		os.chmod(path, 0o666)
+		with self.assertRaises(pickle.UnpicklingError):
+			cache.load_pickle(path)
+		expected = parser.parse(test_bib)  #rebuilds the table
+		self.assertIsNotNone(parser._parser)
+		self.assertEqual(os.stat(path).st_mode & 0o077, 0)
+		self.assertEqual(cache.CachedParser(bibgrammar.dec, 'bibfile', cache_dir=self.tmpdir).parse(test_bib),
+			expected)
+		os.chmod(path, 0o644)
+		self.assertIsInstance(cache.load_pickle(path), tuple)  #readable by others is fine
+
+	@unittest.skipUnless(hasattr(os, 'getuid') and os.getuid() == 0, "needs root to change file owner")
+	def test_foreign_owner(self):
+		"""Tables owned by another user are not unpickled"""
+		import pickle
+		path = os.path.join(self.tmpdir, 'table.pickle')
+		with open(path, 'wb') as fh:
+			pickle.dump('table', fh)
+		os.chmod(path, 0o600)
+		self.assertEqual(cache.load_pickle(path), 'table')
+		os.chown(path, 12345, -1)
+		with self.assertRaises(pickle.UnpicklingError):
+			cache.load_pickle(path)
+
+
+if __name__ == '__main__':
+	unittest.main()
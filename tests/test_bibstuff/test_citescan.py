@@ -0,0 +1,73 @@
+#!/usr/bin/env python
+"""
+Provides tests for the bibstuff.citescan module
+
+:author: Dylan Schwilk
+:contact: http://www.schwilk.org
+:license: MIT (see `license.txt`_)
+:date: 2026-10-19
+
+.. _`license.txt`: ../../license.txt
+
+"""
+
+import os
+import random
+import unittest
+
+from simpleparse.parser import Parser
+
+from bibstuff import citescan, ebnf_sp
+
+example_rst = os.path.join(os.path.dirname(__file__),
+	'..', '..', 'examples', 'rst_input.rst')
+
+corpus = [
+	"",
+	"plain text only",
+	"See [Schwilk+Isaac:2006]_ and [Isaac2000,Schwilk1999]_.",
+	"A footnote [#]_, [*]_ and [12]_; a bracket [note] and [x]_ (too short).",
+	"Not cites: [1a]_ [`x`]_ [#a]_ [] ]_ [[ab]_ ]]",
+	"Literals ``[Smith:2000]_`` and ````, ```a``, ``unclosed [Doe:1999]_",
+	"Multi-line [Schwilk\n:2006]_ and ``lit\neral``",
+	"Trailing [open",
+	]
+
+
+class TestCiteScanner(unittest.TestCase):
+	"""The scanners must reproduce the simpleparse grammars in `ebnf_sp`"""
+
+	grammars = ('cites_rest', 'cites_only_rest', 'cites_xp')
+
+	def check_corpus(self, texts):
+		for grammar in self.grammars:
+			parser = Parser(getattr(ebnf_sp, grammar), root='src')
+			scanner = citescan.CiteScanner(grammar)
+			for text in texts:
+				self.assertEqual(scanner.parse(text), parser.parse(text),
+					msg="%s: %r" % (grammar, text))
+
+	def test_corpus(self):
+		"""Fixed test strings"""
+		self.check_corpus(corpus)
+
+	def test_example_document(self):
+		"""The example reST document"""
+		with open(example_rst) as fh:
+			self.check_corpus([fh.read()])
+
+	def test_random_text(self):
+		"""Random text built from the grammars' special characters"""
+		rng = random.Random(2026)
+		texts = [''.join(rng.choice('ab[]_`#*1 \n') for _ in range(rng.randint(0, 30)))
+			for _ in range(2000)]
+		self.check_corpus(texts)
+
+	def test_scanner_for(self):
+		"""Find a scanner for an ebnf_sp declaration"""
+		self.assertEqual(citescan.scanner_for(ebnf_sp.cites_xp).grammar, 'cites_xp')
+		self.assertIsNone(citescan.scanner_for(ebnf_sp.addrefs))
+
+
+if __name__ == '__main__':
+	unittest.main()
@@ -0,0 +1,69 @@
+#!/usr/bin/env python
+"""
+Guards against slow imports of the bibstuff modules used by the scripts
+
+:author: Dylan Schwilk
+:contact: http://www.schwilk.org
+:license: MIT (see `license.txt`_)
+:date: 2026-10-19
+
+.. _`license.txt`: ../../license.txt
+
+"""
+
+import json
+import os
+import subprocess
+import sys
+import unittest
+
+package_dir = os.path.join(os.path.dirname(__file__), '..', '..')
+
+#imports the script modules, then reports what was loaded and how long it took
+probe = r"""
+import json, sys, time
+start = time.perf_counter()
+from bibstuff import bibfile, bibgrammar, bibname, bibstyles
+elapsed = time.perf_counter() - start
+print(json.dumps(dict(
+	elapsed = elapsed,
+	modules = sorted(sys.modules),
+	parsers = sorted(bibgrammar._parsers),
+	bibname = sorted(vars(bibname)))))
+"""
+
+
+class TestImports(unittest.TestCase):
+	"""Grammars, pybtex and styles must load on first use, not on import"""
+
+	@classmethod
+	def setUpClass(cls):
+		output = subprocess.run([sys.executable, '-c', probe], cwd=package_dir,
+			check=True, capture_output=True, text=True).stdout
+		cls.report = json.loads(output)
+
+	def test_deferred(self):
+		"""Importing does not build parsers, import pybtex or import styles"""
+		modules = self.report['modules']
+		self.assertEqual(self.report['parsers'], [])
+		self.assertNotIn('bibnamelist_parser', self.report['bibname'])
+		self.assertFalse([m for m in modules if m.split('.')[0] == 'pybtex'])
+		self.assertNotIn('bibstuff.bibstyles.default', modules)
+		self.assertNotIn('bibstuff.bibstyles.shared', modules)
+
+	def test_import_time(self):
+		"""Benchmark: importing takes well under a second"""
+		self.assertLess(self.report['elapsed'], 0.5)
+
+	def test_lazy_attributes(self):
+		"""Lazily built attributes are available on first use"""
+		from bibstuff import bibgrammar, bibname, bibstyles
+		self.assertIs(bibgrammar.parser, bibgrammar.get_parser('bibfile'))
+		self.assertIs(bibgrammar.entry_parser, bibgrammar.get_parser('entry'))
+		self.assertIs(bibstyles.from_name('jasss'), bibstyles.jasss_style)
+		self.assertEqual(bibname.BibName('Isaac, Alan G.').get_last_names(), ['Isaac'])
+		self.assertRaises(AttributeError, getattr, bibname, 'no_such_attribute')
+
+
+if __name__ == '__main__':
+	unittest.main()
@@ -0,0 +1,56 @@
+#!/usr/bin/env python
+"""
+Provides tests for publisher address matching in the bibstuff.isbn2bib module
+
+:author: Dylan Schwilk
+:contact: http://www.schwilk.org
+:license: MIT (see `license.txt`_)
+:date: 2026-10-19
+
+.. _`license.txt`: ../../license.txt
+
+"""
+
+import unittest
+from types import SimpleNamespace
+
+from bibstuff import isbn2bib
+
+
+class TestPublisherIndex(unittest.TestCase):
+
+	def setUp(self):
+		self.index = isbn2bib.PublisherIndex({
+			'Addison-Wesley Publishing Company, Inc.': 'Reading, MA',
+			'Academic Press': 'New York',
+			"O'Reilly Media": 'Sebastopol, CA',
+			})
+
+	def test_publisher_key(self):
+		self.assertEqual(isbn2bib.publisher_key('Addison-Wesley Publishing Company, Inc.'), 'addison wesley')
+		self.assertEqual(isbn2bib.publisher_key('Publishers, Inc.'), 'publishers inc')
+
+	def test_address(self):
+		index = self.index
+		self.assertEqual(len(index), 3)
+		self.assertEqual(index.address('Addison Wesley'), 'Reading, MA')
+		self.assertEqual(index.address('OReilly Media'), 'Sebastopol, CA')
+		self.assertEqual(index.address('Acadmic Press'), 'New York')
+		self.assertIsNone(index.address('Nonexistent Books'))
+
+	def test_read_publisher_dict(self):
+		addresses = isbn2bib.read_publisher_dict()
+		self.assertEqual(addresses['Academic Press'], 'New York')
+		self.assertEqual(isbn2bib.get_publisher_index().address('Academic Pr'), 'New York')
+
+	def test_make_bookdict(self):
+		bkinfo = SimpleNamespace(Author='Alan G. Isaac', PublicationDate='2008-01-01',
+			Title='Simulating Evolutionary Games', ISBN='0123456789',
+			Manufacturer='Academic Press Inc.')
+		bd = isbn2bib.make_bookdict(bkinfo, {'Academic Press': 'New York'})
+		self.assertEqual(bd['citekey'], 'isaac-2008-01-01')
+		self.assertEqual(bd['address'], 'New York')
+
+
+if __name__ == '__main__':
+	unittest.main()
@@ -0,0 +1,152 @@
+#!/usr/bin/env python
+"""
+Provides tests for the bibstuff.jabbrev module
+
+:author: Dylan Schwilk
+:contact: http://www.schwilk.org
+:license: MIT (see `license.txt`_)
+:date: 2026-10-19
+
+.. _`license.txt`: ../../license.txt
+
+"""
+
+import io
+import os
+import pickle
+import shutil
+import tempfile
+import unittest
+
+from bibstuff import jabbrev
+
+abbreviations = """J. Ecol. = Journal of Ecology
+Ecol. Evol. = Ecology & Evolution
+Not a journal line
+Trends Ecol. Evol. = Trends in Ecology and Evolution
+"""
+
+test_bib = r"""@string{jecol = {Journal of Ecology}}
+@string{pub = {Big Press}}
+% a comment between entries
+@article{a,
+	journal = {JOURNAL OF ECOLOGY},
+	publisher = pub,
+	year = 2010
+}
+@article{b,  journal = {Ecology and  Evolution}, year = 2011}
+
+@article{c, journal = {Unknown}, year = 2012}
+@article{d, journal = jecol, year = 2013}
+trailing text
+"""
+
+expected_bib = r"""@string{jecol = {Journal of Ecology}}
+@string{pub = {Big Press}}
+% a comment between entries
+@article{a,
+	journal = {J. Ecol.},
+	publisher = pub,
+	year = 2010
+}
+@article{b,  journal = {Ecol. Evol.}, year = 2011}
+
+@article{c, journal = {Unknown}, year = 2012}
+@article{d, journal = {J. Ecol.}, year = 2013}
+trailing text
+"""
+
+
+class TestJournalIndex(unittest.TestCase):
+
+	def setUp(self):
+		self.index = jabbrev.JournalIndex(jabbrev.read_abbreviations(io.StringIO(abbreviations)))
+
+	def test_journal_key(self):
+		self.assertEqual(jabbrev.journal_key('J. Ecol.'), 'j ecol')
+		self.assertEqual(jabbrev.journal_key(r'Ecology {\&} Evolution'), 'ecology and evolution')
+
+	def test_lookup(self):
+		index = self.index
+		self.assertEqual(len(index), 3)
+		self.assertEqual(index.abbreviate('journal of ecology'), 'J. Ecol.')
+		self.assertEqual(index.abbreviate('Ecology and Evolution'), 'Ecol. Evol.')
+		self.assertEqual(index.expand('J Ecol'), 'Journal of Ecology')
+		self.assertIsNone(index.abbreviate('Unknown'))
+		self.assertEqual(index.translate('Unknown'), 'Unknown')
+		self.assertEqual(index.translate('Trends Ecol Evol', expand=True), 'Trends in Ecology and Evolution')
+
+	def test_read_csa(self):
+		csa = io.StringIO("Journal of Ecology, ( J. Ecol.), 0022-0477, Priority\nNature, Selective\n")
+		self.assertEqual(list(jabbrev.read_csa(csa)),
+			[('J. Ecol.', 'Journal of Ecology'), ('Nature', 'Nature')])
+
+	def test_ngram_index(self):
+		names = ['Journal of Ecology', 'Ecology', 'Journal of Animal Ecology', 'Ecology Letters']
+		matcher = jabbrev.NgramIndex(names)
+		result = matcher.search('Jornal of Ecolgy', threshold=0.3, limit=3)
+		self.assertEqual(result[0][1], 'Journal of Ecology')
+		self.assertTrue(0.3 <= result[-1][0] <= result[0][0] < 1)
+		#same as scoring every name
+		grams = matcher.ngrams('Jornal of Ecolgy')
+		scores = []
+		for name in names:
+			other = matcher.ngrams(name)
+			scores.append((2.0 * len(grams & other) / (len(grams) + len(other)), name))
+		scores.sort(key=lambda item: (-item[0], item[1]))
+		self.assertEqual(result, [item for item in scores if item[0] >= 0.3][:3])
+		self.assertEqual(matcher.search('ecology', threshold=0.99), [(1.0, 'Ecology')])
+		self.assertEqual(matcher.search('Zoology', threshold=0.9), [])
+
+	def test_fuzzy_translate(self):
+		index = self.index
+		self.assertEqual(index.translate('Jounral of Ecolgy', threshold=0.6), 'J. Ecol.')
+		self.assertEqual(index.translate('Jounral of Ecolgy'), 'Jounral of Ecolgy')
+		self.assertEqual(index.translate('Chemistry', threshold=0.6), 'Chemistry')
+		self.assertEqual(index.translate('J. Ecol.', threshold=0.1), 'J. Ecol.')  #already abbreviated
+		self.assertEqual(index.candidates('Trends Ecol Evolution', expand=True)[0][1],
+			'Trends in Ecology and Evolution')
+
+	def test_cached_index(self):
+		tmpdir = tempfile.mkdtemp()
+		try:
+			path = os.path.join(tmpdir, 'abbrev.txt')
+			cache_dir = os.path.join(tmpdir, 'cache')
+			with open(path, 'w') as fh:
+				fh.write(abbreviations)
+			index = jabbrev.JournalIndex.from_file(path, cache_dir=cache_dir)
+			self.assertEqual(len(os.listdir(cache_dir)), 1)
+			self.assertEqual(os.stat(cache_dir).st_mode & 0o777, 0o700)
+			loaded = jabbrev.JournalIndex.from_file(path, cache_dir=cache_dir)
+			self.assertEqual(loaded.abbreviations, index.abbreviations)
+			self.assertEqual(loaded.expansions, index.expansions)
+			#an index file that others can write is not loaded, but rebuilt
+			index_path = os.path.join(cache_dir, os.listdir(cache_dir)[0])
+			os.chmod(index_path, 0o666)
+			with self.assertRaises(pickle.UnpicklingError):
+				jabbrev.JournalIndex.load(index_path)
+			loaded = jabbrev.JournalIndex.from_file(path, cache_dir=cache_dir)
+			self.assertEqual(loaded.abbreviations, index.abbreviations)
+			self.assertEqual(os.stat(index_path).st_mode & 0o077, 0)
+		finally:
+			shutil.rmtree(tmpdir)
+
+	def test_translate_stream(self):
+		out = io.StringIO()
+		changed = jabbrev.translate_stream(io.StringIO(test_bib), out, self.index)
+		self.assertEqual(changed, 3)
+		#only the journal values change: macros in other fields and comments are kept
+		self.assertEqual(out.getvalue(), expected_bib)
+
+	def test_translate_stream_chunks(self):
+		for chunk_size in (1, 7):
+			out = io.StringIO()
+			jabbrev.translate_stream(io.StringIO(test_bib), out, self.index, chunk_size=chunk_size)
+			self.assertEqual(out.getvalue(), expected_bib)
+		out = io.StringIO()
+		jabbrev.translate_stream(io.StringIO(expected_bib), out, self.index, expand=True)
+		self.assertIn('journal = {Journal of Ecology},\n\tpublisher = pub,', out.getvalue())
+
+
+if __name__ == '__main__':
+	unittest.main()
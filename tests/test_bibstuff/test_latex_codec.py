@@ -0,0 +1,77 @@
+#!/usr/bin/env python
+"""
+Provides tests for the bibstuff.data.latex_codec module
+
+:author: Dylan Schwilk
+:contact: http://www.schwilk.org
+:license: MIT (see `license.txt`_)
+:date: 2026-10-19
+
+.. _`license.txt`: ../../license.txt
+
+"""
+
+import codecs
+import random
+import unittest
+
+from bibstuff import bibfile
+from bibstuff.data import latex_codec
+
+
+def reference(tex):
+	return ''.join(latex_codec._unlatex(tex))
+
+
+class TestLatexCodec(unittest.TestCase):
+
+	def test_latex_to_unicode(self):
+		cases = [
+			(r'M\"{u}ller', 'Müller'),
+			(r"Fran\c{c}ois {\'E}mile", 'François Émile'),
+			(r"Mar\'{\i}a", 'María'),
+			(r'{\ss} and $\alpha$', 'ß and α'),
+			('pages 1--10', 'pages 1–10'),
+			(r'\char8501', 'ℵ'),
+			('', ''),
+			('plain text', 'plain text'),
+			]
+		for tex, expected in cases:
+			self.assertEqual(latex_codec.latex_to_unicode(tex), expected)
+
+	def test_matches_reference(self):
+		rng = random.Random(0)
+		alphabet = ['\\', '{', '}', '$', '-', '~', "'", '"', '`', '^', ' ', '\n', '/',
+			'a', 'e', 'i', 'o', 'u', 'c', 'O', 'ss', 'alpha', 'mbox', 'char', '1', '9', '\x01']
+		for i in range(5000):
+			tex = ''.join(rng.choice(alphabet) for j in range(rng.randint(0, 12)))
+			self.assertEqual(latex_codec.latex_to_unicode(tex), reference(tex), repr(tex))
+
+	def test_unicode_to_latex(self):
+		self.assertEqual(latex_codec.unicode_to_latex('Märtin'), r'M{\"a}rtin')
+		self.assertEqual(latex_codec.unicode_to_latex('Märtin', 'latin1'), 'Märtin')
+		self.assertEqual(latex_codec.unicode_to_latex('ℵ #'), r'{\char8501} {\#}')
+		text = 'Über François – ß'
+		self.assertEqual(latex_codec.latex_to_unicode(latex_codec.unicode_to_latex(text)), text)
+
+	def test_codec(self):
+		latex_codec.register()
+		self.assertEqual(codecs.encode('Märtin', 'latex'), b'M{\\"a}rtin')
+		self.assertEqual(codecs.encode('Märtin', 'latex+latin1'), 'Märtin'.encode('latin1'))
+		self.assertEqual(codecs.decode(b'M\\"{u}ller', 'latex'), 'Müller')
+
+	def test_decode_entries(self):
+		entries = []
+		for key in ('a', 'b'):
+			entry = bibfile.BibEntry()
+			entry.entry_type, entry.citekey = 'article', key
+			entry['author'] = r'M\"{u}ller, J\"{o}rg'
+			entry['title'] = 'Plain'
+			entries.append(entry)
+		self.assertEqual(latex_codec.decode_entries(entries, fields=('author',)), 2)
+		self.assertEqual(entries[1]['author'], 'Müller, Jörg')
+		self.assertEqual(entries[1]['title'], 'Plain')
+
+
+if __name__ == '__main__':
+	unittest.main()